@@ -1,191 +1,96 @@
 #!/usr/bin/env python3
 """
 Bevco Executive Dashboard Portal - Simplified Version
-Modern web-based dashboard system without pandas dependency
+Modern web-based dashboard system without the pandas dependency; the
+sales cube and chart downsampling behind the views need numpy
 """
 
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
 from flask_socketio import SocketIO, emit
-import sqlite3
-import json
+import functools
 import os
 import secrets
-from datetime import datetime, timedelta
-import threading
-import time
-import random
-from werkzeug.security import generate_password_hash, check_password_hash
+from contextlib import closing
+from datetime import datetime
+from werkzeug.security import check_password_hash
+
+from database import prepare_database
+from views import dashboard_view, sales_view, financial_view, kpi_view, SALES_VIEWS
+from serialization import columnar
+from compression import compression
+from filters import sales_filters, text_filters, date_range, point_limit, payload_layout, FilterError
+from sales_cube import SalesCube
+from exports import export_response, EXPORT_FORMATS, pyarrow
+from transactions import transaction_query, transactions_page
+from warehouse import MasterWarehouse
+from inventory import InventoryTracker
+from event_bus import start_event_bus, is_valid_topic
+from snapshots import SnapshotStore
+from broadcaster import Broadcaster
+from chat_engine import ChatEngine
+from chat_service import ChatService, AnswerCache, user_room
+from chat_log import ChatLogWriter
+from broker import BrokerClient
+from cluster import cluster
+from metrics import metrics, connect_database
+from query_log import query_log
+from health import Readiness
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = secrets.token_hex(16)
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Workers launched by serve.py share one secret so sessions work on any of them
+app.config['SECRET_KEY'] = os.getenv('PORTAL_SECRET_KEY') or secrets.token_hex(16)
+socketio = SocketIO(app, cors_allowed_origins="*", message_queue=cluster.message_queue)
+snapshot_store = SnapshotStore(storage=cluster.cache)
+broadcaster = Broadcaster(socketio)
 
 # Configuration
 DATABASE_PATH = 'data/bevco_dashboard.db'
+CHANGE_FEED_INTERVAL = int(os.getenv('CHANGE_FEED_INTERVAL', '5'))  # Seconds between change feed polls
+MASTER_DATA_DIR = os.getenv('MASTER_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'master'))
+CHAT_WORKERS = int(os.getenv('CHAT_WORKERS', '4'))  # Background tasks generating chat answers
+CHAT_CACHE_TTL = int(os.getenv('CHAT_CACHE_TTL', '300'))  # Seconds a cached chat answer stays valid
+RANGE_CACHE_SIZE = int(os.getenv('RANGE_CACHE_SIZE', '256'))  # Date-range and downsampled views kept per worker
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))  # Smallest response body sent gzip/brotli compressed; -1 turns compression off
+CHAT_LOG_FLUSH_MS = int(os.getenv('CHAT_LOG_FLUSH_MS', '250'))  # Longest a chat record waits before it is written
+CHAT_LOG_BATCH = int(os.getenv('CHAT_LOG_BATCH', '100'))  # Records written per transaction at most
+SERVER_TIMING = int(os.getenv('SERVER_TIMING', '0'))  # Set to 1 to add Server-Timing headers (sql, json, app) to responses
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))  # Statements slower than this are logged with their query plan
+QUERY_PROFILE_SAMPLE = float(os.getenv('QUERY_PROFILE_SAMPLE', '0'))  # Fraction of statements aggregated into the top queries report
 
-class DashboardData:
-    def __init__(self):
-        self.init_database()
-        self.load_sample_data()
-    
-    def init_database(self):
-        """Initialize SQLite database with tables"""
-        os.makedirs('data', exist_ok=True)
-        
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Sales data table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sales_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                region TEXT NOT NULL,
-                product_category TEXT NOT NULL,
-                vendor TEXT NOT NULL,
-                customer_type TEXT NOT NULL,
-                sales_amount REAL NOT NULL,
-                profit_amount REAL NOT NULL,
-                quantity INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # KPI data table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS kpi_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                metric_name TEXT NOT NULL,
-                metric_value REAL NOT NULL,
-                target_value REAL NOT NULL,
-                date DATE NOT NULL,
-                department TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Chat messages table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                message TEXT NOT NULL,
-                response TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Create default admin user
-        admin_hash = generate_password_hash('admin123')
-        cursor.execute('''
-            INSERT OR IGNORE INTO users (username, email, password_hash, role)
-            VALUES (?, ?, ?, ?)
-        ''', ('admin', 'admin@bevco.com', admin_hash, 'admin'))
-        
-        conn.commit()
-        conn.close()
-    
-    def load_sample_data(self):
-        """Load sample business data"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        # Check if data already exists
-        cursor.execute('SELECT COUNT(*) FROM sales_data')
-        if cursor.fetchone()[0] > 0:
-            conn.close()
-            return
-        
-        # Generate sample sales data
-        regions = ['Gauteng', 'Western Cape', 'KwaZulu-Natal', 'Eastern Cape', 'Free State']
-        categories = ['Beer', 'Wine', 'Spirits', 'Soft Drinks', 'Water']
-        vendors = ['SAB Miller', 'Distell', 'Coca-Cola', 'Pepsi', 'Local Brands']
-        customer_types = ['Retail', 'Wholesale', 'On-Trade', 'Export']
-        
-        sales_data = []
-        start_date = datetime.now() - timedelta(days=180)
-        
-        for i in range(5000):  # Generate 5000 sample records
-            date = start_date + timedelta(days=random.randint(0, 180))
-            region = random.choice(regions)
-            category = random.choice(categories)
-            vendor = random.choice(vendors)
-            customer_type = random.choice(customer_types)
-            
-            # Generate realistic sales amounts based on category
-            base_amount = {
-                'Beer': random.uniform(1000, 5000),
-                'Wine': random.uniform(2000, 8000),
-                'Spirits': random.uniform(3000, 12000),
-                'Soft Drinks': random.uniform(500, 3000),
-                'Water': random.uniform(200, 1500)
-            }[category]
-            
-            sales_amount = round(base_amount, 2)
-            profit_margin = random.uniform(0.15, 0.35)
-            profit_amount = round(sales_amount * profit_margin, 2)
-            quantity = random.randint(10, 500)
-            
-            sales_data.append((
-                date.strftime('%Y-%m-%d'),
-                region,
-                category,
-                vendor,
-                customer_type,
-                sales_amount,
-                profit_amount,
-                quantity
-            ))
-        
-        cursor.executemany('''
-            INSERT INTO sales_data (date, region, product_category, vendor, customer_type, sales_amount, profit_amount, quantity)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', sales_data)
-        
-        # Generate KPI data
-        kpi_data = []
-        departments = ['Sales', 'Marketing', 'Finance', 'Operations', 'HR']
-        metrics = [
-            ('Total Sales', 50000000, 45000000),
-            ('Profit Margin %', 25.5, 30.0),
-            ('Customer Satisfaction', 87.3, 90.0),
-            ('Employee Retention %', 92.1, 95.0),
-            ('Inventory Turnover', 8.2, 12.0)
-        ]
-        
-        for dept in departments:
-            for metric_name, current, target in metrics:
-                kpi_data.append((
-                    metric_name,
-                    current + random.uniform(-5, 5),
-                    target,
-                    datetime.now().strftime('%Y-%m-%d'),
-                    dept
-                ))
-        
-        cursor.executemany('''
-            INSERT INTO kpi_data (metric_name, metric_value, target_value, date, department)
-            VALUES (?, ?, ?, ?, ?)
-        ''', kpi_data)
-        
-        conn.commit()
-        conn.close()
+# Initialize data: restores the sample snapshot on first start and skips all
+# schema work once the schema version marker matches
+database_startup = prepare_database(DATABASE_PATH)
+# Running sales totals per day behind the views and the chat answers; any date range is a few lookups
+sales_cube = SalesCube(DATABASE_PATH)
+chat_engine = ChatEngine(DATABASE_PATH, MASTER_DATA_DIR, sales_cube)
+# Views built for a date range or point limit, kept until the data key (which includes the day) moves on
+range_cache = AnswerCache(max_entries=RANGE_CACHE_SIZE, ttl=24 * 60 * 60)
+# Indexed copies of the master data star schema, reloaded when a CSV changes
+master_warehouse = MasterWarehouse(DATABASE_PATH, MASTER_DATA_DIR)
+# Stock totals and reorder/overstock lines, adjusted for the lines that change when the inventory reloads
+inventory_tracker = InventoryTracker()
+chat_log = ChatLogWriter(socketio, DATABASE_PATH, flush_interval=CHAT_LOG_FLUSH_MS / 1000, batch_size=CHAT_LOG_BATCH)
+chat_service = ChatService(socketio, broadcaster, chat_engine, chat_log,
+                           workers=CHAT_WORKERS, cache=AnswerCache(ttl=CHAT_CACHE_TTL))
 
-# Initialize data
-dashboard_data = DashboardData()
+# Request, SQL and JSON timings plus cache and queue counters on /metrics,
+# and the slow query log behind /api/system/queries
+query_log.configure(threshold_ms=SLOW_QUERY_MS, sample_rate=QUERY_PROFILE_SAMPLE)
+metrics.init_app(app, server_timing=bool(SERVER_TIMING), worker=cluster.worker_index)
+metrics.add_stats('view_cache', snapshot_store.stats, counters=('hits', 'misses'))
+metrics.add_stats('chat_cache', chat_service.cache.stats, counters=('hits', 'misses'))
+metrics.add_stats('range_cache', range_cache.stats, counters=('hits', 'misses'))
+metrics.add_stats('inventory', inventory_tracker.stats, counters=('refreshes', 'lines_changed'))
+# After metrics so the compression time counts towards each request
+compression.init_app(app, minimum_size=COMPRESS_MIN_SIZE)
+metrics.add_stats('compression', compression.stats, counters=('compressed', 'bytes_in', 'bytes_out'))
+metrics.add_stats('socketio', broadcaster.stats, counters=('sent', 'emitted'), labels={'emitted': 'event'})
+metrics.add_stats('chat_log', chat_log.stats, counters=('written', 'batches', 'failures'))
+
+# /healthz answers once serving; /readyz once the warehouse is loaded and the views and chat rollups are warm
+readiness = Readiness(['database', 'warehouse', 'views', 'chat_rollups', 'workers'])
+readiness.init_app(app, worker=cluster.worker_index)
+readiness.done('database')
 
 # Authentication decorator
 def login_required(f):
@@ -209,7 +114,7 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = connect_database(DATABASE_PATH)
         cursor = conn.cursor()
         cursor.execute('SELECT id, password_hash, role FROM users WHERE username = ?', (username,))
         user = cursor.fetchone()
@@ -258,164 +163,182 @@ def analytics():
     return render_template('analytics.html', username=session.get('username'))
 
 # API Routes
-@app.route('/api/dashboard_data')
-@login_required
-def api_dashboard_data():
-    """Get dashboard summary data"""
-    conn = sqlite3.connect(DATABASE_PATH)
+def data_key(conn=None):
+    """Identify the data behind the views: the newest sales and KPI rows plus today's date for the rolling windows
+
+    Reads through conn when given, e.g. inside a batch's read transaction.
+    """
+    own_connection = conn is None
+    if own_connection:
+        conn = connect_database(DATABASE_PATH)
     cursor = conn.cursor()
-    
-    # Total sales
-    cursor.execute('SELECT SUM(sales_amount) FROM sales_data')
-    total_sales = cursor.fetchone()[0] or 0
-    
-    # Total profit
-    cursor.execute('SELECT SUM(profit_amount) FROM sales_data')
-    total_profit = cursor.fetchone()[0] or 0
-    
-    # Sales by region
     cursor.execute('''
-        SELECT region, SUM(sales_amount) as sales
-        FROM sales_data
-        GROUP BY region
-        ORDER BY sales DESC
+        SELECT (SELECT COALESCE(MAX(id), 0) FROM sales_data),
+               (SELECT COALESCE(MAX(id), 0) FROM kpi_data)
     ''')
-    sales_by_region = [{'region': row[0], 'sales': row[1]} for row in cursor.fetchall()]
-    
-    # Sales trend (last 30 days)
-    cursor.execute('''
-        SELECT DATE(date) as date, SUM(sales_amount) as sales
-        FROM sales_data
-        WHERE date >= date('now', '-30 days')
-        GROUP BY DATE(date)
-        ORDER BY date
-    ''')
-    sales_trend = [{'date': row[0], 'sales': row[1]} for row in cursor.fetchall()]
-    
-    # Top products
-    cursor.execute('''
-        SELECT product_category, SUM(sales_amount) as sales
-        FROM sales_data
-        GROUP BY product_category
-        ORDER BY sales DESC
-        LIMIT 5
-    ''')
-    top_products = [{'product_category': row[0], 'sales': row[1]} for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    return jsonify({
-        'total_sales': round(total_sales, 2),
-        'total_profit': round(total_profit, 2),
-        'profit_margin': round((total_profit / total_sales * 100), 2) if total_sales > 0 else 0,
-        'sales_by_region': sales_by_region,
-        'sales_trend': sales_trend,
-        'top_products': top_products
-    })
+    sales_id, kpi_id = cursor.fetchone()
+    if own_connection:
+        conn.close()
+    return f"{sales_id}:{kpi_id}:{datetime.now().strftime('%Y-%m-%d')}"
+
+def get_dashboard_data(dates=None, max_points=None):
+    """Build the dashboard summary view"""
+    return dashboard_view(sales_cube.refresh(), dates, max_points)
+
+def view_response(view, build):
+    """A view from its snapshot or, for ?from=&to= and ?max_points=, built from the sales cube and cached per range
+
+    ?layout=columns returns each list of records as column names and rows.
+    """
+    try:
+        dates = date_range(request.args)
+        max_points = point_limit(request.args)
+        layout = payload_layout(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    if dates is None and max_points is None:
+        data = snapshot_store.publish(broadcaster, view, build, data_key())
+    else:
+        data = range_view(view, dates, max_points, data_key(), lambda: build(dates, max_points))
+    return jsonify(columnar(data) if layout == 'columns' else data)
+
+def range_view(view, dates, max_points, version, build):
+    """A view for a date range or point limit from the range cache, built with build() while the data key is new"""
+    key = (view, dates, max_points)
+    data = range_cache.get(key, version)
+    if data is None:
+        data = build()
+        range_cache.set(key, version, data)
+    return data
+
+@app.route('/api/dashboard_data')
+@login_required
+def api_dashboard_data():
+    """Get dashboard summary data, optionally for a date range"""
+    return view_response('dashboard', get_dashboard_data)
+
+def get_sales_data(dates=None, max_points=None):
+    """Build the detailed sales view"""
+    return sales_view(sales_cube.refresh(), dates, max_points)
 
 @app.route('/api/sales_data')
 @login_required
 def api_sales_data():
-    """Get detailed sales data"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Sales by category over time
-    cursor.execute('''
-        SELECT product_category, DATE(date) as date, SUM(sales_amount) as sales
-        FROM sales_data
-        WHERE date >= date('now', '-90 days')
-        GROUP BY product_category, DATE(date)
-        ORDER BY date, product_category
-    ''')
-    category_trend = [{'product_category': row[0], 'date': row[1], 'sales': row[2]} for row in cursor.fetchall()]
-    
-    # Sales by vendor
-    cursor.execute('''
-        SELECT vendor, SUM(sales_amount) as sales, SUM(profit_amount) as profit
-        FROM sales_data
-        GROUP BY vendor
-        ORDER BY sales DESC
-    ''')
-    vendor_sales = [{'vendor': row[0], 'sales': row[1], 'profit': row[2]} for row in cursor.fetchall()]
-    
-    # Customer type analysis
-    cursor.execute('''
-        SELECT customer_type, SUM(sales_amount) as sales, COUNT(*) as transactions
-        FROM sales_data
-        GROUP BY customer_type
-        ORDER BY sales DESC
-    ''')
-    customer_analysis = [{'customer_type': row[0], 'sales': row[1], 'transactions': row[2]} for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    return jsonify({
-        'category_trend': category_trend,
-        'vendor_sales': vendor_sales,
-        'customer_analysis': customer_analysis
-    })
+    """Get detailed sales data, optionally for a date range"""
+    return view_response('sales', get_sales_data)
+
+def get_financial_data(dates=None, max_points=None):
+    """Build the financial analysis view"""
+    return financial_view(sales_cube.refresh(), dates, max_points)
 
 @app.route('/api/financial_data')
 @login_required
 def api_financial_data():
-    """Get financial analysis data"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Monthly financial summary
-    cursor.execute('''
-        SELECT 
-            strftime('%Y-%m', date) as month,
-            SUM(sales_amount) as revenue,
-            SUM(profit_amount) as profit,
-            COUNT(*) as transactions
-        FROM sales_data
-        WHERE date >= date('now', '-12 months')
-        GROUP BY strftime('%Y-%m', date)
-        ORDER BY month
-    ''')
-    monthly_summary = [{'month': row[0], 'revenue': row[1], 'profit': row[2], 'transactions': row[3]} for row in cursor.fetchall()]
-    
-    # Profit margin by category
-    cursor.execute('''
-        SELECT 
-            product_category,
-            SUM(sales_amount) as sales,
-            SUM(profit_amount) as profit,
-            ROUND(SUM(profit_amount) / SUM(sales_amount) * 100, 2) as margin_percent
-        FROM sales_data
-        GROUP BY product_category
-        ORDER BY margin_percent DESC
-    ''')
-    margin_by_category = [{'product_category': row[0], 'sales': row[1], 'profit': row[2], 'margin_percent': row[3]} for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    return jsonify({
-        'monthly_summary': monthly_summary,
-        'margin_by_category': margin_by_category
-    })
+    """Get financial analysis data, optionally for a date range"""
+    return view_response('financial', get_financial_data)
+
+def get_kpi_data():
+    """Build the KPI view"""
+    with closing(connect_database(DATABASE_PATH)) as conn:
+        return kpi_view(conn)
 
 @app.route('/api/kpi_data')
 @login_required
 def api_kpi_data():
     """Get KPI data"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT metric_name, metric_value, target_value, department
-        FROM kpi_data
-        ORDER BY department, metric_name
-    ''')
-    kpis = [{'metric_name': row[0], 'metric_value': row[1], 'target_value': row[2], 'department': row[3]} for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    return jsonify({
-        'kpis': kpis
-    })
+    try:
+        layout = payload_layout(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    data = snapshot_store.publish(broadcaster, 'kpi', get_kpi_data, data_key())
+    return jsonify(columnar(data) if layout == 'columns' else data)
+
+def build_panel(view, cube, conn, dates=None, max_points=None):
+    """Build one view from a given cube state and connection, as a batch does for each of its panels"""
+    if view == 'kpi':
+        return kpi_view(conn)
+    return SALES_VIEWS[view](cube, dates, max_points)
+
+@app.route('/api/batch')
+@login_required
+def api_batch():
+    """Get several views in one response, e.g. ?panels=sales,dashboard, all read from the same data"""
+    views = list(dict.fromkeys(name.strip() for raw in request.args.getlist('panels') for name in raw.split(',') if name.strip()))
+    if not views or any(view not in VIEW_BUILDERS for view in views):
+        return jsonify({'error': f"panels must name views from {', '.join(VIEW_BUILDERS)}"}), 400
+    try:
+        dates = date_range(request.args)
+        max_points = point_limit(request.args)
+        layout = payload_layout(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+
+    panels = {}
+    with closing(connect_database(DATABASE_PATH)) as conn:
+        # One read transaction: the data key, the sales rows folded into the
+        # cube and the KPI rows are all from the same moment, and every sales
+        # panel is cut from the same cube state
+        conn.execute('BEGIN')
+        version = data_key(conn)
+        cube = sales_cube.refresh(conn)
+        for view in views:
+            build = functools.partial(build_panel, view, cube, conn, dates, max_points)
+            if view == 'kpi' or (dates is None and max_points is None):
+                panels[view] = snapshot_store.publish(broadcaster, view, build, version)
+            else:
+                panels[view] = range_view(view, dates, max_points, version, build)
+        conn.rollback()
+    if layout == 'columns':
+        panels = {view: columnar(data) for view, data in panels.items()}
+    return jsonify(panels)
+
+@app.route('/api/export/sales')
+@login_required
+def api_export_sales():
+    """Stream the sales rows behind the dashboards as CSV, JSON Lines or Parquet, filtered like the dashboards"""
+    try:
+        filters = sales_filters(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    if export_format == 'parquet' and pyarrow is None:
+        return jsonify({'error': 'Parquet export needs pyarrow installed'}), 501
+    return export_response(export_format, lambda: connect_database(DATABASE_PATH), filters, pause=socketio.sleep)
+
+@app.route('/api/transactions')
+@login_required
+def api_transactions():
+    """Page through the sales transactions with their product, customer and rep, continuing after ?after="""
+    try:
+        filters, after, limit, descending = transaction_query(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    master_warehouse.sync()
+    if 'fact_sales' not in master_warehouse.fingerprints:
+        return jsonify({'error': f'No fact_sales.csv in {MASTER_DATA_DIR}; run the ETL first'}), 503
+    with closing(connect_database(DATABASE_PATH)) as conn:
+        return jsonify(transactions_page(conn, filters, after, limit, descending))
+
+@app.route('/api/operations_data')
+@login_required
+def api_operations_data():
+    """Get stock by warehouse and category, the lines below their reorder point and the overstock, from the master inventory"""
+    try:
+        filters = text_filters(request.args, ('warehouse', 'category'))
+        layout = payload_layout(request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    master_warehouse.sync()
+    version = tuple(master_warehouse.fingerprints.get(name) for name in ('fact_inventory', 'dim_product'))
+    if version[0] is None:
+        return jsonify({'error': f'No fact_inventory.csv in {MASTER_DATA_DIR}; run the ETL first'}), 503
+    if version != inventory_tracker.version:
+        with closing(connect_database(DATABASE_PATH)) as conn:
+            inventory_tracker.refresh(conn, version)
+    data = inventory_tracker.view(filters)
+    return jsonify(columnar(data) if layout == 'columns' else data)
 
 @app.route('/api/chat', methods=['POST'])
 @login_required
@@ -423,84 +346,132 @@ def api_chat():
     """Handle AI chat requests"""
     user_message = request.json.get('message', '')
     user_id = session.get('user_id')
-    
-    # Simple AI response (replace with OpenAI API call)
-    ai_response = generate_ai_response(user_message)
-    
-    # Save chat to database
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO chat_messages (user_id, message, response)
-        VALUES (?, ?, ?)
-    ''', (user_id, user_message, ai_response))
-    conn.commit()
-    conn.close()
-    
+
+    # Cached answers return at once; anything else is generated and logged by
+    # the chat workers and streamed back over the user's socket, or
+    # collected from /api/chat/<request_id>
+    result = chat_service.ask(user_id, user_message, data_key())
+    result['timestamp'] = datetime.now().isoformat()
+    return jsonify(result)
+
+@app.route('/api/chat/<request_id>')
+@login_required
+def api_chat_result(request_id):
+    """Get a queued chat answer, for clients not listening on the socket"""
+    result = chat_service.result(session.get('user_id'), request_id)
+    if result is None:
+        return jsonify({'error': 'Unknown or expired chat request'}), 404
+    result['timestamp'] = datetime.now().isoformat()
+    return jsonify(result)
+
+@app.route('/api/system/queues')
+@login_required
+def api_system_queues():
+    """Get outbound socket and chat log queue depths"""
     return jsonify({
-        'response': ai_response,
-        'timestamp': datetime.now().isoformat()
+        'broadcaster': broadcaster.stats(),
+        'chat_log': chat_log.stats()
     })
 
-def generate_ai_response(message):
-    """Generate AI response (demo version)"""
-    message_lower = message.lower()
-    
-    # Simple keyword-based responses
-    if 'sales' in message_lower:
-        return "Based on our current data, total sales are performing well at R45.2M, which is 8.2% above last year. The Western Cape and Gauteng regions are leading performance. Would you like me to dive deeper into any specific region or product category?"
-    
-    elif 'profit' in message_lower:
-        return "Our profit margin is currently at 25.5%, slightly below our target of 30%. Beer and spirits categories are performing best with margins of 28% and 32% respectively. I recommend focusing on optimizing soft drinks margins."
-    
-    elif 'region' in message_lower:
-        return "Regional performance shows Gauteng leading with R12.8M (28.4%), followed by Western Cape at R9.6M (21.3%). KwaZulu-Natal and Eastern Cape show growth opportunities. Would you like a detailed regional breakdown?"
-    
-    elif 'inventory' in message_lower:
-        return "Current inventory turnover is at 8.2 times per year, below our target of 12. Stock levels are healthy across all warehouses, but we have slow-moving items in the water category that need attention."
-    
-    elif 'employee' in message_lower or 'hr' in message_lower:
-        return "Employee retention is strong at 92.1%, close to our 95% target. Sales team productivity is up 15% this quarter. The operations team could benefit from additional training on new inventory systems."
-    
-    elif 'budget' in message_lower:
-        return "We're currently 3.2% over budget in marketing spend but 2.1% under in operations. Overall budget variance is +0.8%, which is within acceptable limits. Q4 forecast looks positive."
-    
-    elif 'customer' in message_lower:
-        return "Customer satisfaction is at 87.3%, approaching our 90% target. Retail customers show highest satisfaction (91%), while wholesale needs improvement (83%). Recent feedback highlights delivery speed as a key concern."
-    
-    else:
-        return f"I understand you're asking about '{message}'. I can help you analyze sales performance, financial metrics, regional data, inventory levels, employee productivity, budget variance, and customer insights. What specific aspect would you like to explore?"
+@app.route('/api/system/queries')
+@login_required
+def api_system_queries():
+    """Get recent slow queries and the top sampled queries with their plans"""
+    limit = request.args.get('limit', 10, type=int)
+    order = request.args.get('order', 'total_ms')
+    if order not in ('total_ms', 'max_ms', 'mean_ms', 'count'):
+        return jsonify({'error': 'order must be total_ms, max_ms, mean_ms or count'}), 400
+    return jsonify({
+        'threshold_ms': query_log.threshold_ms,
+        'sample_rate': query_log.sample_rate,
+        'slow': query_log.recent(limit),
+        'top': query_log.top(limit, order)
+    })
 
 # WebSocket events for real-time updates
 @socketio.on('connect')
 def handle_connect():
+    broadcaster.connect(request.sid)
     if 'user_id' in session:
+        broadcaster.join(request.sid, user_room(session['user_id']))
         emit('status', {'msg': f"Welcome {session.get('username')}! Real-time updates are now active."})
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    pass
+    broadcaster.disconnect(request.sid)
 
-# Background task to simulate real-time data updates
-def background_thread():
-    """Send periodic updates to connected clients"""
-    while True:
-        time.sleep(30)  # Update every 30 seconds
-        
-        # Generate random update
-        updates = [
-            {'type': 'sales', 'message': f'New sale recorded: R{random.randint(1000, 5000)} in {random.choice(["Gauteng", "Western Cape", "KwaZulu-Natal"])}'},
-            {'type': 'alert', 'message': f'Inventory alert: {random.choice(["Beer", "Wine", "Spirits"])} stock running low in JHB warehouse'},
-            {'type': 'kpi', 'message': f'KPI Update: Customer satisfaction increased to {random.uniform(85, 95):.1f}%'}
-        ]
-        
-        update = random.choice(updates)
-        socketio.emit('real_time_update', update)
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    if 'user_id' not in session:
+        return
+    for topic in (data or {}).get('topics', []):
+        if is_valid_topic(topic):
+            broadcaster.join(request.sid, topic)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(data):
+    for topic in (data or {}).get('topics', []):
+        if is_valid_topic(topic):
+            broadcaster.leave(request.sid, topic)
+
+@socketio.on('resync')
+def handle_resync(data):
+    """Send a client that missed patches everything it needs to catch up"""
+    if 'user_id' not in session:
+        return
+    view = (data or {}).get('view')
+    message = snapshot_store.since(view, (data or {}).get('version', 0))
+    if message is None and view in VIEW_BUILDERS:
+        snapshot_store.publish(broadcaster, view, VIEW_BUILDERS[view], data_key())
+        message = snapshot_store.since(view, (data or {}).get('version', 0))
+    if message is not None:
+        emit('view_patch', message)
+
+# Builders for the versioned views patched over SocketIO
+VIEW_BUILDERS = {
+    'dashboard': get_dashboard_data,
+    'sales': get_sales_data,
+    'financial': get_financial_data,
+    'kpi': get_kpi_data
+}
+
+def warm_views():
+    """Build every view once so the first page loads are served from snapshots"""
+    current_key = data_key()
+    for view, build in VIEW_BUILDERS.items():
+        snapshot_store.publish(broadcaster, view, build, current_key)
+
+def refresh_views():
+    """Recompute every view a client has loaded and push the diffs"""
+    current_key = data_key()
+    for view in snapshot_store.view_names():
+        snapshot_store.publish(broadcaster, view, VIEW_BUILDERS[view], current_key)
+
+@app.context_processor
+def inject_socketio_options():
+    # Behind several workers polling requests may hit a worker that does not
+    # know the session, so clients go straight to websockets
+    return {'socketio_websocket_only': cluster.workers > 1}
+
+# Room messages from any worker reach every worker's clients through the broker
+if cluster.message_queue:
+    broadcaster.attach_bus(BrokerClient(cluster.message_queue))
 
-# Start background thread
-thread = threading.Thread(target=background_thread)
-thread.daemon = True
-thread.start()
+# Event bus pushing new sales and KPI rows to subscribed rooms through
+# bounded per-client queues; only the leader worker watches the database
+if cluster.is_leader:
+    event_bus = start_event_bus(broadcaster, DATABASE_PATH, CHANGE_FEED_INTERVAL, on_change=refresh_views)
+else:
+    event_bus = None
+broadcaster.start()
+chat_log.start()
+chat_service.start()
+readiness.done('workers')
+readiness.start([
+    ('warehouse', master_warehouse.sync),
+    ('views', warm_views),
+    ('chat_rollups', lambda: chat_engine.refresh(data_key()))
+])
 
 if __name__ == '__main__':
     print("🚀 Starting Bevco Executive Dashboard Portal...")
@@ -510,4 +481,5 @@ if __name__ == '__main__':
     print("📱 Real-time Updates: Active")
     print("🍎 Mac-optimized version (no pandas dependency)")
     
+    readiness.serving('http://localhost:5000')
     socketio.run(app, host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Broadcaster
+Topic rooms with bounded per-client outbound queues, so a slow client only
+ever loses its own stale updates instead of stalling the eventlet hub
+"""
+
+import json
+import threading
+from collections import deque
+
+# Broker channel carrying room messages between portal workers
+BROADCAST_CHANNEL = 'bevco:broadcast'
+
+class ClientQueue:
+    """Bounded outbound queue for one client: newer messages replace queued ones with the same key, and the oldest is dropped when full"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.messages = deque()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def push(self, event, data, key=None):
+        """Queue a message, coalescing on key and dropping the oldest message when full"""
+        if key is not None:
+            for index, message in enumerate(self.messages):
+                if message[2] == key:
+                    self.messages[index] = (event, data, key)
+                    self.coalesced += 1
+                    return
+
+        if len(self.messages) >= self.max_size:
+            self.messages.popleft()
+            self.dropped += 1
+        self.messages.append((event, data, key))
+
+    def pop(self, count):
+        """Take up to count messages from the front of the queue"""
+        batch = []
+        while self.messages and len(batch) < count:
+            batch.append(self.messages.popleft())
+        return batch
+
+class Broadcaster:
+    """Room membership plus per-client queues drained by a single SocketIO background task"""
+
+    def __init__(self, socketio, max_queue=50, batch_size=10, transport_limit=20):
+        self.socketio = socketio
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.transport_limit = transport_limit
+        self.clients = {}
+        self.rooms = {}
+        self.sent = 0
+        self.emitted = {}
+        self.bus = None
+        self.lock = threading.Lock()
+
+    def connect(self, sid):
+        """Register a connected client"""
+        with self.lock:
+            self.clients[sid] = ClientQueue(self.max_queue)
+
+    def disconnect(self, sid):
+        """Forget a client and its room memberships"""
+        with self.lock:
+            self.clients.pop(sid, None)
+            for members in self.rooms.values():
+                members.discard(sid)
+
+    def join(self, sid, room):
+        """Subscribe a client to a room"""
+        with self.lock:
+            if sid in self.clients:
+                self.rooms.setdefault(room, set()).add(sid)
+
+    def leave(self, sid, room):
+        """Unsubscribe a client from a room"""
+        with self.lock:
+            self.rooms.get(room, set()).discard(sid)
+
+    def attach_bus(self, bus):
+        """Fan room messages out through a broker so every worker queues them for its own clients"""
+        self.bus = bus
+
+        def listen():
+            while True:
+                try:
+                    bus.listen(BROADCAST_CHANNEL, self.receive)
+                except (ConnectionError, OSError) as e:
+                    print(f"⚠️  Broadcast channel lost, reconnecting: {e}")
+                    self.socketio.sleep(1)
+
+        self.socketio.start_background_task(listen)
+
+    def receive(self, payload):
+        """Queue a room message published by any worker"""
+        message = json.loads(payload)
+        self.publish_local(message['room'], message['event'], message['data'], message['key'])
+
+    def publish(self, room, event, data, key=None):
+        """Queue a message for every client in a room, on every worker when a bus is attached"""
+        if self.bus is not None:
+            self.bus.publish(BROADCAST_CHANNEL, json.dumps({'room': room, 'event': event, 'data': data, 'key': key}))
+        else:
+            self.publish_local(room, event, data, key)
+
+    def publish_local(self, room, event, data, key=None):
+        """Queue a message for this worker's clients in a room"""
+        with self.lock:
+            for sid in self.rooms.get(room, ()):
+                self.clients[sid].push(event, data, key)
+
+    def send(self, sid, event, data, key=None):
+        """Queue a message for a single client"""
+        with self.lock:
+            client = self.clients.get(sid)
+            if client is not None:
+                client.push(event, data, key)
+
+    def is_congested(self, sid):
+        """Check whether the transport already holds a backlog of unsent packets for a client"""
+        try:
+            server = self.socketio.server
+            eio_sid = server.manager.eio_sid_from_sid(sid, '/')
+            eio_socket = server.eio.sockets.get(eio_sid)
+        except (AttributeError, KeyError):
+            return False
+        if eio_socket is None:
+            return False
+        return eio_socket.queue.qsize() >= self.transport_limit
+
+    def drain(self):
+        """Hand up to batch_size queued messages per client to the transport, skipping congested clients"""
+        with self.lock:
+            pending = [sid for sid, client in self.clients.items() if client.messages]
+
+        sent = 0
+        for sid in pending:
+            if self.is_congested(sid):
+                continue
+            with self.lock:
+                client = self.clients.get(sid)
+                batch = client.pop(self.batch_size) if client is not None else []
+            for event, data, _ in batch:
+                # The client is local, so skip the cross-worker message queue
+                self.socketio.emit(event, data, to=sid, ignore_queue=True)
+                self.emitted[event] = self.emitted.get(event, 0) + 1
+            sent += len(batch)
+
+        self.sent += sent
+        return sent
+
+    def start(self, interval=0.05):
+        """Drain the queues from a SocketIO background task"""
+        def run():
+            while True:
+                self.drain()
+                self.socketio.sleep(interval)
+
+        self.socketio.start_background_task(run)
+
+    def stats(self):
+        """Summarise queue depth and the messages dropped or coalesced for slow clients"""
+        with self.lock:
+            clients = list(self.clients.values())
+            return {
+                'clients': len(clients),
+                'rooms': sum(1 for members in self.rooms.values() if members),
+                'queued': sum(len(client.messages) for client in clients),
+                'max_depth': max((len(client.messages) for client in clients), default=0),
+                'dropped': sum(client.dropped for client in clients),
+                'coalesced': sum(client.coalesced for client in clients),
+                'sent': self.sent,
+                'emitted': dict(self.emitted)
+            }
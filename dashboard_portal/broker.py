@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Local Message Broker
+Minimal Redis-compatible (RESP2) publish/subscribe server used as the
+SocketIO message queue between portal workers when no Redis is available,
+plus the small client the workers use for their own broadcast channel
+"""
+
+import socket
+import socketserver
+import threading
+
+def encode_bulk(value):
+    """Encode bytes or text as a RESP bulk string"""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+def encode_array(items):
+    """Encode a RESP array of bulk strings and integers"""
+    parts = [b'*%d\r\n' % len(items)]
+    for item in items:
+        parts.append(b':%d\r\n' % item if isinstance(item, int) else encode_bulk(item))
+    return b''.join(parts)
+
+def read_command(stream):
+    """Read one RESP array or inline command, returning a list of bytes arguments or None at EOF"""
+    line = stream.readline()
+    if not line:
+        return None
+    line = line.rstrip(b'\r\n')
+    if not line.startswith(b'*'):
+        return line.split()
+
+    arguments = []
+    for _ in range(int(line[1:])):
+        header = stream.readline()
+        if not header.startswith(b'$'):
+            return None
+        length = int(header[1:].rstrip(b'\r\n'))
+        arguments.append(stream.read(length + 2)[:-2])
+    return arguments
+
+def read_reply(stream):
+    """Read one RESP reply, decoding arrays recursively"""
+    line = stream.readline()
+    if not line:
+        raise ConnectionError('Broker connection closed')
+    kind, body = line[:1], line[1:].rstrip(b'\r\n')
+    if kind == b'$':
+        length = int(body)
+        return None if length < 0 else stream.read(length + 2)[:-2]
+    if kind == b'*':
+        return [read_reply(stream) for _ in range(int(body))]
+    if kind == b':':
+        return int(body)
+    if kind == b'-':
+        raise ConnectionError(body.decode('utf-8', errors='replace'))
+    return body
+
+class BrokerHandler(socketserver.StreamRequestHandler):
+    """One client connection: plain commands until it subscribes, then pushed messages"""
+
+    def setup(self):
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.channels = set()
+
+    def send(self, data):
+        with self.write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def handle(self):
+        broker = self.server
+        try:
+            while True:
+                arguments = read_command(self.rfile)
+                if arguments is None:
+                    break
+                if not arguments:
+                    continue
+
+                command = arguments[0].upper()
+                if command == b'PUBLISH' and len(arguments) == 3:
+                    self.send(b':%d\r\n' % broker.publish(arguments[1], arguments[2]))
+                elif command == b'SUBSCRIBE':
+                    for channel in arguments[1:]:
+                        broker.subscribe(channel, self)
+                        self.channels.add(channel)
+                        self.send(encode_array([b'subscribe', channel, len(self.channels)]))
+                elif command == b'UNSUBSCRIBE':
+                    for channel in arguments[1:] or list(self.channels):
+                        broker.unsubscribe(channel, self)
+                        self.channels.discard(channel)
+                        self.send(encode_array([b'unsubscribe', channel, len(self.channels)]))
+                elif command == b'PING':
+                    if self.channels:
+                        self.send(encode_array([b'pong', arguments[1] if len(arguments) > 1 else b'']))
+                    else:
+                        self.send(b'+PONG\r\n')
+                elif command == b'QUIT':
+                    self.send(b'+OK\r\n')
+                    break
+                else:
+                    # CLIENT SETINFO, SELECT and friends sent by redis clients on connect
+                    self.send(b'+OK\r\n')
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            for channel in list(self.channels):
+                broker.unsubscribe(channel, self)
+
+class MessageBroker(socketserver.ThreadingTCPServer):
+    """Threaded publish/subscribe server speaking enough of the Redis protocol for redis-py pub/sub"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=6390):
+        super().__init__((host, port), BrokerHandler)
+        self.subscribers = {}
+        self.subscribers_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'redis://{host}:{port}/0'
+
+    def subscribe(self, channel, handler):
+        with self.subscribers_lock:
+            self.subscribers.setdefault(channel, set()).add(handler)
+
+    def unsubscribe(self, channel, handler):
+        with self.subscribers_lock:
+            self.subscribers.get(channel, set()).discard(handler)
+
+    def publish(self, channel, message):
+        """Push a message to every subscriber of a channel and return how many received it"""
+        with self.subscribers_lock:
+            handlers = list(self.subscribers.get(channel, ()))
+
+        payload = encode_array([b'message', channel, message])
+        delivered = 0
+        for handler in handlers:
+            try:
+                handler.send(payload)
+                delivered += 1
+            except OSError:
+                self.unsubscribe(channel, handler)
+        return delivered
+
+    def start(self):
+        """Serve from a daemon thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+def parse_url(url):
+    """Split a redis://host:port[/db] URL into host and port"""
+    address = url.split('://', 1)[-1].split('/', 1)[0]
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port or 6379)
+
+class BrokerClient:
+    """Publishes to and subscribes on a Redis-compatible broker over plain sockets"""
+
+    def __init__(self, url):
+        self.address = parse_url(url)
+        self.publisher = None
+        self.publish_lock = threading.Lock()
+
+    def connect(self):
+        connection = socket.create_connection(self.address)
+        return connection, connection.makefile('rb')
+
+    def publish(self, channel, message):
+        """Publish a message, reconnecting once if the broker connection dropped"""
+        command = encode_array([b'PUBLISH', channel, message])
+        with self.publish_lock:
+            for attempt in range(2):
+                try:
+                    if self.publisher is None:
+                        self.publisher = self.connect()
+                    connection, stream = self.publisher
+                    connection.sendall(command)
+                    return read_reply(stream)
+                except (ConnectionError, OSError):
+                    self.publisher = None
+                    if attempt:
+                        raise
+
+    def listen(self, channel, callback):
+        """Block delivering each message on a channel to callback(bytes)"""
+        connection, stream = self.connect()
+        connection.sendall(encode_array([b'SUBSCRIBE', channel]))
+        read_reply(stream)
+        while True:
+            reply = read_reply(stream)
+            if isinstance(reply, list) and reply and reply[0] == b'message':
+                callback(reply[2])
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Chat Engine
+Maps chat questions to parameterized aggregate queries and answers them
+from the sales cube, the latest KPIs and cached rollups of the master data
+files
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from sales_cube import SalesCube, SALES, PROFIT, QUANTITY, TRANSACTIONS
+
+# Keywords per intent, checked as word prefixes; ties go to the earlier intent
+INTENT_KEYWORDS = (
+    ('inventory_reorder', ('inventory', 'stock', 'reorder', 'warehouse', 'overstock', 'replenish')),
+    ('budget_variance', ('budget', 'variance', 'forecast', 'spend', 'overspend', 'underspend')),
+    ('margin_by_category', ('margin', 'profit', 'profitab')),
+    ('sales_by_region', ('sales', 'revenue', 'region', 'sell', 'sold', 'top')),
+    ('kpi_status', ('kpi', 'target', 'satisfaction', 'retention', 'employee', 'customer', 'turnover', 'metric')),
+)
+
+# Region nicknames people type instead of the full province name
+REGION_ALIASES = {
+    'kzn': 'KwaZulu-Natal',
+    'natal': 'KwaZulu-Natal',
+    'joburg': 'Gauteng',
+    'jhb': 'Gauteng'
+}
+
+# Rollup column a question groups by -> sales cube dimension
+CUBE_DIMENSIONS = {'region': 'region', 'category': 'product_category'}
+
+# Master data files the answers read besides the portal database
+MASTER_FILES = ('fact_budget', 'fact_inventory', 'dim_product')
+
+HELP_RESPONSE = ("I can answer questions about sales by region, profit margin by category, budget variance "
+                 "by department, stock below reorder point and KPIs against target. Try \"sales in Gauteng "
+                 "this month\", \"margin by category\", \"budget variance for Marketing\" or \"what is below "
+                 "reorder in Durban?\"")
+
+def format_rand(value):
+    """Format an amount in Rand with a K/M/B suffix"""
+    magnitude = abs(value)
+    if magnitude >= 1e9:
+        return f"R{value / 1e9:.2f}B"
+    if magnitude >= 1e6:
+        return f"R{value / 1e6:.1f}M"
+    if magnitude >= 1e3:
+        return f"R{value / 1e3:.1f}K"
+    return f"R{value:,.0f}"
+
+def format_change(current, previous):
+    """Describe the change between two periods, or None when there is nothing to compare against"""
+    if not previous:
+        return None
+    change = (current - previous) / previous * 100
+    if abs(change) < 0.05:
+        return "flat"
+    return f"{'up' if change > 0 else 'down'} {abs(change):.1f}%"
+
+def join_phrases(phrases):
+    """Join phrases as "a, b and c\""""
+    phrases = list(phrases)
+    if len(phrases) < 2:
+        return ''.join(phrases)
+    return f"{', '.join(phrases[:-1])} and {phrases[-1]}"
+
+def find_names(text, names, aliases=None):
+    """Find which of the known names (or their aliases) a lower-cased message mentions"""
+    found = []
+    for name in names:
+        variants = {name.lower(), name.lower().rstrip('s')}
+        if any(re.search(rf'\b{re.escape(variant)}\b', text) for variant in variants if variant):
+            found.append(name)
+    for alias, name in (aliases or {}).items():
+        if name in names and name not in found and re.search(rf'\b{re.escape(alias)}\b', text):
+            found.append(name)
+    return found
+
+def parse_window(text, anchor):
+    """Resolve the time window a message asks about to (start, end, label), defaulting to the last 30 days"""
+    match = re.search(r'\b(?:last|past|previous)\s+(\d+)\s+(day|week|month)s?\b', text)
+    if match:
+        count, unit = max(int(match.group(1)), 1), match.group(2)
+        days = count * {'day': 1, 'week': 7, 'month': 30}[unit]
+        return anchor - timedelta(days=days - 1), anchor, f"in the last {count} {unit}{'s' if count != 1 else ''}"
+
+    if re.search(r'\btoday\b', text):
+        return anchor, anchor, "today"
+    if re.search(r'\byesterday\b', text):
+        day = anchor - timedelta(days=1)
+        return day, day, "yesterday"
+    if re.search(r'\b(?:last|past|previous) week\b', text):
+        return anchor - timedelta(days=6), anchor, "in the last week"
+    if re.search(r'\bthis month\b|\bmtd\b|\bmonth to date\b', text):
+        return anchor.replace(day=1), anchor, "this month"
+    if re.search(r'\b(?:last|previous) month\b', text):
+        end = anchor.replace(day=1) - timedelta(days=1)
+        return end.replace(day=1), end, "last month"
+    if re.search(r'\bthis quarter\b|\bqtd\b', text):
+        start = anchor.replace(month=(anchor.month - 1) // 3 * 3 + 1, day=1)
+        return start, anchor, "this quarter"
+    if re.search(r'\bthis year\b|\bytd\b|\byear to date\b', text):
+        return anchor.replace(month=1, day=1), anchor, "this year"
+    return anchor - timedelta(days=29), anchor, "in the last 30 days"
+
+class ChatEngine:
+    """Intent parser plus rollup caches; rollups are refreshed only when their data changes
+
+    Sales windows are read from a sales cube, shared with the views when
+    one is passed in, which folds in only the rows added since it was last
+    refreshed.
+    """
+
+    def __init__(self, database_path, master_data_dir, sales_cube=None):
+        self.database_path = database_path
+        self.master_data_dir = master_data_dir
+        self.sales_cube = sales_cube or SalesCube(database_path)
+        self.lock = threading.Lock()
+        self.data_key = None
+        self.cube = None
+        self.regions = []
+        self.categories = []
+        self.kpis = None
+        self.files = {}
+        self.handlers = {
+            'sales_by_region': self.answer_sales_by_region,
+            'margin_by_category': self.answer_margin_by_category,
+            'budget_variance': self.answer_budget_variance,
+            'inventory_reorder': self.answer_inventory_reorder,
+            'kpi_status': self.answer_kpi_status
+        }
+
+    # Rollups
+
+    def refresh(self, data_key):
+        """Bring the sales cube and the latest KPIs up to date when the data key moved on"""
+        with self.lock:
+            if data_key is not None and data_key == self.data_key:
+                return
+            cube = self.sales_cube.refresh()
+            conn = sqlite3.connect(self.database_path)
+            try:
+                kpi_rows = conn.execute('''
+                    SELECT k.department, k.metric_name, k.metric_value, k.target_value
+                    FROM kpi_data k
+                    JOIN (SELECT department, metric_name, MAX(id) AS id FROM kpi_data GROUP BY department, metric_name) latest
+                      ON latest.id = k.id
+                ''').fetchall()
+            finally:
+                conn.close()
+
+            self.cube = cube
+            self.regions = sorted(cube.members['region'])
+            self.categories = sorted(cube.members['product_category'])
+            self.kpis = kpi_rows
+            self.data_key = data_key
+
+    def version(self, data_key):
+        """Identify the data answers depend on: the database data key plus the master file fingerprints"""
+        parts = [str(data_key)]
+        for name in MASTER_FILES:
+            try:
+                stat = os.stat(os.path.join(self.master_data_dir, f'{name}.csv'))
+                parts.append(f'{stat.st_size}:{stat.st_mtime_ns}')
+            except OSError:
+                parts.append('-')
+        return '|'.join(parts)
+
+    def load_master(self, name, build):
+        """Read a master data CSV through build(rows), reusing the result until the file changes"""
+        path = os.path.join(self.master_data_dir, f'{name}.csv')
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = (stat.st_size, stat.st_mtime_ns)
+
+        cached = self.files.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        with open(path, newline='', encoding='utf-8') as f:
+            result = build(list(csv.DictReader(f)))
+        self.files[name] = (fingerprint, result)
+        return result
+
+    def budget_rollup(self):
+        """Budget, forecast and actual per department and month"""
+        def build(rows):
+            months = {}
+            for row in rows:
+                key = (int(row['Year']), int(row['Month']), row['Department'])
+                months[key] = (
+                    float(row['BudgetAmount'] or 0),
+                    float(row['ForecastAmount'] or 0),
+                    float(row['ActualAmount']) if row['ActualAmount'] else None
+                )
+            return months
+        return self.load_master('fact_budget', build)
+
+    def reorder_rollup(self):
+        """Stock lines below their reorder point, joined with product names and categories"""
+        products = self.load_master('dim_product', lambda rows: {
+            row['ProductKey']: (row['ProductName'], row['Category']) for row in rows
+        }) or {}
+
+        def build(rows):
+            below = []
+            for row in rows:
+                on_hand = int(float(row['StockOnHand']))
+                reorder_point = int(float(row['ReorderPoint']))
+                if on_hand < reorder_point:
+                    name, category = products.get(row['ProductKey'], (f"Product {row['ProductKey']}", 'Unknown'))
+                    below.append({
+                        'product': name,
+                        'category': category,
+                        'warehouse': row['Warehouse'],
+                        'on_hand': on_hand,
+                        'reorder_point': reorder_point,
+                        'shortfall': reorder_point - on_hand,
+                        'value': float(row['StockValue'] or 0)
+                    })
+            below.sort(key=lambda item: item['shortfall'], reverse=True)
+            return {
+                'lines': len(rows),
+                'below': below,
+                'warehouses': sorted({row['Warehouse'] for row in rows}),
+                'categories': sorted({category for _, category in products.values()})
+            }
+        return self.load_master('fact_inventory', build)
+
+    def sum_sales(self, start, end, regions=(), categories=(), group_by=None):
+        """Sum sales, profit and quantity over a window, optionally filtered and grouped by region or category
+
+        Only groups with sales lines in the window are returned, as
+        [sales, profit, quantity] keyed by the group (None when ungrouped).
+        """
+        by = CUBE_DIMENSIONS.get(group_by)
+        totals = self.cube.select(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'),
+                                  {'region': regions, 'product_category': categories}, by)
+        groups = zip(self.cube.members[by], totals) if by else [(None, totals)]
+        return {
+            group: [float(values[SALES]), float(values[PROFIT]), int(round(values[QUANTITY]))]
+            for group, values in groups if values[TRANSACTIONS] > 0
+        }
+
+    def kpi_target(self, metric_name):
+        """Get the target for a KPI metric, if the KPI table tracks it"""
+        for _, name, _, target in self.kpis:
+            if name == metric_name:
+                return target
+        return None
+
+    # Intents
+
+    def parse(self, message):
+        """Map a question to an intent name and its parameters"""
+        text = message.lower()
+        words = re.findall(r'[a-z0-9]+', text)
+
+        scores = []
+        for order, (intent, keywords) in enumerate(INTENT_KEYWORDS):
+            hits = sum(1 for word in words for keyword in keywords if word.startswith(keyword))
+            if hits:
+                scores.append((-hits, order, intent))
+
+        params = {
+            'text': text,
+            'regions': find_names(text, self.regions, REGION_ALIASES),
+            'categories': find_names(text, self.categories)
+        }
+
+        if scores:
+            intent = min(scores)[2]
+        elif params['regions'] or params['categories']:
+            intent = 'sales_by_region'
+        else:
+            intent = None
+        return intent, params
+
+    def respond(self, message, data_key=None):
+        """Answer a chat message from the cached rollups"""
+        self.refresh(data_key)
+        intent, params = self.parse(message or '')
+        if intent is None:
+            return {'intent': None, 'response': HELP_RESPONSE}
+        return {'intent': intent, 'response': self.handlers[intent](params)}
+
+    def anchor(self):
+        """Latest day in the sales data; windows are measured back from it"""
+        if not self.cube.days:
+            return datetime.now()
+        return datetime.strptime(self.cube.day(self.cube.days - 1), '%Y-%m-%d')
+
+    def answer_sales_by_region(self, params):
+        start, end, label = parse_window(params['text'], self.anchor())
+        previous_end = start - timedelta(days=1)
+        previous_start = previous_end - (end - start)
+        categories = params['categories']
+        scope = f"{join_phrases(categories)} sales" if categories else "Sales"
+
+        by_region = self.sum_sales(start, end, categories=categories, group_by='region')
+        total = sum(values[0] for values in by_region.values())
+        if not total:
+            return f"There are no {scope.lower()} recorded {label}."
+
+        if params['regions']:
+            regions = params['regions']
+            selected = sum(by_region.get(region, [0])[0] for region in regions)
+            previous = self.sum_sales(previous_start, previous_end, regions=regions, categories=categories)
+            change = format_change(selected, previous.get(None, [0])[0])
+            by_category = self.sum_sales(start, end, regions=regions, categories=categories, group_by='category')
+            if not by_category:
+                return f"There are no {scope.lower()} recorded in {join_phrases(regions)} {label}."
+            top_category, top_values = max(by_category.items(), key=lambda item: item[1][0])
+            answer = (f"{scope} in {join_phrases(regions)} {label} are {format_rand(selected)}, "
+                      f"{selected / total * 100:.1f}% of the national total of {format_rand(total)}")
+            if change:
+                answer += f" and {change} on the previous period"
+            if not categories or len(categories) > 1:
+                answer += f". {top_category} is the biggest category at {format_rand(top_values[0])}"
+            return answer + "."
+
+        previous = self.sum_sales(previous_start, previous_end, categories=categories)
+        change = format_change(total, previous.get(None, [0])[0])
+        ranked = sorted(by_region.items(), key=lambda item: item[1][0], reverse=True)
+        leaders = [f"{region} at {format_rand(values[0])} ({values[0] / total * 100:.1f}%)"
+                   for region, values in ranked[:2]]
+        answer = f"{scope} {label} are {format_rand(total)}"
+        if change:
+            answer += f", {change} on the previous period"
+        answer += f". {leaders[0]} leads"
+        if len(leaders) > 1:
+            answer += f", followed by {leaders[1]}"
+        if len(ranked) > 2:
+            region, values = ranked[-1]
+            answer += f"; {region} is lowest at {format_rand(values[0])} ({values[0] / total * 100:.1f}%)"
+        return answer + "."
+
+    def answer_margin_by_category(self, params):
+        start, end, label = parse_window(params['text'], self.anchor())
+        regions = params['regions']
+        by_category = self.sum_sales(start, end, regions=regions, categories=params['categories'], group_by='category')
+        sales = sum(values[0] for values in by_category.values())
+        if not sales:
+            return f"There are no sales recorded {label} to work out a margin from."
+
+        profit = sum(values[1] for values in by_category.values())
+        margin = profit / sales * 100
+        scope = f" in {join_phrases(regions)}" if regions else ""
+        answer = f"Profit margin{scope} {label} is {margin:.1f}% on {format_rand(sales)} sales ({format_rand(profit)} profit)"
+
+        target = self.kpi_target('Profit Margin %')
+        if target:
+            gap = margin - target
+            answer += f", {abs(gap):.1f} points {'above' if gap >= 0 else 'below'} the {target:.1f}% target"
+
+        margins = sorted(
+            ((category, values[1] / values[0] * 100) for category, values in by_category.items() if values[0]),
+            key=lambda item: item[1], reverse=True
+        )
+        if len(margins) > 1:
+            answer += f". By category: {join_phrases(f'{category} {value:.1f}%' for category, value in margins)}"
+        return answer + "."
+
+    def answer_budget_variance(self, params):
+        months = self.budget_rollup()
+        if not months:
+            return "No budget data is available yet."
+
+        text = params['text']
+        year_match = re.search(r'\b(20\d\d)\b', text)
+        years = sorted({year for year, _, _ in months})
+        year = int(year_match.group(1)) if year_match and int(year_match.group(1)) in years else years[-1]
+        departments = sorted({department for _, _, department in months})
+        selected = find_names(text, departments) or departments
+
+        # Only months with actuals count towards the variance
+        actual_months = sorted({month for (y, month, _), values in months.items() if y == year and values[2] is not None})
+        if not actual_months:
+            return f"No actuals have been booked against the {year} budget yet."
+        period = f"{datetime(year, actual_months[0], 1):%b}–{datetime(year, actual_months[-1], 1):%b} {year}"
+
+        variances = []
+        for department in selected:
+            budget = sum(months[key][0] for key in months if key[0] == year and key[2] == department and key[1] in actual_months)
+            actual = sum(months[key][2] for key in months if key[0] == year and key[2] == department and key[1] in actual_months)
+            if budget:
+                variances.append((department, budget, actual, (actual - budget) / budget * 100))
+
+        budget = sum(item[1] for item in variances)
+        actual = sum(item[2] for item in variances)
+        variance = (actual - budget) / budget * 100 if budget else 0
+        scope = join_phrases(selected) if len(selected) < len(departments) else "Overall"
+        answer = (f"{scope} actual spend for {period} is {format_rand(actual)} against a {format_rand(budget)} budget, "
+                  f"{abs(variance):.1f}% {'over' if variance > 0 else 'under'} budget")
+
+        remaining = [key for key in months if key[0] == year and key[2] in selected and months[key][2] is None]
+        if remaining:
+            answer += f", with {format_rand(sum(months[key][1] for key in remaining))} forecast for the remaining months"
+
+        if len(variances) > 1:
+            ranked = sorted(variances, key=lambda item: item[3], reverse=True)
+            over, under = ranked[0], ranked[-1]
+            answer += (f". Furthest over: {over[0]} at {over[3]:+.1f}%"
+                       f"; furthest under: {under[0]} at {under[3]:+.1f}%")
+        return answer + "."
+
+    def answer_inventory_reorder(self, params):
+        rollup = self.reorder_rollup()
+        if rollup is None:
+            return "No inventory data is available yet."
+
+        text = params['text']
+        warehouses = find_names(text, rollup['warehouses']) or [
+            name for name in rollup['warehouses'] if re.search(rf"\b{re.escape(name.lower().split(' dc')[0])}\b", text)
+        ]
+        categories = find_names(text, rollup['categories'])
+        below = [
+            item for item in rollup['below']
+            if (not warehouses or item['warehouse'] in warehouses) and (not categories or item['category'] in categories)
+        ]
+
+        scope = " in " + join_phrases(warehouses) if warehouses else ""
+        if categories:
+            scope = f" for {join_phrases(categories)}{scope}"
+        if not below:
+            return f"No stock lines{scope} are below their reorder point."
+
+        by_warehouse = {}
+        for item in below:
+            by_warehouse[item['warehouse']] = by_warehouse.get(item['warehouse'], 0) + 1
+        answer = (f"{len(below)} stock line{'s' if len(below) != 1 else ''}{scope} "
+                  f"{'are' if len(below) != 1 else 'is'} below reorder point "
+                  f"(of {rollup['lines']:,} lines tracked)")
+        if len(by_warehouse) > 1:
+            worst, count = max(by_warehouse.items(), key=lambda item: item[1])
+            answer += f"; {worst} has the most with {count}"
+
+        largest = [f"{item['product']} at {item['warehouse']} ({item['on_hand']:,} on hand vs {item['reorder_point']:,})"
+                   for item in below[:3]]
+        return answer + f". Largest shortfalls: {join_phrases(largest)}."
+
+    def answer_kpi_status(self, params):
+        if not self.kpis:
+            return "No KPI data is available yet."
+
+        text = params['text']
+        departments = sorted({department for department, _, _, _ in self.kpis})
+        metrics = sorted({metric for _, metric, _, _ in self.kpis})
+        selected_departments = find_names(text, departments)
+        selected_metrics = [metric for metric in metrics
+                            if any(re.search(rf'\b{re.escape(word)}', text)
+                                   for word in re.findall(r'[a-z]{4,}', metric.lower()))]
+
+        summary = []
+        for metric in selected_metrics or metrics:
+            rows = [row for row in self.kpis if row[1] == metric and (not selected_departments or row[0] in selected_departments)]
+            if not rows:
+                continue
+            value = sum(row[2] for row in rows) / len(rows)
+            target = sum(row[3] for row in rows) / len(rows)
+            summary.append((metric, value, target))
+
+        scope = f" for {join_phrases(selected_departments)}" if selected_departments else ""
+        if not summary:
+            return f"There are no KPI readings{scope} yet."
+
+        def describe(metric, value, target):
+            number = format_rand(value) if abs(target) >= 1e5 else f"{value:.1f}"
+            goal = format_rand(target) if abs(target) >= 1e5 else f"{target:.1f}"
+            return f"{metric} {number} vs {goal} target"
+
+        behind = [item for item in summary if item[1] < item[2]]
+        answer = f"Latest KPIs{scope}: {join_phrases(describe(*item) for item in summary)}"
+        if len(summary) > 1:
+            answer += (f". {len(behind)} of {len(summary)} are behind target" if behind
+                       else ". All are on or ahead of target")
+        return answer + "."
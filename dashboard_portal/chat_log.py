@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Chat Log Writer
+Write-behind queue for chat_messages: records are batched and written in
+one transaction every flush interval or batch size, instead of one commit
+per message contending for the SQLite writer lock
+"""
+
+import atexit
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+class ChatLogWriter:
+    """Batches chat records from any request or worker and flushes them from one background task"""
+
+    def __init__(self, socketio, database_path, flush_interval=0.25, batch_size=100):
+        self.socketio = socketio
+        self.database_path = database_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = socketio.server.eio.create_queue()
+        self.queue_empty = socketio.server.eio.get_queue_empty_exception()
+        # Rows taken off the queue but not yet committed
+        self.batch = []
+        self.lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+        self.closed = False
+
+    def write(self, user_id, message, response):
+        """Queue a chat exchange; the timestamp is taken now, not when the batch lands"""
+        timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        self.queue.put((user_id, message, response, timestamp))
+
+    def start(self):
+        """Flush from a SocketIO background task, and flush whatever is left when the process exits"""
+        self.socketio.start_background_task(self.run)
+        atexit.register(self.close)
+        # SIGTERM (serve.py stopping its workers, service managers) skips atexit unless it becomes a normal exit
+        if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    def run(self):
+        while not self.closed:
+            try:
+                first = self.queue.get(timeout=1)
+            except self.queue_empty:
+                continue
+
+            with self.lock:
+                self.batch.append(first)
+            deadline = time.monotonic() + self.flush_interval
+            while len(self.batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self.queue.get(timeout=remaining)
+                except self.queue_empty:
+                    break
+                with self.lock:
+                    self.batch.append(row)
+
+            if not self.flush():
+                # Keep the batch and try again after a pause, e.g. while another writer holds the lock
+                self.socketio.sleep(self.flush_interval)
+
+    def flush(self):
+        """Commit the pending batch in one transaction; returns False if it has to be retried"""
+        with self.lock:
+            if not self.batch:
+                return True
+            start = time.perf_counter()
+            try:
+                conn = sqlite3.connect(self.database_path, timeout=5)
+                try:
+                    with conn:
+                        conn.executemany('''
+                            INSERT INTO chat_messages (user_id, message, response, timestamp)
+                            VALUES (?, ?, ?, ?)
+                        ''', self.batch)
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                self.failures += 1
+                print(f"⚠️  Chat log flush failed, will retry: {e}")
+                return False
+
+            self.written += len(self.batch)
+            self.batches += 1
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.batch = []
+            return True
+
+    def close(self):
+        """Stop the flusher and write every remaining record"""
+        self.closed = True
+        while True:
+            try:
+                row = self.queue.get_nowait()
+            except self.queue_empty:
+                break
+            with self.lock:
+                self.batch.append(row)
+        self.flush()
+
+    def depth(self):
+        """Records accepted but not yet committed"""
+        return self.queue.qsize() + len(self.batch)
+
+    def stats(self):
+        return {
+            'queue_depth': self.depth(),
+            'written': self.written,
+            'batches': self.batches,
+            'failures': self.failures,
+            'last_flush_ms': round(self.last_flush_ms, 2)
+        }
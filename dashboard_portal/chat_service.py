@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Chat Service
+Normalized-question answer cache in front of the chat engine, plus a pool
+of background workers that generate answers off the request thread and
+stream them back to the asking user over SocketIO. Finished answers are
+also kept by request id for clients that collect them over HTTP
+"""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from chat_engine import REGION_ALIASES
+
+# Filler words that do not change what a question asks for
+STOP_WORDS = frozenset((
+    'a', 'about', 'all', 'an', 'and', 'any', 'are', 'at', 'be', 'by', 'can', 'could', 'did', 'do', 'does',
+    'doing', 'for', 'from', 'give', 'how', 'i', 'in', 'is', 'it', 'me', 'much', 'my', 'of', 'on', 'our',
+    'please', 'show', 'tell', 'that', 'the', 'there', 'to', 'us', 'was', 'we', 'were', 'what', 'whats',
+    'which', 'with', 'you'
+))
+
+def user_room(user_id):
+    """Get the private room a logged-in user's sockets join"""
+    return f'user:{user_id}'
+
+def normalize_question(message):
+    """Reduce a question to a canonical key: lower-case words, aliases expanded, fillers and plurals dropped, order ignored"""
+    words = set()
+    for word in re.findall(r'[a-z0-9%][a-z0-9%-]*', (message or '').lower()):
+        word = REGION_ALIASES.get(word, word).lower()
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.add(word)
+    return ' '.join(sorted(words))
+
+class AnswerCache:
+    """LRU of answers keyed by normalized question; entries expire after ttl seconds or when the data version changes"""
+
+    def __init__(self, max_entries=500, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Read by request handlers while workers add answers
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version or time.time() - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, version, answer):
+        with self.lock:
+            self.entries[key] = (version, time.time(), answer)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+class ChatService:
+    """Answers chat questions from the cache or hands them to background workers"""
+
+    def __init__(self, socketio, broadcaster, engine, chat_log, workers=4, cache=None,
+                 max_results=1000, result_ttl=300):
+        self.socketio = socketio
+        self.broadcaster = broadcaster
+        self.engine = engine
+        self.chat_log = chat_log
+        self.workers = workers
+        self.cache = cache or AnswerCache()
+        # Queue type matching the async mode, so waiting workers yield to the server
+        self.jobs = socketio.server.eio.create_queue()
+        # pending and results are shared by request handlers and workers
+        self.lock = threading.Lock()
+        self.pending = {}
+        # request id -> (user id, answer or None while pending, time asked)
+        self.results = OrderedDict()
+        self.max_results = max_results
+        self.result_ttl = result_ttl
+
+    def start(self):
+        """Start the answer workers as SocketIO background tasks"""
+        for _ in range(self.workers):
+            self.socketio.start_background_task(self.run_worker)
+
+    def ask(self, user_id, message, data_key):
+        """Answer from the cache, or queue the question and return a request id the answer will stream under"""
+        key = normalize_question(message)
+        version = self.engine.version(data_key)
+        request_id = uuid.uuid4().hex
+
+        answer = self.cache.get(key, version)
+        if answer is not None:
+            self.chat_log.write(user_id, message, answer['response'])
+            return dict(answer, request_id=request_id, status='done', cached=True)
+
+        # Identical questions already being answered share that answer
+        waiter = (request_id, user_id, message)
+        job_key = (key, version)
+        with self.lock:
+            self.keep_result(request_id, user_id, None)
+            if job_key in self.pending:
+                self.pending[job_key].append(waiter)
+                return {'request_id': request_id, 'status': 'pending'}
+            self.pending[job_key] = [waiter]
+        self.jobs.put((job_key, message, data_key))
+        return {'request_id': request_id, 'status': 'pending'}
+
+    def result(self, user_id, request_id):
+        """A queued question's answer as returned by ask once it is done, or still pending; None if unknown"""
+        with self.lock:
+            entry = self.results.get(request_id)
+        if entry is None or entry[0] != user_id:
+            return None
+        if entry[1] is None:
+            return {'request_id': request_id, 'status': 'pending'}
+        return dict(entry[1], request_id=request_id, status='done', cached=False)
+
+    def keep_result(self, request_id, user_id, answer):
+        """Record a request's answer, dropping the oldest past max_results or result_ttl; call with the lock held"""
+        asked = self.results[request_id][2] if request_id in self.results else time.time()
+        self.results[request_id] = (user_id, answer, asked)
+        expired = time.time() - self.result_ttl
+        while self.results and (len(self.results) > self.max_results or next(iter(self.results.values()))[2] < expired):
+            self.results.popitem(last=False)
+
+    def finish(self, job_key, answer):
+        """Take everyone waiting on a question and keep the answer under each request id"""
+        with self.lock:
+            waiters = self.pending.pop(job_key, [])
+            for request_id, user_id, _ in waiters:
+                if request_id in self.results:
+                    self.keep_result(request_id, user_id, answer)
+        return waiters
+
+    def run_worker(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                self.answer(*job)
+            except Exception as e:
+                print(f"⚠️  Chat worker error: {e}")
+
+    def answer(self, job_key, message, data_key):
+        """Generate an answer, cache it and stream it to everyone waiting on the question"""
+        try:
+            answer = self.engine.respond(message, data_key)
+        except Exception:
+            answer = {'intent': None, 'response': 'Sorry, I could not work that out right now. Please try again.'}
+            self.stream_all(self.finish(job_key, answer), answer)
+            raise
+
+        self.cache.set(job_key[0], job_key[1], answer)
+        waiters = self.finish(job_key, answer)
+        self.stream_all(waiters, answer)
+        for _, user_id, asked in waiters:
+            self.chat_log.write(user_id, asked, answer['response'])
+
+    def stream_all(self, waiters, answer):
+        for request_id, user_id, _ in waiters:
+            self.stream(user_id, request_id, answer)
+
+    def stream(self, user_id, request_id, answer):
+        """Send an answer sentence by sentence, ending with the complete response"""
+        room = user_room(user_id)
+        for sentence in re.split(r'(?<=[.;])\s+', answer['response']):
+            self.broadcaster.publish(room, 'chat_stream', {'request_id': request_id, 'delta': sentence, 'done': False})
+        self.broadcaster.publish(room, 'chat_stream', {
+            'request_id': request_id,
+            'done': True,
+            'intent': answer['intent'],
+            'response': answer['response']
+        })
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Cluster Settings
+Describes the worker this process runs as when launched by serve.py; a
+plain `python app.py` run is a single worker with no message queue
+"""
+
+import os
+
+class ClusterSettings:
+    def __init__(self):
+        self.workers = int(os.getenv('PORTAL_WORKERS', '1'))
+        self.worker_index = int(os.getenv('PORTAL_WORKER_INDEX', '0'))
+        self.message_queue = os.getenv('PORTAL_MESSAGE_QUEUE') or None
+        # Shared memory snapshot/response cache handed over by serve.py
+        self.cache = None
+
+    @property
+    def is_leader(self):
+        """Only the first worker polls the change feed, so the database is watched once"""
+        return self.worker_index == 0
+
+cluster = ClusterSettings()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Response Compression
+Compresses buffered text and JSON responses with brotli (when installed) or
+gzip, whichever the client prefers in Accept-Encoding, once the body is
+large enough to be worth it; streamed responses and files are left alone
+"""
+
+import gzip
+import threading
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this go out as they are
+MIN_COMPRESS_SIZE = 1024
+# Fast enough per request while still shrinking JSON several times
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Content types worth compressing; images, archives and Parquet already are
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+
+def encode(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class Compression:
+    """after_request hook negotiating Content-Encoding per response, with byte counts for /metrics"""
+
+    def __init__(self):
+        self.minimum_size = MIN_COMPRESS_SIZE
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+        self.lock = threading.Lock()
+        self.counts = {'compressed': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+    def init_app(self, app, minimum_size=MIN_COMPRESS_SIZE):
+        """Compress every eligible response of app; a negative minimum_size turns compression off"""
+        self.minimum_size = minimum_size
+        if minimum_size >= 0:
+            app.after_request(self.compress_response)
+
+    def compress_response(self, response):
+        """Compress a response body in place when the request accepts an encoding we offer"""
+        if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+                or not 200 <= response.status_code < 300 or response.status_code == 204
+                or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < self.minimum_size:
+            return response
+
+        compressed = encode(body, encoding)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        with self.lock:
+            self.counts['compressed'] += 1
+            self.counts['bytes_in'] += len(body)
+            self.counts['bytes_out'] += len(compressed)
+        return response
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, minimum_size=self.minimum_size)
+
+compression = Compression()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Database Startup
+Creates, migrates and seeds the portal's SQLite database. A schema
+version marker lets warm starts skip all of it, and a prebuilt sample
+snapshot replaces seeding on a fresh install
+"""
+
+import gzip
+import os
+import random
+import shutil
+import sqlite3
+from datetime import datetime, timedelta
+
+# Bump when the statements below change so existing databases are migrated
+SCHEMA_VERSION = 1
+
+# Gzipped sample database restored on first start instead of generating data
+SAMPLE_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data', 'bevco_dashboard.db.gz')
+
+# Sample data dimensions
+SAMPLE_ROWS = 5000
+SAMPLE_DAYS = 180
+REGIONS = ['Gauteng', 'Western Cape', 'KwaZulu-Natal', 'Eastern Cape', 'Free State']
+CATEGORIES = ['Beer', 'Wine', 'Spirits', 'Soft Drinks', 'Water']
+VENDORS = ['SAB Miller', 'Distell', 'Coca-Cola', 'Pepsi', 'Local Brands']
+CUSTOMER_TYPES = ['Retail', 'Wholesale', 'On-Trade', 'Export']
+DEPARTMENTS = ['Sales', 'Marketing', 'Finance', 'Operations', 'HR']
+
+# Realistic sales amount range per category
+CATEGORY_AMOUNTS = {
+    'Beer': (1000, 5000),
+    'Wine': (2000, 8000),
+    'Spirits': (3000, 12000),
+    'Soft Drinks': (500, 3000),
+    'Water': (200, 1500)
+}
+
+# KPI name, typical current value and target
+KPI_METRICS = [
+    ('Total Sales', 50000000, 45000000),
+    ('Profit Margin %', 25.5, 30.0),
+    ('Customer Satisfaction', 87.3, 90.0),
+    ('Employee Retention %', 92.1, 95.0),
+    ('Inventory Turnover', 8.2, 12.0)
+]
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        role TEXT DEFAULT 'user',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS sales_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        region TEXT NOT NULL,
+        product_category TEXT NOT NULL,
+        vendor TEXT NOT NULL,
+        customer_type TEXT NOT NULL,
+        sales_amount REAL NOT NULL,
+        profit_amount REAL NOT NULL,
+        quantity INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS kpi_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        metric_name TEXT NOT NULL,
+        metric_value REAL NOT NULL,
+        target_value REAL NOT NULL,
+        date DATE NOT NULL,
+        department TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS chat_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        message TEXT NOT NULL,
+        response TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    '''
+)
+
+def schema_version(conn):
+    """Read the schema version marker stored in the database header"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def create_schema(conn):
+    """Create the tables and the default admin user"""
+    # Password hashing is deliberately slow, so it only runs when the schema is created
+    from werkzeug.security import generate_password_hash
+
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.execute('''
+        INSERT OR IGNORE INTO users (username, email, password_hash, role)
+        VALUES (?, ?, ?, ?)
+    ''', ('admin', 'admin@bevco.com', generate_password_hash('admin123'), 'admin'))
+
+def sales_row_chunks(count, days=SAMPLE_DAYS, seed=None, chunk_size=100000):
+    """Yield lists of sample sales rows, chunk_size at a time, generated column-wise with numpy when installed"""
+    try:
+        import numpy as np
+    except ImportError:
+        yield from python_sales_row_chunks(count, days, seed, chunk_size)
+        return
+
+    rng = np.random.default_rng(seed)
+    start_date = datetime.now() - timedelta(days=days)
+    dates = np.array([(start_date + timedelta(days=day)).strftime('%Y-%m-%d') for day in range(days + 1)], dtype=object)
+    regions = np.array(REGIONS, dtype=object)
+    categories = np.array(CATEGORIES, dtype=object)
+    vendors = np.array(VENDORS, dtype=object)
+    customer_types = np.array(CUSTOMER_TYPES, dtype=object)
+    lows = np.array([CATEGORY_AMOUNTS[category][0] for category in CATEGORIES])
+    spans = np.array([CATEGORY_AMOUNTS[category][1] - CATEGORY_AMOUNTS[category][0] for category in CATEGORIES])
+
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        category = rng.integers(0, len(CATEGORIES), size)
+        sales_amount = np.round(lows[category] + rng.random(size) * spans[category], 2)
+        profit_amount = np.round(sales_amount * rng.uniform(0.15, 0.35, size), 2)
+        yield list(zip(
+            dates[rng.integers(0, days + 1, size)].tolist(),
+            regions[rng.integers(0, len(REGIONS), size)].tolist(),
+            categories[category].tolist(),
+            vendors[rng.integers(0, len(VENDORS), size)].tolist(),
+            customer_types[rng.integers(0, len(CUSTOMER_TYPES), size)].tolist(),
+            sales_amount.tolist(),
+            profit_amount.tolist(),
+            rng.integers(10, 501, size).tolist()
+        ))
+
+def python_sales_row_chunks(count, days, seed, chunk_size):
+    """Pure Python fallback for sales_row_chunks, drawing each column with one random.choices call"""
+    generator = random.Random(seed)
+    start_date = datetime.now() - timedelta(days=days)
+    dates = [(start_date + timedelta(days=day)).strftime('%Y-%m-%d') for day in range(days + 1)]
+    amounts = [CATEGORY_AMOUNTS[category] for category in CATEGORIES]
+
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        category = generator.choices(range(len(CATEGORIES)), k=size)
+        sales_amount = [round(generator.uniform(*amounts[index]), 2) for index in category]
+        yield list(zip(
+            generator.choices(dates, k=size),
+            generator.choices(REGIONS, k=size),
+            [CATEGORIES[index] for index in category],
+            generator.choices(VENDORS, k=size),
+            generator.choices(CUSTOMER_TYPES, k=size),
+            sales_amount,
+            [round(amount * generator.uniform(0.15, 0.35), 2) for amount in sales_amount],
+            [generator.randint(10, 500) for _ in range(size)]
+        ))
+
+def seed_sample_data(conn, rows=SAMPLE_ROWS, seed=None, chunk_size=100000):
+    """Load sample business data into empty tables and return the number of sales rows written"""
+    if conn.execute('SELECT COUNT(*) FROM sales_data').fetchone()[0] > 0:
+        return 0
+
+    for chunk in sales_row_chunks(rows, seed=seed, chunk_size=chunk_size):
+        conn.executemany('''
+            INSERT INTO sales_data (date, region, product_category, vendor, customer_type, sales_amount, profit_amount, quantity)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', chunk)
+
+    # Generate KPI data
+    today = datetime.now().strftime('%Y-%m-%d')
+    generator = random.Random(seed)
+    conn.executemany('''
+        INSERT INTO kpi_data (metric_name, metric_value, target_value, date, department)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [
+        (metric_name, current + generator.uniform(-5, 5), target, today, department)
+        for department in DEPARTMENTS
+        for metric_name, current, target in KPI_METRICS
+    ])
+    return rows
+
+def shift_dates_to_today(conn):
+    """Move every sample date forward so a restored snapshot ends today, keeping the rolling windows populated"""
+    latest = conn.execute('SELECT MAX(date) FROM sales_data').fetchone()[0]
+    if not latest:
+        return 0
+    days = (datetime.now().date() - datetime.strptime(latest, '%Y-%m-%d').date()).days
+    if days > 0:
+        for table in ('sales_data', 'kpi_data'):
+            conn.execute(f"UPDATE {table} SET date = date(date, ?)", (f'+{days} days',))
+    return days
+
+def restore_snapshot(database_path, snapshot_path=SAMPLE_SNAPSHOT_PATH):
+    """Unpack the sample snapshot when there is no database yet; returns whether it did"""
+    if os.path.exists(database_path) or not snapshot_path or not os.path.exists(snapshot_path):
+        return False
+
+    # Unpack next to the target and rename, so another worker never opens half a file
+    partial = f'{database_path}.{os.getpid()}.partial'
+    with gzip.open(snapshot_path, 'rb') as source, open(partial, 'wb') as target:
+        shutil.copyfileobj(source, target)
+
+    conn = sqlite3.connect(partial)
+    try:
+        if schema_version(conn) != SCHEMA_VERSION:
+            conn.close()
+            os.remove(partial)
+            return False
+        shift_dates_to_today(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    if os.path.exists(database_path):
+        os.remove(partial)
+        return False
+    os.replace(partial, database_path)
+    return True
+
+def prepare_database(database_path, snapshot_path=SAMPLE_SNAPSHOT_PATH, rows=SAMPLE_ROWS, seed=None):
+    """Get the database ready to serve and report which startup path was taken"""
+    directory = os.path.dirname(database_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # The snapshot only holds the standard sample size
+    if rows == SAMPLE_ROWS and restore_snapshot(database_path, snapshot_path):
+        return 'snapshot'
+
+    conn = sqlite3.connect(database_path)
+    try:
+        if schema_version(conn) == SCHEMA_VERSION:
+            return 'current'
+
+        # Everything below commits once; skipping fsyncs until then keeps
+        # multi-million row seeds bound by row generation rather than the disk
+        conn.execute('PRAGMA synchronous = OFF')
+        create_schema(conn)
+        seed_sample_data(conn, rows=rows, seed=seed)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+    finally:
+        conn.close()
+    return 'initialized'
+
+def build_snapshot(database_path, snapshot_path=SAMPLE_SNAPSHOT_PATH):
+    """Write a compacted, gzipped copy of a prepared database to snapshot_path"""
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    compact = f'{snapshot_path}.{os.getpid()}.db'
+    conn = sqlite3.connect(database_path)
+    try:
+        conn.execute('VACUUM INTO ?', (compact,))
+    finally:
+        conn.close()
+
+    try:
+        # A fixed header timestamp keeps rebuilds of unchanged data byte-identical
+        with open(compact, 'rb') as source, gzip.GzipFile(snapshot_path, 'wb', compresslevel=9, mtime=0) as target:
+            shutil.copyfileobj(source, target)
+    finally:
+        os.remove(compact)
+    return os.path.getsize(snapshot_path)
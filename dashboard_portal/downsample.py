@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Series Downsampling
+Largest-Triangle-Three-Buckets: thins a long chart series to a given number
+of points while keeping its peaks, dips and overall shape, so multi-year
+trends reach the browser as a few hundred points instead of thousands
+"""
+
+import numpy as np
+
+# LTTB always keeps the first and last point plus one per bucket
+MIN_POINTS = 3
+
+# Buckets up to this many points are picked through a choice table
+TABLE_WIDTH = 32
+# Most candidate areas held at once while building the choice table
+BLOCK_ELEMENTS = 1 << 20
+
+def lttb(x, y, max_points):
+    """Indices of the points of (x, y) that LTTB keeps, in order; every index when the series is short enough
+
+    Each bucket's triangles start at the point picked in the bucket before.
+    Wide buckets are picked one at a time, each an array operation over the
+    bucket. For narrow buckets, where the per-call overhead would dominate,
+    the best point of every bucket is worked out at once for each point that
+    could have been picked before it, and picking is a walk through that table.
+    """
+    count = len(x)
+    if max_points is None or count <= max(max_points, MIN_POINTS):
+        return np.arange(count)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # max_points - 2 buckets between the first and the last point, in integers so the
+    # last edge is exactly count - 1 and no point falls off the end to float rounding
+    edges = 1 + np.arange(max_points - 1) * (count - 2) // (max_points - 2)
+    starts, ends = edges[:-1], edges[1:]
+    buckets = len(starts)
+
+    # Average of each bucket from running sums; the last bucket looks ahead to the last point
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = ends - starts
+    next_x = np.append(((x_sums[ends] - x_sums[starts]) / sizes)[1:], x[-1])[:, None]
+    next_y = np.append(((y_sums[ends] - y_sums[starts]) / sizes)[1:], y[-1])[:, None]
+
+    # Buckets as rows of a padded matrix; padding repeats a bucket's last point
+    width = int(sizes.max())
+    members = np.minimum(starts[:, None] + np.arange(width), ends[:, None] - 1)
+    bucket_x, bucket_y = x[members], y[members]
+
+    # Twice the triangle area from a = (ax, ay) is |ax * p + ay * q + r|
+    p = bucket_y - next_y
+    q = next_x - bucket_x
+    r = bucket_x * next_y - next_x * bucket_y
+
+    kept = np.empty(max_points, dtype=int)
+    kept[0], kept[-1] = 0, count - 1
+    if width > TABLE_WIDTH:
+        picked = 0
+        for bucket in range(buckets):
+            column = np.abs(x[picked] * p[bucket] + y[picked] * q[bucket] + r[bucket]).argmax()
+            picked = kept[bucket + 1] = members[bucket, column]
+        return kept
+
+    # table[bucket, i]: column picked in a bucket when the previous pick was
+    # column i of the bucket before; the first bucket starts from the first point
+    previous = np.vstack([np.zeros((1, width), dtype=int), members[:-1]])
+    table = np.empty((buckets, width), dtype=int)
+    step = max(BLOCK_ELEMENTS // (width * width), 1)
+    for first in range(0, buckets, step):
+        block = slice(first, first + step)
+        ax, ay = x[previous[block]][:, :, None], y[previous[block]][:, :, None]
+        table[block] = np.abs(ax * p[block, None] + ay * q[block, None] + r[block, None]).argmax(axis=2)
+
+    column = 0
+    for bucket, row in enumerate(table.tolist()):
+        column = row[column]
+        kept[bucket + 1] = column
+    kept[1:-1] += starts
+    return kept
+
+def keep_points(x, series, max_points):
+    """Indices of about max_points x values to keep for several series drawn over the same x
+
+    Each series gets the same share of points and the union of what LTTB
+    keeps for each is returned, so every series is shown at the same x.
+    Series often peak together, so the share is the largest whose union
+    still fits rather than max_points split evenly. The result never has
+    more than max_points points, even with more series than points.
+    """
+    if max_points is None or len(x) <= max_points:
+        return np.arange(len(x))
+
+    def union(share):
+        return np.unique(np.concatenate([lttb(x, y, share) for y in series]))
+
+    low, high = max(max_points // max(len(series), 1), MIN_POINTS), max_points
+    kept = union(low)
+    if len(kept) > max_points:
+        # Too many series for a point each between the ends: keep the ends and an even spread of those points
+        middle = kept[1:-1]
+        spread = np.linspace(0, len(middle) - 1, max_points - 2).round().astype(int)
+        return np.concatenate(([kept[0]], middle[spread], [kept[-1]]))
+    while low < high:
+        share = (low + high + 1) // 2
+        candidate = union(share)
+        if len(candidate) <= max_points:
+            kept, low = candidate, share
+        else:
+            high = share - 1
+    return kept
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Event Bus
+Detects rows appended to sales_data and kpi_data and pushes coalesced
+per-interval deltas to the SocketIO rooms that subscribed to them
+"""
+
+import sqlite3
+
+from snapshots import VIEW_ROOM_PREFIX
+
+# Rooms clients may join; regional sales use one room per region and
+# versioned view patches one room per view
+TOPICS = ('sales', 'finance', 'operations', 'kpi')
+REGION_ROOM_PREFIX = 'region:'
+
+# Department KPI changes are also published to the matching page's room
+DEPARTMENT_TOPICS = {
+    'Sales': 'sales',
+    'Finance': 'finance',
+    'Operations': 'operations'
+}
+
+def region_room(region):
+    """Get the room name for a single region's sales"""
+    return f'{REGION_ROOM_PREFIX}{region}'
+
+def is_valid_topic(topic):
+    """Check that a client-requested room is one the event bus publishes to"""
+    if not isinstance(topic, str):
+        return False
+    if topic in TOPICS:
+        return True
+    return any(
+        topic.startswith(prefix) and len(topic) > len(prefix)
+        for prefix in (REGION_ROOM_PREFIX, VIEW_ROOM_PREFIX)
+    )
+
+class ChangeFeed:
+    """Append-log reader that tracks the highest row id already published per table"""
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+        self.last_ids = {}
+
+    def prime(self):
+        """Start at the current end of each table so existing history is not replayed"""
+        conn = sqlite3.connect(self.database_path)
+        try:
+            cursor = conn.cursor()
+            for table in ('sales_data', 'kpi_data'):
+                cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+                self.last_ids[table] = cursor.fetchone()[0]
+        finally:
+            conn.close()
+
+    def poll(self):
+        """Collect the deltas appended since the previous poll as (room, payload) pairs"""
+        conn = sqlite3.connect(self.database_path)
+        try:
+            cursor = conn.cursor()
+            return self.sales_deltas(cursor) + self.kpi_deltas(cursor)
+        finally:
+            conn.close()
+
+    def sales_deltas(self, cursor):
+        """Coalesce new sales rows into per-region totals"""
+        cursor.execute('''
+            SELECT region, COUNT(*), SUM(sales_amount), SUM(profit_amount), MAX(id)
+            FROM sales_data
+            WHERE id > ?
+            GROUP BY region
+            ORDER BY SUM(sales_amount) DESC
+        ''', (self.last_ids.get('sales_data', 0),))
+        rows = cursor.fetchall()
+        if not rows:
+            return []
+
+        self.last_ids['sales_data'] = max(row[4] for row in rows)
+        regions = [
+            {'region': row[0], 'transactions': row[1], 'sales': round(row[2], 2), 'profit': round(row[3], 2)}
+            for row in rows
+        ]
+        transactions = sum(region['transactions'] for region in regions)
+        total_sales = round(sum(region['sales'] for region in regions), 2)
+        total_profit = round(sum(region['profit'] for region in regions), 2)
+
+        events = [('sales', {
+            'type': 'sales',
+            'regions': regions,
+            'transactions': transactions,
+            'total_sales': total_sales,
+            'total_profit': total_profit,
+            'message': f'{transactions} new sales recorded: R{total_sales:,.0f} across {len(regions)} regions'
+        })]
+
+        for region in regions:
+            events.append((region_room(region['region']), {
+                'type': 'sales',
+                'regions': [region],
+                'transactions': region['transactions'],
+                'total_sales': region['sales'],
+                'total_profit': region['profit'],
+                'message': f"{region['transactions']} new sales recorded: R{region['sales']:,.0f} in {region['region']}"
+            }))
+
+        return events
+
+    def kpi_deltas(self, cursor):
+        """Coalesce new KPI rows, keeping only the latest value per department and metric"""
+        cursor.execute('''
+            SELECT id, metric_name, metric_value, target_value, department
+            FROM kpi_data
+            WHERE id > ?
+            ORDER BY id
+        ''', (self.last_ids.get('kpi_data', 0),))
+        rows = cursor.fetchall()
+        if not rows:
+            return []
+
+        self.last_ids['kpi_data'] = rows[-1][0]
+        latest = {}
+        for _, metric_name, metric_value, target_value, department in rows:
+            latest[(department, metric_name)] = {
+                'metric_name': metric_name,
+                'metric_value': metric_value,
+                'target_value': target_value,
+                'department': department
+            }
+        changes = list(latest.values())
+
+        events = [('kpi', self.kpi_payload(changes))]
+        for department, topic in DEPARTMENT_TOPICS.items():
+            department_changes = [kpi for kpi in changes if kpi['department'] == department]
+            if department_changes:
+                events.append((topic, self.kpi_payload(department_changes)))
+        return events
+
+    def kpi_payload(self, changes):
+        """Build the real-time message for a set of KPI changes"""
+        if len(changes) == 1:
+            kpi = changes[0]
+            message = (f"KPI Update: {kpi['metric_name']} ({kpi['department']}) is "
+                       f"{kpi['metric_value']:.1f} against a target of {kpi['target_value']:.1f}")
+        else:
+            message = f'KPI Update: {len(changes)} KPIs changed'
+
+        return {'type': 'kpi', 'kpis': changes, 'message': message}
+
+def start_event_bus(broadcaster, database_path, interval=5, on_change=None):
+    """Run the change feed as a SocketIO background task and queue deltas for their rooms
+
+    on_change is called after each poll that found new rows, e.g. to refresh
+    versioned view snapshots.
+    """
+    socketio = broadcaster.socketio
+    feed = ChangeFeed(database_path)
+    feed.prime()
+
+    def publish():
+        while True:
+            socketio.sleep(interval)
+            try:
+                events = feed.poll()
+            except sqlite3.Error as e:
+                print(f"⚠️  Event bus poll failed: {e}")
+                continue
+
+            for room, payload in events:
+                broadcaster.publish(room, 'real_time_update', payload)
+
+            if events and on_change is not None:
+                on_change()
+
+    socketio.start_background_task(publish)
+    return feed
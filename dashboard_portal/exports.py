@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Sales Export
+Streams the sales_data rows behind the dashboards, with the dashboard
+filters applied, as CSV, JSON Lines or Parquet. Rows are read a fixed-size
+batch at a time and each batch is encoded and sent before the next is
+read, so memory stays flat however many rows match
+"""
+
+import csv
+import io
+import json
+
+from flask import Response
+
+from filters import where_clause
+from serialization import orjson
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_COLUMNS = (
+    'id', 'date', 'region', 'product_category', 'vendor', 'customer_type',
+    'sales_amount', 'profit_amount', 'quantity'
+)
+
+# Rows per query; small enough that other requests wait at most a few ms
+BATCH_SIZE = 2000
+# Rows per Parquet row group, buffered from several batches
+ROW_GROUP_SIZE = 50000
+
+# Format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+def sales_batches(connect, filters, batch_size=BATCH_SIZE, pause=None):
+    """Yield lists of matching rows in id order
+
+    Each batch is its own short query continuing after the last id sent,
+    rather than one statement left open for the whole download, so a slow
+    client never holds a read lock that would stall the writers.
+    """
+    where, parameters = where_clause(filters)
+    where = f"{where} AND id > ?" if where else "WHERE id > ?"
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM sales_data {where} ORDER BY id LIMIT ?"
+    last_id = 0
+    while True:
+        conn = connect()
+        try:
+            rows = conn.execute(sql, (*parameters, last_id, batch_size)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
+        if pause is not None:
+            # Let other requests run between batches
+            pause(0)
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode('utf-8')
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+def jsonl_chunks(batches):
+    for rows in batches:
+        if orjson is not None:
+            yield b''.join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b'\n' for row in rows)
+        else:
+            yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in rows).encode('utf-8')
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file collecting what the Parquet writer produces until it is taken"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def parquet_schema():
+    return pyarrow.schema([
+        ('id', pyarrow.int64()),
+        ('date', pyarrow.date32()),
+        ('region', pyarrow.string()),
+        ('product_category', pyarrow.string()),
+        ('vendor', pyarrow.string()),
+        ('customer_type', pyarrow.string()),
+        ('sales_amount', pyarrow.float64()),
+        ('profit_amount', pyarrow.float64()),
+        ('quantity', pyarrow.int64())
+    ])
+
+def parquet_table(rows, schema):
+    columns = [pyarrow.array(values) for values in zip(*rows)]
+    # Dates are stored as ISO text
+    columns[1] = columns[1].cast(pyarrow.date32())
+    return pyarrow.Table.from_arrays(columns, schema=schema)
+
+def parquet_chunks(batches):
+    schema = parquet_schema()
+    sink = ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+    pending = []
+    for rows in batches:
+        pending.extend(rows)
+        if len(pending) >= ROW_GROUP_SIZE:
+            writer.write_table(parquet_table(pending, schema), row_group_size=ROW_GROUP_SIZE)
+            pending = []
+            yield sink.take()
+    if pending:
+        writer.write_table(parquet_table(pending, schema), row_group_size=ROW_GROUP_SIZE)
+    writer.close()
+    yield sink.take()
+
+ENCODERS = {
+    'csv': csv_chunks,
+    'jsonl': jsonl_chunks,
+    'parquet': parquet_chunks
+}
+
+def export_response(export_format, connect, filters, pause=None):
+    """Streaming response of the filtered sales rows in one of EXPORT_FORMATS"""
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    chunks = ENCODERS[export_format](sales_batches(connect, filters, pause=pause))
+    return Response(chunks, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="sales.{extension}"',
+        'Cache-Control': 'no-store'
+    })
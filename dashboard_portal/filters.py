@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Sales Filters
+The dashboard filters (date range, region, category, vendor and customer
+type) read from query arguments and turned into a parameterised WHERE
+clause over sales_data or, given other conditions, any other table
+"""
+
+from datetime import date
+
+# Columns that can be filtered to one or more values
+DIMENSIONS = ('region', 'product_category', 'vendor', 'customer_type')
+
+# Filter -> condition over sales_data; {} takes the placeholders of a value list
+SALES_CONDITIONS = {
+    'from': 'date >= ?',
+    'to': 'date <= ?',
+    'region': 'region IN ({})',
+    'product_category': 'product_category IN ({})',
+    'vendor': 'vendor IN ({})',
+    'customer_type': 'customer_type IN ({})'
+}
+
+class FilterError(ValueError):
+    """A filter argument that cannot be applied"""
+
+def parse_date(value, name):
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise FilterError(f"{name} must be a date like 2024-01-31")
+
+def date_range(args):
+    """Inclusive (from, to) ISO dates from request args, either of which may be None, or None when neither is given"""
+    start, end = (parse_date(args[name], name) if args.get(name) else None for name in ('from', 'to'))
+    if start and end and start > end:
+        raise FilterError("from must not be after to")
+    return (start, end) if start or end else None
+
+def point_limit(args):
+    """Read ?max_points=, the most points a chart series should have, or None when not given"""
+    value = args.get('max_points')
+    if not value:
+        return None
+    try:
+        points = int(value)
+    except ValueError:
+        points = 0
+    if points < 3:
+        raise FilterError("max_points must be a whole number of at least 3")
+    return points
+
+def payload_layout(args):
+    """Read ?layout=: 'records', one object per row (the default), or 'columns', each list as column names and rows"""
+    layout = args.get('layout') or 'records'
+    if layout not in ('records', 'columns'):
+        raise FilterError("layout must be records or columns")
+    return layout
+
+def sales_filters(args):
+    """Read from/to and the dimension filters from request args
+
+    Dates are inclusive. A dimension takes repeated arguments or
+    comma-separated values, e.g. ?region=Gauteng,Free State.
+    """
+    filters = {}
+    start, end = date_range(args) or (None, None)
+    if start:
+        filters['from'] = start
+    if end:
+        filters['to'] = end
+
+    filters.update(text_filters(args, DIMENSIONS))
+    return filters
+
+def text_filters(args, names):
+    """Read filters taking one or more values, e.g. ?warehouse=Durban DC,Cape Town DC, into {name: [values]}"""
+    filters = {}
+    for name in names:
+        values = [value.strip() for raw in args.getlist(name) for value in raw.split(',') if value.strip()]
+        if values:
+            filters[name] = values
+    return filters
+
+def key_filters(args, names):
+    """Read integer key filters, e.g. ?product=1131,1132, the same way as the dimensions"""
+    filters = {}
+    for name in names:
+        values = [value.strip() for raw in args.getlist(name) for value in raw.split(',') if value.strip()]
+        if values:
+            try:
+                filters[name] = [int(value) for value in values]
+            except ValueError:
+                raise FilterError(f"{name} must be whole numbers")
+    return filters
+
+def where_clause(filters, conditions=SALES_CONDITIONS):
+    """SQL WHERE clause (empty when unfiltered) and its parameters
+
+    conditions maps each filter to its SQL, so the same filters can be
+    applied to tables other than sales_data.
+    """
+    clauses = []
+    parameters = []
+    for name, condition in conditions.items():
+        if name not in filters:
+            continue
+        value = filters[name]
+        if isinstance(value, list):
+            clauses.append(condition.format(', '.join('?' * len(value))))
+            parameters.extend(value)
+        else:
+            clauses.append(condition)
+            parameters.append(value)
+    if not clauses:
+        return '', []
+    return 'WHERE ' + ' AND '.join(clauses), parameters
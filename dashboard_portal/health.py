@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Health and Readiness
+/healthz answers as soon as the portal serves requests; /readyz only once
+the startup steps (database, warm view snapshots, chat rollups, background
+workers) are done. Launchers poll it instead of sleeping for a fixed time.
+A launcher may also set PORTAL_READY_FILE: the portal writes its status and
+URL there when ready, which works even when the launcher cannot know the port.
+Standard library only, so launchers can import it before dependencies exist.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+READY_FILE_ENV = 'PORTAL_READY_FILE'
+
+class Readiness:
+    """Startup steps of one portal process; ready once every step has completed"""
+
+    def __init__(self, steps):
+        self.started = time.time()
+        self.steps = {step: 'pending' for step in steps}
+        self.errors = {}
+        self.ready_at = None
+        # Where this process serves, written to the ready file; see serving()
+        self.url = None
+        self.lock = threading.Lock()
+
+    def done(self, step):
+        with self.lock:
+            self.steps[step] = 'done'
+            if self.ready_at is not None or any(state != 'done' for state in self.steps.values()):
+                return
+            self.ready_at = time.time()
+        self.announce()
+
+    def serving(self, url):
+        """Record the URL the app is about to serve on, announcing it if the steps already finished"""
+        self.url = url
+        if self.ready:
+            self.announce()
+
+    def announce(self):
+        """Write the ready status to the launcher's ready file, if it asked for one and the URL is known"""
+        path = os.getenv(READY_FILE_ENV)
+        if not path or self.url is None:
+            return
+        status = dict(self.status(), url=self.url, pid=os.getpid())
+        # Rename into place so the launcher never reads half a file
+        partial = f'{path}.{os.getpid()}.partial'
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(partial, path)
+
+    def failed(self, step, error):
+        with self.lock:
+            self.steps[step] = 'failed'
+            self.errors[step] = str(error)
+
+    def run(self, step, work):
+        """Run one startup step and record its outcome"""
+        try:
+            work()
+        except Exception as e:
+            print(f"❌ Startup step {step} failed: {e}")
+            self.failed(step, e)
+        else:
+            self.done(step)
+
+    def warm(self, steps):
+        """Run (step, callable) pairs in order"""
+        for step, work in steps:
+            self.run(step, work)
+
+    def start(self, steps):
+        """Warm up in a daemon thread while the server already answers /healthz
+
+        A plain thread rather than a SocketIO background task: under the debug
+        reloader the server runs on another thread with its own event hub, and
+        a green thread spawned at import would never be scheduled.
+        """
+        thread = threading.Thread(target=self.warm, args=(steps,), daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+    def status(self):
+        with self.lock:
+            if self.ready_at is not None:
+                state = 'ready'
+            elif self.errors:
+                state = 'failed'
+            else:
+                state = 'starting'
+            status = {'status': state, 'steps': dict(self.steps)}
+            if self.errors:
+                status['errors'] = dict(self.errors)
+            if self.ready_at is not None:
+                status['startup_ms'] = round((self.ready_at - self.started) * 1000)
+            return status
+
+    def init_app(self, app, worker=0):
+        """Register the unauthenticated /healthz and /readyz probes"""
+        def healthz():
+            return {'status': 'ok', 'worker': worker, 'uptime_s': round(time.time() - self.started, 1)}
+
+        def readyz():
+            status = self.status()
+            status['worker'] = worker
+            return status, 200 if status['status'] == 'ready' else 503
+
+        app.add_url_rule('/healthz', 'healthz', healthz)
+        app.add_url_rule('/readyz', 'readyz', readyz)
+
+def probe(base_url, timeout=2):
+    """Fetch /readyz and return its status dict, or None while nothing answers"""
+    try:
+        with urllib.request.urlopen(f"{base_url}/readyz", timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        # 503 while starting still carries the step report
+        try:
+            return json.loads(e.read().decode('utf-8'))
+        except ValueError:
+            return None
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+def read_ready_file(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def wait_until_ready(base_url=None, process=None, timeout=120, ready_file=None, initial_delay=0.1, max_delay=1.0):
+    """Wait with a growing delay until the portal reports ready through ready_file or /readyz at base_url
+
+    The ready file supplies the URL when the launcher cannot know the port;
+    /readyz there still has the last word, since a debug reloader's parent
+    process announces too, before the serving child is ready. Returns
+    (True, status) once ready, or (False, reason) when a startup step failed,
+    the process exited or the timeout passed.
+    """
+    deadline = time.time() + timeout
+    delay = initial_delay
+    status = None
+    while time.time() < deadline:
+        url = base_url
+        if ready_file is not None:
+            announced = read_ready_file(ready_file)
+            if announced is not None:
+                url = announced.get('url') or base_url
+        if process is not None and process.poll() is not None:
+            return False, f"the server exited with code {process.returncode}"
+        status = probe(url) if url else None
+        if status is not None:
+            if status.get('status') == 'ready':
+                return True, dict(status, url=url)
+            if status.get('status') == 'failed':
+                return False, f"startup failed: {status.get('errors')}"
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
+    return False, f"not ready after {timeout}s (last status: {status})"
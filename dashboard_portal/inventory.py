@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Inventory
+Stock by warehouse and category, stock lines below their reorder point or
+over their maximum, and stock value, from the warehouse's fact_inventory
+joined with dim_product. The totals and the reorder and overstock sets are
+kept in memory and adjusted for the lines that changed when the tables
+reload, so a request never scans the inventory
+"""
+
+import threading
+
+# One stock line with its product's name and category
+INVENTORY_SQL = '''
+    SELECT i.InventoryKey, i.ProductKey,
+           COALESCE(p.ProductName, 'Product ' || i.ProductKey), COALESCE(p.Category, 'Unknown'),
+           i.Warehouse, COALESCE(i.StockOnHand, 0), COALESCE(i.ReorderPoint, 0), COALESCE(i.MaxStock, 0),
+           COALESCE(i.StockValue, 0), COALESCE(i.DaysOnHand, 0)
+    FROM fact_inventory i
+    LEFT JOIN dim_product p ON p.ProductKey = i.ProductKey
+'''
+KEY, PRODUCT_KEY, PRODUCT, CATEGORY, WAREHOUSE, STOCK, REORDER_POINT, MAX_STOCK, VALUE, DAYS_ON_HAND = range(10)
+
+# Totals kept per (warehouse, category) cell
+LINES, CELL_STOCK, CELL_REORDER, CELL_MAX, CELL_VALUE, STOCK_DAYS = range(6)
+
+# Most reorder and overstock lines listed, largest gap first; the counts cover all of them
+LIST_LIMIT = 50
+
+class InventoryTracker:
+    """Inventory totals and exception sets, updated line by line from the warehouse tables"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.lines = {}
+        self.cells = {}
+        self.below_reorder = {}
+        self.overstock = {}
+        self.counts = {'refreshes': 0, 'lines_changed': 0}
+
+    def refresh(self, conn, version):
+        """Re-read the lines when the tables' version moved on and apply only those added, changed or removed"""
+        with self.lock:
+            if version == self.version:
+                return 0
+            seen = set()
+            changed = 0
+            for line in conn.execute(INVENTORY_SQL):
+                seen.add(line[KEY])
+                held = self.lines.get(line[KEY])
+                if held == line:
+                    continue
+                if held is not None:
+                    self.remove(held)
+                self.add(line)
+                changed += 1
+            for key in set(self.lines) - seen:
+                self.remove(self.lines[key])
+                changed += 1
+            self.version = version
+            self.counts['refreshes'] += 1
+            self.counts['lines_changed'] += changed
+            return changed
+
+    def add(self, line):
+        self.lines[line[KEY]] = line
+        self.adjust(line, 1)
+        if line[STOCK] < line[REORDER_POINT]:
+            self.below_reorder[line[KEY]] = line
+        if line[MAX_STOCK] and line[STOCK] > line[MAX_STOCK]:
+            self.overstock[line[KEY]] = line
+
+    def remove(self, line):
+        del self.lines[line[KEY]]
+        self.adjust(line, -1)
+        self.below_reorder.pop(line[KEY], None)
+        self.overstock.pop(line[KEY], None)
+
+    def adjust(self, line, sign):
+        cell_key = (line[WAREHOUSE], line[CATEGORY])
+        cell = self.cells.setdefault(cell_key, [0, 0, 0, 0, 0.0, 0])
+        for position, amount in ((LINES, 1), (CELL_STOCK, line[STOCK]), (CELL_REORDER, line[REORDER_POINT]),
+                                 (CELL_MAX, line[MAX_STOCK]), (CELL_VALUE, line[VALUE]),
+                                 (STOCK_DAYS, line[STOCK] * line[DAYS_ON_HAND])):
+            cell[position] += sign * amount
+        if not cell[LINES]:
+            del self.cells[cell_key]
+
+    def view(self, filters=None):
+        """The operations view, optionally for some warehouses and categories only"""
+        filters = filters or {}
+        warehouses, categories = filters.get('warehouse'), filters.get('category')
+
+        def wanted(warehouse, category):
+            return (not warehouses or warehouse in warehouses) and (not categories or category in categories)
+
+        with self.lock:
+            by_warehouse, by_category = {}, {}
+            for (warehouse, category), cell in self.cells.items():
+                if wanted(warehouse, category):
+                    for group, name in ((by_warehouse, warehouse), (by_category, category)):
+                        total = group.setdefault(name, [0, 0, 0, 0, 0.0, 0])
+                        for position, amount in enumerate(cell):
+                            total[position] += amount
+            below = [line for line in self.below_reorder.values() if wanted(line[WAREHOUSE], line[CATEGORY])]
+            over = [line for line in self.overstock.values() if wanted(line[WAREHOUSE], line[CATEGORY])]
+
+        # Ties by key, so the order does not depend on which lines changed in which refresh
+        below.sort(key=lambda line: (line[STOCK] - line[REORDER_POINT], line[KEY]))
+        over.sort(key=lambda line: (line[MAX_STOCK] - line[STOCK], line[KEY]))
+        return {
+            'lines': sum(total[LINES] for total in by_warehouse.values()),
+            'total_stock': sum(total[CELL_STOCK] for total in by_warehouse.values()),
+            'total_value': round(sum(total[CELL_VALUE] for total in by_warehouse.values()), 2),
+            'below_reorder_count': len(below),
+            'overstock_count': len(over),
+            'stock_by_warehouse': [{
+                'warehouse': warehouse,
+                'lines': total[LINES],
+                'stock': total[CELL_STOCK],
+                'max_stock': total[CELL_MAX],
+                'utilization': round(total[CELL_STOCK] / total[CELL_MAX] * 100, 1) if total[CELL_MAX] else 0.0,
+                'value': round(total[CELL_VALUE], 2)
+            } for warehouse, total in sorted(by_warehouse.items())],
+            'stock_by_category': [{
+                'category': category,
+                'lines': total[LINES],
+                'stock': total[CELL_STOCK],
+                'reorder': total[CELL_REORDER],
+                'value': round(total[CELL_VALUE], 2),
+                'days_on_hand': round(total[STOCK_DAYS] / total[CELL_STOCK], 1) if total[CELL_STOCK] else 0.0
+            } for category, total in sorted(by_category.items())],
+            'below_reorder': [{
+                'product': line[PRODUCT],
+                'category': line[CATEGORY],
+                'warehouse': line[WAREHOUSE],
+                'stock': line[STOCK],
+                'reorder_point': line[REORDER_POINT],
+                'shortfall': line[REORDER_POINT] - line[STOCK],
+                'value': round(line[VALUE], 2)
+            } for line in below[:LIST_LIMIT]],
+            'overstock': [{
+                'product': line[PRODUCT],
+                'category': line[CATEGORY],
+                'warehouse': line[WAREHOUSE],
+                'stock': line[STOCK],
+                'max_stock': line[MAX_STOCK],
+                'excess': line[STOCK] - line[MAX_STOCK],
+                'value': round(line[VALUE], 2)
+            } for line in over[:LIST_LIMIT]]
+        }
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, lines=len(self.lines), below_reorder=len(self.below_reorder),
+                        overstock=len(self.overstock))
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Metrics
+Per-route latency histograms, SQL and JSON timings, cache and SocketIO
+counters for the portal, exposed in Prometheus text format on /metrics
+and optionally per response in a Server-Timing header
+"""
+
+import re
+import sqlite3
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+from query_log import query_log
+from serialization import FastJSONProvider
+
+# Histogram upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def query_label(sql):
+    """Collapse a SQL statement to one short line usable as a metric label"""
+    label = ' '.join(sql.split())
+    return label if len(label) <= 80 else f'{label[:77]}...'
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, label_values, value):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, constant_labels):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, (counts, total, count) in sorted(self.series.items()):
+            labels = constant_labels + list(zip(self.label_names, label_values))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{format_labels(labels + [("le", format_value(bound))])} {bucket_count}')
+            lines.append(f'{self.name}_bucket{format_labels(labels + [("le", "+Inf")])} {count}')
+            lines.append(f'{self.name}_sum{format_labels(labels)} {format_value(total)}')
+            lines.append(f'{self.name}_count{format_labels(labels)} {count}')
+        return lines
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+
+    def inc(self, label_values, amount=1):
+        self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def render(self, constant_labels):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self.series.items()):
+            labels = constant_labels + list(zip(self.label_names, label_values))
+            lines.append(f'{self.name}{format_labels(labels)} {format_value(value)}')
+        return lines
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports statement execute time, fetch time and rows returned, and feeds the slow query log
+
+    SQLite does most of a SELECT's work while its rows are fetched, so a
+    statement goes to the query log with its execute and fetch time added
+    up, once its rows run out, the next statement runs or the cursor is
+    closed or dropped.
+    """
+
+    query = ''
+    # [sql, parameters, seconds so far, rows iterated, seconds iterating] of the open statement
+    statement = None
+
+    def execute(self, sql, parameters=()):
+        self.finish()
+        self.query = query_label(sql)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.record_sql(self.query, elapsed)
+            self.statement = [sql, parameters, elapsed, 0, 0.0]
+            if self.description is None:
+                # Nothing to fetch, e.g. an INSERT
+                self.finish()
+
+    def executemany(self, sql, seq_of_parameters):
+        self.finish()
+        self.query = query_label(sql)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.record_sql(self.query, time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self.fetched(time.perf_counter() - start, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self.fetched(time.perf_counter() - start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self.fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        # Rows read by iterating are totalled here and recorded once, when they run out
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self.finish()
+            raise
+        if self.statement is not None:
+            elapsed = time.perf_counter() - start
+            self.statement[2] += elapsed
+            self.statement[3] += 1
+            self.statement[4] += elapsed
+        return row
+
+    def fetched(self, elapsed, rows, exhausted):
+        metrics.record_fetch(self.query, elapsed, rows)
+        if self.statement is not None:
+            self.statement[2] += elapsed
+            if exhausted:
+                self.finish()
+
+    def finish(self):
+        """Hand the open statement to the slow query log with its execute and fetch time"""
+        statement, self.statement = self.statement, None
+        if statement is None:
+            return
+        sql, parameters, elapsed, rows, iterating = statement
+        if rows:
+            metrics.record_fetch(self.query, iterating, rows)
+        query_log.record(self.connection, sql, parameters, elapsed)
+
+    def close(self):
+        self.finish()
+        super().close()
+
+    def __del__(self):
+        if self.statement is not None:
+            self.finish()
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including those behind conn.execute and pandas) are instrumented"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # sqlite3's own shortcuts make a plain cursor rather than calling cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def connect_database(database, **kwargs):
+    """sqlite3.connect with SQL timing and row counts recorded in the portal metrics"""
+    return sqlite3.connect(database, factory=InstrumentedConnection, **kwargs)
+
+class TimedJSONProvider(FastJSONProvider):
+    """Flask JSON provider that records how long jsonify spends serializing"""
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            metrics.record_json(time.perf_counter() - start)
+
+class PortalMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.constant_labels = []
+        self.server_timing = False
+        self.request_duration = Histogram(
+            'portal_request_duration_seconds', 'Request latency by route', ('route', 'method', 'status'))
+        self.sql_duration = Histogram(
+            'portal_sql_execute_seconds', 'SQLite statement execute time by query', ('query',))
+        self.sql_fetch = Counter(
+            'portal_sql_fetch_seconds_total', 'SQLite time spent fetching result rows by query', ('query',))
+        self.sql_rows = Counter(
+            'portal_sql_rows_total', 'Rows returned by query', ('query',))
+        self.json_duration = Histogram(
+            'portal_json_serialize_seconds', 'jsonify serialization time by route', ('route',))
+        self.sources = []
+
+    def init_app(self, app, server_timing=False, worker=None):
+        """Time every request, swap in the timed JSON provider and serve /metrics"""
+        self.server_timing = server_timing
+        if worker is not None:
+            self.constant_labels = [('worker', str(worker))]
+        app.json = TimedJSONProvider(app)
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def add_stats(self, name, collect, counters=(), labels=None):
+        """Export a stats() dict as portal_<name>_<key> series; counters get a _total suffix and
+        dict values become one series per key under the label named in labels[key]"""
+        self.sources.append((name, collect, set(counters), labels or {}))
+
+    def request_route(self):
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    def start_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_sql = 0.0
+        g.metrics_queries = 0
+        g.metrics_json = 0.0
+
+    def finish_request(self, response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.request_duration.observe((self.request_route(), request.method, str(response.status_code)), elapsed)
+
+        if self.server_timing:
+            sql, json_time = g.metrics_sql, g.metrics_json
+            response.headers['Server-Timing'] = ', '.join((
+                f'sql;dur={sql * 1000:.2f};desc="{g.metrics_queries} queries"',
+                f'json;dur={json_time * 1000:.2f}',
+                f'app;dur={max(elapsed - sql - json_time, 0) * 1000:.2f}',
+                f'total;dur={elapsed * 1000:.2f}'
+            ))
+        return response
+
+    def record_sql(self, query, elapsed):
+        with self.lock:
+            self.sql_duration.observe((query,), elapsed)
+        if has_request_context() and 'metrics_start' in g:
+            g.metrics_sql += elapsed
+            g.metrics_queries += 1
+
+    def record_fetch(self, query, elapsed, rows):
+        with self.lock:
+            self.sql_fetch.inc((query,), elapsed)
+            self.sql_rows.inc((query,), rows)
+        if has_request_context() and 'metrics_start' in g:
+            g.metrics_sql += elapsed
+
+    def record_json(self, elapsed):
+        route = self.request_route() if has_request_context() else 'none'
+        with self.lock:
+            self.json_duration.observe((route,), elapsed)
+        if has_request_context() and 'metrics_start' in g:
+            g.metrics_json += elapsed
+
+    def render_sources(self):
+        lines = []
+        for name, collect, counters, labels in self.sources:
+            for key, value in sorted(collect().items()):
+                metric = re.sub(r'[^a-zA-Z0-9_]', '_', f'portal_{name}_{key}')
+                kind = 'counter' if key in counters else 'gauge'
+                if kind == 'counter':
+                    metric += '_total'
+                lines.append(f'# TYPE {metric} {kind}')
+                if isinstance(value, dict):
+                    for item, item_value in sorted(value.items()):
+                        series_labels = self.constant_labels + [(labels.get(key, 'key'), item)]
+                        lines.append(f'{metric}{format_labels(series_labels)} {format_value(item_value)}')
+                else:
+                    lines.append(f'{metric}{format_labels(self.constant_labels)} {format_value(value)}')
+        return lines
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        with self.lock:
+            lines = []
+            for metric in (self.request_duration, self.sql_duration, self.sql_fetch, self.sql_rows, self.json_duration):
+                lines.extend(metric.render(self.constant_labels))
+        lines.extend(self.render_sources())
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+metrics = PortalMetrics()
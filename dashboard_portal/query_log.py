@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Slow Query Log
+Logs statements slower than a threshold with their EXPLAIN QUERY PLAN,
+bound parameters and call site, and in sampled profiling mode aggregates
+queries into a top-N report to spot GROUP BY queries that regress as
+sales_data grows
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+PORTAL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Frames in these files are the access layer itself, never the call site
+ACCESS_LAYER_FILES = {os.path.join(PORTAL_DIR, 'metrics.py'), os.path.abspath(__file__)}
+
+def collapse(sql):
+    """One-line form of a statement, used as its aggregation key"""
+    return ' '.join(sql.split())
+
+def call_site():
+    """file:line (function) of the nearest portal frame outside the access layer"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(PORTAL_DIR) and filename not in ACCESS_LAYER_FILES:
+            return f'{os.path.basename(filename)}:{frame.f_lineno} ({frame.f_code.co_name})'
+        frame = frame.f_back
+    return 'unknown'
+
+def format_parameters(parameters):
+    """Bound parameters as JSON-safe strings, positional or named"""
+    if isinstance(parameters, dict):
+        return {name: str(value) for name, value in parameters.items()}
+    return [str(value) for value in parameters or ()]
+
+def explain(connection, sql, parameters):
+    """EXPLAIN QUERY PLAN as indented lines, or the error when the statement cannot be explained"""
+    try:
+        # A plain cursor, so explaining does not recurse into the instrumented one
+        rows = sqlite3.Cursor(connection).execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+    except sqlite3.Error as e:
+        return [f'(no plan: {e})']
+
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node] + detail)
+    return lines
+
+class QueryLog:
+    """Slow statements and sampled per-query aggregates for one process"""
+
+    def __init__(self, threshold_ms=100, sample_rate=0.0, keep=100):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.slow = deque(maxlen=keep)
+        self.profile = {}
+        self.lock = threading.Lock()
+
+    def configure(self, threshold_ms=None, sample_rate=None):
+        if threshold_ms is not None:
+            self.threshold_ms = threshold_ms
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+
+    def record(self, connection, sql, parameters, elapsed):
+        """Called by the instrumented cursor once a statement is executed and its rows are fetched"""
+        elapsed_ms = elapsed * 1000
+        is_slow = self.threshold_ms is not None and elapsed_ms >= self.threshold_ms
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (is_slow or sampled):
+            return
+
+        query = collapse(sql)
+        site = call_site()
+        if is_slow:
+            plan = explain(connection, sql, parameters)
+            entry = {
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_ms': round(elapsed_ms, 2),
+                'query': query,
+                'parameters': format_parameters(parameters),
+                'call_site': site,
+                'plan': plan
+            }
+            with self.lock:
+                self.slow.append(entry)
+            bound = f" with {entry['parameters']}" if entry['parameters'] else ''
+            print(f"🐢 Slow query {elapsed_ms:.1f}ms at {site}: {query}{bound}")
+            for line in plan:
+                print(f"     {line}")
+
+        if sampled:
+            with self.lock:
+                stats = self.profile.get(query)
+                if stats is None:
+                    stats = self.profile[query] = {
+                        'query': query, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'call_sites': set(), 'plan': None
+                    }
+                stats['count'] += 1
+                stats['total_ms'] += elapsed_ms
+                stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+                stats['call_sites'].add(site)
+                needs_plan = stats['plan'] is None
+            if needs_plan:
+                stats['plan'] = explain(connection, sql, parameters)
+
+    def top(self, n=10, order='total_ms'):
+        """The n most expensive sampled queries, by total_ms, max_ms, mean_ms or count"""
+        with self.lock:
+            report = [
+                dict(stats, mean_ms=stats['total_ms'] / stats['count'], call_sites=sorted(stats['call_sites']))
+                for stats in self.profile.values()
+            ]
+        report.sort(key=lambda stats: stats[order], reverse=True)
+        for stats in report[:n]:
+            for key in ('total_ms', 'max_ms', 'mean_ms'):
+                stats[key] = round(stats[key], 2)
+        return report[:n]
+
+    def recent(self, n=20):
+        """The latest slow statements, newest first"""
+        with self.lock:
+            return list(self.slow)[::-1][:n]
+
+    def reset(self):
+        with self.lock:
+            self.slow.clear()
+            self.profile = {}
+
+query_log = QueryLog()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Sales Cube
+Running totals of sales, profit, quantity and transactions per day and
+product category, region, customer type and vendor, kept in a NumPy array.
+Any date range is answered with two lookups and a subtraction instead of a
+scan of sales_data, and new rows are folded in as they arrive
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+
+import numpy as np
+
+DIMENSIONS = ('product_category', 'region', 'customer_type', 'vendor')
+MEASURES = ('sales', 'profit', 'quantity', 'transactions')
+SALES, PROFIT, QUANTITY, TRANSACTIONS = range(len(MEASURES))
+
+# Rows added after last_id, grouped to one line per day and cell
+NEW_ROWS_SQL = f'''
+    SELECT DATE(date), {', '.join(DIMENSIONS)},
+           SUM(sales_amount), SUM(profit_amount), SUM(quantity), COUNT(*), MAX(id)
+    FROM sales_data
+    WHERE id > ?
+    GROUP BY 1, {', '.join(str(position) for position in range(2, len(DIMENSIONS) + 2))}
+'''
+
+class CubeState:
+    """One immutable version of the cube
+
+    cumulative[i] holds the totals of every day before day i, so a range of
+    days [i, j) sums to cumulative[j] - cumulative[i]. Axes: day, then one
+    per dimension, then the measures.
+    """
+
+    def __init__(self, first_day, members, cumulative, last_id):
+        self.first_day = first_day
+        self.members = members
+        self.cumulative = cumulative
+        self.last_id = last_id
+
+    @classmethod
+    def empty(cls):
+        shape = (1, *(0 for _ in DIMENSIONS), len(MEASURES))
+        return cls(date.today().toordinal(), {name: [] for name in DIMENSIONS}, np.zeros(shape), 0)
+
+    @property
+    def days(self):
+        return self.cumulative.shape[0] - 1
+
+    def day(self, index):
+        return date.fromordinal(self.first_day + index).isoformat()
+
+    def span(self, start=None, end=None):
+        """Day indexes [i, j) of an inclusive range of ISO dates, clipped to the days held"""
+        i = 0 if start is None else date.fromisoformat(start).toordinal() - self.first_day
+        j = self.days if end is None else date.fromisoformat(end).toordinal() - self.first_day + 1
+        i = min(max(i, 0), self.days)
+        return i, min(max(j, i), self.days)
+
+    def collapse(self, block, by):
+        """Sum a block over every dimension except by (or all of them)"""
+        offset = block.ndim - len(DIMENSIONS) - 1
+        axes = tuple(offset + axis for axis, name in enumerate(DIMENSIONS) if name != by)
+        return block.sum(axis=axes)
+
+    def totals(self, start=None, end=None, by=None):
+        """Range totals: (measures,) or, by a dimension, (members, measures)"""
+        i, j = self.span(start, end)
+        return self.collapse(self.cumulative[j] - self.cumulative[i], by)
+
+    def select(self, start=None, end=None, where=None, by=None):
+        """Range totals like totals(), counting only the members listed per dimension in where"""
+        i, j = self.span(start, end)
+        block = self.cumulative[j] - self.cumulative[i]
+        for axis, name in enumerate(DIMENSIONS):
+            values = (where or {}).get(name)
+            if values:
+                shape = [1] * block.ndim
+                shape[axis] = -1
+                block = block * np.isin(self.members[name], list(values)).reshape(shape)
+        return self.collapse(block, by)
+
+    def daily(self, start=None, end=None, by=None):
+        """Per-day totals over a range: day labels and (days, measures) or (days, members, measures)"""
+        i, j = self.span(start, end)
+        block = np.diff(self.cumulative[i:j + 1], axis=0)
+        return [self.day(index) for index in range(i, j)], self.collapse(block, by)
+
+    def monthly(self, start=None, end=None, by=None):
+        """Per-month totals over a range, the first and last month cut at its ends"""
+        i, j = self.span(start, end)
+        labels, bounds = [], []
+        for index in range(i, j):
+            month = self.day(index)[:7]
+            if not labels or labels[-1] != month:
+                labels.append(month)
+                bounds.append(index)
+        bounds.append(j)
+        return labels, self.collapse(np.diff(self.cumulative[bounds], axis=0), by)
+
+    def add(self, rows):
+        """New state with grouped rows (day, *dimensions, *measures, max id) added"""
+        if not rows:
+            return self
+        ordinals = [date.fromisoformat(row[0]).toordinal() for row in rows]
+        cumulative = self.cumulative
+
+        # Room for days before the first, after the last and for new members:
+        # nothing was sold before, the totals carry on after
+        held_first = self.first_day if self.days else min(ordinals)
+        held_last = held_first + self.days - 1
+        first_day = min(held_first, *ordinals)
+        before, after = held_first - first_day, max(held_last, *ordinals) - held_last
+        members = {}
+        padding = [(before, 0)] + [(0, 0)] * (cumulative.ndim - 1)
+        for axis, name in enumerate(DIMENSIONS, start=1):
+            known = self.members[name]
+            added = sorted({row[axis] for row in rows} - set(known))
+            members[name] = known + added
+            padding[axis] = (0, len(added))
+        cumulative = np.pad(cumulative, padding)
+        if after:
+            cumulative = np.concatenate([cumulative, np.repeat(cumulative[-1:], after, axis=0)])
+
+        # Per-day deltas from the earliest day touched, accumulated on top
+        index = {name: {value: position for position, value in enumerate(members[name])} for name in DIMENSIONS}
+        days = np.array(ordinals) - first_day
+        since = int(days.min())
+        positions = [days - since] + [
+            np.array([index[name][row[axis]] for row in rows]) for axis, name in enumerate(DIMENSIONS, start=1)
+        ]
+        values = np.array([row[len(DIMENSIONS) + 1:-1] for row in rows], dtype=float)
+        delta = np.zeros((cumulative.shape[0] - 1 - since, *cumulative.shape[1:]))
+        np.add.at(delta, tuple(positions), values)
+
+        cumulative = cumulative.copy() if cumulative is self.cumulative else cumulative
+        cumulative[since + 1:] += np.cumsum(delta, axis=0)
+        return CubeState(first_day, members, cumulative, max(self.last_id, max(row[-1] for row in rows)))
+
+class SalesCube:
+    """Keeps a CubeState in step with sales_data by reading only the rows added since the last refresh"""
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+        self.lock = threading.Lock()
+        self.state = CubeState.empty()
+
+    def refresh(self, conn=None):
+        """Fold in new rows and return the current state, which never changes afterwards
+
+        The rows are read through conn when given, e.g. inside a caller's
+        read transaction, otherwise through a connection of its own.
+        """
+        with self.lock:
+            if conn is not None:
+                rows = conn.execute(NEW_ROWS_SQL, (self.state.last_id,)).fetchall()
+            else:
+                with closing(sqlite3.connect(self.database_path)) as own:
+                    rows = own.execute(NEW_ROWS_SQL, (self.state.last_id,)).fetchall()
+            self.state = self.state.add(rows)
+            return self.state
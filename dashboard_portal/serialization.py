@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Row Serialization
+Turns cursor rows straight into JSON-ready records without DataFrames, lays
+views out as columns on request, and provides a Flask JSON provider that
+encodes with orjson when it is installed
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def fetch_records(conn, sql, parameters=()):
+    """Run a query and return its rows as dicts keyed by the selected column names"""
+    cursor = conn.execute(sql, parameters)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def fetch_columns(conn, sql, parameters=()):
+    """Run a query and return its column names and its rows, for the compact columnar JSON format"""
+    cursor = conn.execute(sql, parameters)
+    return [column[0] for column in cursor.description], cursor.fetchall()
+
+def fetch_value(conn, sql, parameters=(), default=0):
+    """Run a single-value query, falling back to default for NULL or no row"""
+    row = conn.execute(sql, parameters).fetchone()
+    return row[0] if row is not None and row[0] is not None else default
+
+def columnar(view):
+    """A view with each list of records as {"columns": [...], "data": [[...]]}, so no key is repeated per row"""
+    laid_out = {}
+    for key, value in view.items():
+        if isinstance(value, list) and all(isinstance(record, dict) for record in value):
+            columns = list(value[0]) if value else []
+            value = {'columns': columns, 'data': [[record.get(column) for column in columns] for record in value]}
+        laid_out[key] = value
+    return laid_out
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson, which also takes NumPy arrays as they are
+
+    Values orjson does not know (and datetimes, to keep Flask's format) go
+    through Flask's usual default hook; without orjson this is Flask's
+    standard provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {'default', 'sort_keys', 'indent', 'separators', 'ensure_ascii'}:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard Portal - Production Launcher
+Runs several portal worker processes on one port behind a shared SocketIO
+message queue and a shared memory view cache
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import secrets
+import signal
+import socket
+import sys
+
+from broker import MessageBroker
+from shared_cache import SharedMemoryCache
+
+def run_worker(index, args, message_queue, secret_key, cache, ready):
+    """Serve the portal from one worker process"""
+    os.environ['PORTAL_WORKERS'] = str(args.workers)
+    os.environ['PORTAL_WORKER_INDEX'] = str(index)
+    os.environ['PORTAL_MESSAGE_QUEUE'] = message_queue
+    os.environ['PORTAL_SECRET_KEY'] = secret_key
+
+    import eventlet
+    eventlet.monkey_patch()
+    import eventlet.wsgi
+
+    from cluster import cluster
+    cluster.cache = cache
+
+    portal = importlib.import_module(args.app)
+    ready.set()
+
+    # Every worker listens on the same port; the kernel spreads connections
+    listener = eventlet.listen((args.host, args.port), reuse_port=True)
+    eventlet.wsgi.server(listener, portal.app, log_output=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the dashboard portal with several worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=5000, help="Port shared by all workers")
+    parser.add_argument("--app", default="app", choices=["app", "app_simple"], help="Portal module to serve")
+    parser.add_argument("--message-queue", help="External Redis URL; a local broker is started when omitted")
+    parser.add_argument("--broker-port", type=int, default=6390, help="Port for the local broker")
+    parser.add_argument("--cache-slots", type=int, default=64, help="Shared cache slots")
+    parser.add_argument("--cache-slot-kb", type=int, default=512, help="Shared cache slot size in KB")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "SO_REUSEPORT"):
+        print("❌ This platform cannot share one port between workers; run app.py instead")
+        return 1
+
+    broker = None
+    if args.message_queue:
+        message_queue = args.message_queue
+    else:
+        broker = MessageBroker(port=args.broker_port)
+        broker.start()
+        message_queue = broker.url
+
+    context = multiprocessing.get_context("spawn")
+    secret_key = os.getenv("PORTAL_SECRET_KEY") or secrets.token_hex(16)
+    cache = SharedMemoryCache(context.RLock(), slots=args.cache_slots, slot_size=args.cache_slot_kb * 1024)
+
+    print("🚀 Starting Bevco Executive Dashboard Portal (production mode)...")
+    print(f"⚙️  Workers: {args.workers}")
+    print(f"📨 Message queue: {message_queue}{' (local broker)' if broker else ''}")
+
+    # Stopping the launcher (service managers, benchmarks) must also stop the workers it started
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    processes = []
+    try:
+        for index in range(args.workers):
+            ready = context.Event()
+            process = context.Process(
+                target=run_worker,
+                args=(index, args, message_queue, secret_key, cache, ready),
+                name=f"portal-worker-{index}"
+            )
+            process.start()
+            processes.append(process)
+
+            # The first worker creates and seeds the database; the rest wait so they never race it
+            if index == 0 and not ready.wait(timeout=120):
+                print("❌ The first worker did not start within 120 seconds")
+                return 1
+
+        print(f"📊 Dashboard URL: http://localhost:{args.port}")
+        print("👤 Default Login: admin / admin123")
+
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers...")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        cache.close()
+        if broker:
+            broker.shutdown()
+            broker.server_close()
+
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
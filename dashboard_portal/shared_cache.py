@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Shared Memory Cache
+Fixed-size, direct-mapped JSON cache in a shared memory segment so every
+portal worker reads the views another worker already computed
+"""
+
+import json
+import struct
+from hashlib import blake2b
+from multiprocessing import shared_memory
+
+# Slot header: key hash and payload length
+HEADER = struct.Struct('<QI')
+
+def key_hash(key):
+    """Hash a cache key to a non-zero 64-bit integer"""
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+class SharedMemoryCache:
+    """JSON values in fixed-size slots of a shared memory segment, guarded by a cross-process lock
+
+    A key maps to exactly one slot, so a colliding key evicts the previous
+    value; callers must treat a miss as "recompute".
+    """
+
+    def __init__(self, lock, slots=64, slot_size=512 * 1024, name=None):
+        self.lock = lock
+        self.slots = slots
+        self.slot_size = slot_size
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=slots * slot_size)
+        self.owner = name is None
+
+    def __getstate__(self):
+        return {'lock': self.lock, 'slots': self.slots, 'slot_size': self.slot_size, 'name': self.shm.name}
+
+    def __setstate__(self, state):
+        # Workers started with the spawn method attach to the parent's segment
+        # and share its resource tracker, so only the parent ever unlinks it
+        self.__init__(state['lock'], state['slots'], state['slot_size'], name=state['name'])
+
+    def slot_offset(self, hashed):
+        """Get the byte offset of the slot a key hash maps to"""
+        return (hashed % self.slots) * self.slot_size
+
+    def get(self, key):
+        """Read a value, or None when the slot holds nothing or another key"""
+        hashed = key_hash(key)
+        offset = self.slot_offset(hashed)
+        with self.lock:
+            stored, length = HEADER.unpack_from(self.shm.buf, offset)
+            if stored != hashed or length == 0:
+                return None
+            start = offset + HEADER.size
+            payload = bytes(self.shm.buf[start:start + length])
+        return json.loads(payload)
+
+    def set(self, key, value):
+        """Store a value; values larger than a slot clear it instead so no stale value survives"""
+        hashed = key_hash(key)
+        offset = self.slot_offset(hashed)
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        with self.lock:
+            if len(payload) > self.slot_size - HEADER.size:
+                HEADER.pack_into(self.shm.buf, offset, 0, 0)
+                return False
+            start = offset + HEADER.size
+            self.shm.buf[start:start + len(payload)] = payload
+            HEADER.pack_into(self.shm.buf, offset, hashed, len(payload))
+        return True
+
+    def close(self):
+        """Detach from the segment, removing it when this process created it"""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Versioned View Snapshots
+Keeps the latest payload of each dashboard view with a version number and
+pushes JSON-patch style diffs so clients patch their charts in place
+"""
+
+import json
+import threading
+import time
+
+VIEW_ROOM_PREFIX = 'view:'
+
+def view_room(view):
+    """Get the room name for clients watching a view"""
+    return f'{VIEW_ROOM_PREFIX}{view}'
+
+def escape_pointer(key):
+    """Escape a key for use in a JSON pointer path"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+def diff(old, new, path=''):
+    """Compute JSON-patch (RFC 6902) add/remove/replace operations turning old into new"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{escape_pointer(key)}'})
+        for key, value in new.items():
+            child = f'{path}/{escape_pointer(key)}'
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        for index in range(min(len(old), len(new))):
+            ops.extend(diff(old[index], new[index], f'{path}/{index}'))
+        for index in range(len(old), len(new)):
+            ops.append({'op': 'add', 'path': f'{path}/{index}', 'value': new[index]})
+        # Remove from the end so earlier indices stay valid
+        for index in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({'op': 'remove', 'path': f'{path}/{index}'})
+        return ops
+
+    if old != new:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    return []
+
+class LocalStorage:
+    """Snapshot storage for a single process"""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+        return True
+
+class SnapshotStore:
+    """Latest versioned payload per view plus a bounded history of patches between versions
+
+    The storage may be shared between worker processes (see shared_cache.py),
+    so entries are plain JSON and versions start from a microsecond clock to
+    stay monotonic if an entry is ever evicted and recreated.
+    """
+
+    def __init__(self, storage=None, history=20):
+        self.storage = storage if storage is not None else LocalStorage()
+        self.history = history
+        # Publish calls answered from the stored payload vs rebuilt, for this process
+        self.hits = 0
+        self.misses = 0
+
+    def view_names(self):
+        """List the views that have been requested at least once"""
+        with self.storage.lock:
+            return [view for view in self.storage.get('__views__') or [] if self.storage.get(view)]
+
+    def cached(self, view, data_key):
+        """Get the stored payload when it was built from the same data, else None"""
+        with self.storage.lock:
+            entry = self.storage.get(view)
+        if entry is not None and data_key is not None and entry['data_key'] == data_key:
+            return entry['version'], entry['data']
+        return None
+
+    def update(self, view, data, data_key=None):
+        """Record a view's latest payload and return (version, message for watching clients or None)"""
+        with self.storage.lock:
+            entry = self.storage.get(view)
+            if entry is None:
+                version = time.time_ns() // 1000
+                self.storage.set(view, {'version': version, 'data': data, 'data_key': data_key, 'patches': []})
+                views = self.storage.get('__views__') or []
+                if view not in views:
+                    self.storage.set('__views__', views + [view])
+                return version, None
+
+            ops = diff(entry['data'], data)
+            if not ops:
+                if entry['data_key'] != data_key:
+                    entry['data_key'] = data_key
+                    self.storage.set(view, entry)
+                return entry['version'], None
+
+            base_version = entry['version']
+            entry['version'] += 1
+            entry['data'] = data
+            entry['data_key'] = data_key
+            entry['patches'] = self.trim(entry['patches'] + [[base_version, entry['version'], ops]], data)
+            self.storage.set(view, entry)
+            return entry['version'], self.message(view, base_version, entry['version'], ops, data)
+
+    def trim(self, patches, data):
+        """Keep at most `history` patches, and no more than a full snapshot's worth of them"""
+        patches = patches[-self.history:]
+        budget = len(json.dumps(data))
+        while patches and sum(len(json.dumps(patch[2])) for patch in patches) > budget:
+            patches = patches[1:]
+        return patches
+
+    def since(self, view, version):
+        """Get what a client holding `version` needs: the composed patches, or a full snapshot when too far behind"""
+        with self.storage.lock:
+            entry = self.storage.get(view)
+        if entry is None:
+            return None
+
+        patches = [patch for patch in entry['patches'] if patch[0] >= version]
+        if version == entry['version']:
+            ops = []
+        elif patches and patches[0][0] == version:
+            ops = [op for patch in patches for op in patch[2]]
+        else:
+            ops = None
+
+        return self.message(view, version, entry['version'], ops, entry['data'])
+
+    def message(self, view, base_version, version, ops, data):
+        """Build a patch message, falling back to the full snapshot when the patch is not smaller"""
+        if ops is not None and len(json.dumps(ops)) < len(json.dumps(data)):
+            return {'view': view, 'base_version': base_version, 'version': version, 'ops': ops}
+        return {'view': view, 'version': version, 'snapshot': data}
+
+    def publish(self, broadcaster, view, build, data_key=None):
+        """Serve a view from its snapshot while the data is unchanged, otherwise rebuild it, queue the diff and return the versioned payload
+
+        Queued patches for the same view coalesce; a client whose patch was
+        replaced sees a version gap and resyncs.
+        """
+        cached = self.cached(view, data_key)
+        if cached is not None:
+            self.hits += 1
+            version, data = cached
+            return dict(data, version=version)
+
+        self.misses += 1
+        data = build()
+        version, message = self.update(view, data, data_key)
+        if message is not None:
+            broadcaster.publish(view_room(view), 'view_patch', message, key=f'view_patch:{view}')
+        return dict(data, version=version)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0}
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Transactions API
+Pages through the fact_sales lines joined with their date, product,
+customer and sales rep. Each page continues from a (DateKey, SalesKey)
+cursor instead of an OFFSET, so a deep page is the same index seek as the
+first, and the filters are checked inside that seek
+"""
+
+from datetime import date
+
+from filters import sales_filters, key_filters, where_clause, FilterError
+from serialization import fetch_columns
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Filters on the fact table's own keys, e.g. ?product=1131
+KEY_FILTERS = ('product', 'customer', 'employee')
+
+# Filter -> condition over fact_sales f. The unary + keeps SQLite walking the
+# (DateKey, SalesKey) index for dimension attributes, so a page is read in
+# order and stops at the page size; sorting every line of a category first
+# made the first page of a large table take about a second. A single key
+# filter uses its own (Key, DateKey, SalesKey) index, which is in order too.
+TRANSACTION_CONDITIONS = {
+    'from': 'f.DateKey >= ?',
+    'to': 'f.DateKey <= ?',
+    'region': '+f.CustomerKey IN (SELECT CustomerKey FROM dim_customer WHERE Region IN ({}))',
+    'customer_type': '+f.CustomerKey IN (SELECT CustomerKey FROM dim_customer WHERE Channel IN ({}))',
+    'product_category': '+f.ProductKey IN (SELECT ProductKey FROM dim_product WHERE Category IN ({}))',
+    'vendor': '+f.ProductKey IN (SELECT ProductKey FROM dim_product WHERE Vendor IN ({}))',
+    'product': 'f.ProductKey IN ({})',
+    'customer': 'f.CustomerKey IN ({})',
+    'employee': 'f.EmployeeKey IN ({})'
+}
+
+# DateKey and SalesKey come first: the last row's pair is the next cursor
+TRANSACTION_COLUMNS = (
+    'f.DateKey', 'f.SalesKey', 'd.Date', 'f.InvoiceNumber', 'p.ProductName', 'p.Category', 'p.Vendor',
+    'c.CustomerName', 'c.Region', 'c.Channel', 'e.Name AS SalesRep', 'f.Quantity', 'f.UnitPrice',
+    'f.DiscountAmount', 'f.NetSales', 'f.GrossProfit'
+)
+
+def date_key(iso_date):
+    """2024-01-31 -> 20240131, the warehouse's date key"""
+    return int(iso_date.replace('-', ''))
+
+def parse_cursor(token):
+    """Read a DateKey.SalesKey cursor as returned in next"""
+    if not token:
+        return None
+    key, _, sales_key = token.partition('.')
+    try:
+        cursor = (int(key), int(sales_key))
+        date(cursor[0] // 10000, cursor[0] // 100 % 100, cursor[0] % 100)
+    except ValueError:
+        raise FilterError("after must be a cursor returned as next by the previous page")
+    return cursor
+
+def transaction_query(args):
+    """Read filters, cursor, page size and order from request args; raises FilterError"""
+    filters = sales_filters(args)
+    filters.update(key_filters(args, KEY_FILTERS))
+    for name in ('from', 'to'):
+        if name in filters:
+            filters[name] = date_key(filters[name])
+
+    # args.get(type=int) would quietly fall back to the default for ?limit=many
+    try:
+        limit = int(args.get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        limit = None
+    if limit is None or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise FilterError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    order = args.get('order', 'desc')
+    if order not in ('asc', 'desc'):
+        raise FilterError("order must be asc or desc")
+    return filters, parse_cursor(args.get('after')), limit, order == 'desc'
+
+def transactions_page(conn, filters, after=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """One page of transactions as {'columns', 'data', 'next'}; next is None on the last page"""
+    where, parameters = where_clause(filters, TRANSACTION_CONDITIONS)
+    if after is not None:
+        keyset = f"(f.DateKey, f.SalesKey) {'<' if descending else '>'} (?, ?)"
+        where = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+        parameters.extend(after)
+    direction = 'DESC' if descending else 'ASC'
+
+    # One row more than the page says whether another page follows
+    columns, rows = fetch_columns(conn, f'''
+        SELECT {', '.join(TRANSACTION_COLUMNS)}
+        FROM fact_sales f
+        LEFT JOIN dim_date d ON d.DateKey = f.DateKey
+        LEFT JOIN dim_product p ON p.ProductKey = f.ProductKey
+        LEFT JOIN dim_customer c ON c.CustomerKey = f.CustomerKey
+        LEFT JOIN dim_employee e ON e.EmployeeKey = f.EmployeeKey
+        {where}
+        ORDER BY f.DateKey {direction}, f.SalesKey {direction}
+        LIMIT ?
+    ''', (*parameters, limit + 1))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1][0]}.{rows[-1][1]}"
+    return {'columns': columns, 'data': rows, 'next': next_cursor}
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - View Builders
+The dashboard, sales, financial and KPI payloads shared by every portal
+app. The sales figures come from the sales cube, so any date range costs
+a few array lookups; the KPIs from cursor rows
+"""
+
+import calendar
+from datetime import date, timedelta
+
+import numpy as np
+
+from downsample import keep_points
+from sales_cube import SALES, PROFIT, TRANSACTIONS
+from serialization import fetch_records
+
+# Default windows of the trend series when no range is asked for
+TREND_DAYS = 30
+CATEGORY_TREND_DAYS = 90
+SUMMARY_MONTHS = 12
+
+def window_start(days=0, months=0):
+    """ISO date the given number of days or months before today, like SQLite's date('now', '-N days')"""
+    today = date.today()
+    if months:
+        month = today.year * 12 + today.month - 1 - months
+        year, month = divmod(month, 12)
+        return date(year, month + 1, min(today.day, calendar.monthrange(year, month + 1)[1])).isoformat()
+    return (today - timedelta(days=days)).isoformat()
+
+def ranked(cube, totals, dimension, columns, key, limit=None):
+    """Rows of one dimension's range totals with any sales, largest key first"""
+    rows = [
+        dict({dimension: member}, **{name: measure(values) for name, measure in columns.items()})
+        for member, values in zip(cube.members[dimension], totals) if values[TRANSACTIONS] > 0
+    ]
+    rows.sort(key=lambda row: row[key] or 0, reverse=True)
+    return rows[:limit] if limit else rows
+
+def money(measure):
+    return lambda values: round(float(values[measure]), 2)
+
+def count(measure):
+    return lambda values: int(round(values[measure]))
+
+def thin(days, values, active, max_points):
+    """Keep the active days (with any sales), then at most about max_points of them picked by LTTB"""
+    positions = np.flatnonzero(active)
+    kept = positions[keep_points(positions, [series[positions] for series in values], max_points)]
+    return [days[position] for position in kept], kept
+
+def dashboard_view(cube, date_range=None, max_points=None):
+    """Build the dashboard summary view, over a date range or all time with the trend over the last 30 days
+
+    max_points thins the trend to about that many points.
+    """
+    start, end = date_range or (None, None)
+    totals = cube.totals(start, end)
+    total_sales, total_profit = round(float(totals[SALES]), 2), round(float(totals[PROFIT]), 2)
+    days, trend = cube.daily(start or window_start(days=TREND_DAYS), end)
+    days, kept = thin(days, [trend[:, SALES]], trend[:, TRANSACTIONS] > 0, max_points)
+
+    return {
+        'total_sales': total_sales,
+        'total_profit': total_profit,
+        'profit_margin': round((total_profit / total_sales * 100), 2) if total_sales > 0 else 0,
+        'sales_by_region': ranked(cube, cube.totals(start, end, by='region'), 'region',
+                                  {'sales': money(SALES)}, 'sales'),
+        'sales_trend': [
+            {'date': day, 'sales': round(float(values[SALES]), 2)}
+            for day, values in zip(days, trend[kept])
+        ],
+        'top_products': ranked(cube, cube.totals(start, end, by='product_category'), 'product_category',
+                               {'sales': money(SALES)}, 'sales', limit=5)
+    }
+
+def sales_view(cube, date_range=None, max_points=None):
+    """Build the detailed sales view, over a date range or all time with the category trend over the last 90 days
+
+    max_points thins the category trend to about that many days, the same
+    days for every category.
+    """
+    start, end = date_range or (None, None)
+    days, trend = cube.daily(start or window_start(days=CATEGORY_TREND_DAYS), end, by='product_category')
+    categories = cube.members['product_category']
+    order = sorted(range(len(categories)), key=lambda position: categories[position])
+    days, kept = thin(days, [trend[:, position, SALES] for position in order],
+                      trend[:, :, TRANSACTIONS].sum(axis=1) > 0, max_points)
+
+    return {
+        'category_trend': [
+            {'product_category': categories[position], 'date': day, 'sales': round(float(values[position][SALES]), 2)}
+            for day, values in zip(days, trend[kept]) for position in order if values[position][TRANSACTIONS] > 0
+        ],
+        'vendor_sales': ranked(cube, cube.totals(start, end, by='vendor'), 'vendor',
+                               {'sales': money(SALES), 'profit': money(PROFIT)}, 'sales'),
+        'customer_analysis': ranked(cube, cube.totals(start, end, by='customer_type'), 'customer_type',
+                                    {'sales': money(SALES), 'transactions': count(TRANSACTIONS)}, 'sales')
+    }
+
+def financial_view(cube, date_range=None, max_points=None):
+    """Build the financial analysis view, over a date range or all time with the monthly summary over the last 12 months
+
+    max_points thins the monthly summary to about that many months.
+    """
+    start, end = date_range or (None, None)
+    months, summary = cube.monthly(start or window_start(months=SUMMARY_MONTHS), end)
+    months, kept = thin(months, [summary[:, SALES], summary[:, PROFIT]], summary[:, TRANSACTIONS] > 0, max_points)
+    margins = ranked(cube, cube.totals(start, end, by='product_category'), 'product_category', {
+        'sales': money(SALES),
+        'profit': money(PROFIT),
+        'margin_percent': lambda values: round(float(values[PROFIT] / values[SALES] * 100), 2) if values[SALES] else None
+    }, 'margin_percent')
+
+    return {
+        'monthly_summary': [
+            {
+                'month': month,
+                'revenue': round(float(values[SALES]), 2),
+                'profit': round(float(values[PROFIT]), 2),
+                'transactions': int(round(values[TRANSACTIONS]))
+            }
+            for month, values in zip(months, summary[kept])
+        ],
+        'margin_by_category': margins
+    }
+
+# Views built from the sales cube, by name
+SALES_VIEWS = {
+    'dashboard': dashboard_view,
+    'sales': sales_view,
+    'financial': financial_view
+}
+
+def kpi_view(conn):
+    """Build the KPI view"""
+    return {
+        'kpis': fetch_records(conn, '''
+            SELECT metric_name, metric_value, target_value, department
+            FROM kpi_data
+            ORDER BY department, metric_name
+        ''')
+    }
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Master Data Warehouse
+Mirrors the master data CSV files (the star schema behind the Power BI
+reports) into indexed tables of the portal database, so the APIs can join
+and page through them with SQL. A table is reloaded only when its file's
+size or modification time changed
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+
+# Table -> (columns, indexes); a CSV column missing here fails the load
+MASTER_TABLES = {
+    'dim_date': ((
+        'DateKey INTEGER PRIMARY KEY', 'Date TEXT NOT NULL', 'Year INTEGER', 'Quarter INTEGER', 'Month INTEGER',
+        'MonthName TEXT', 'Week INTEGER', 'DayOfWeek INTEGER', 'DayName TEXT', 'DayOfMonth INTEGER',
+        'DayOfYear INTEGER', 'IsWeekend INTEGER', 'IsHoliday INTEGER', 'FiscalYear INTEGER',
+        'FiscalQuarter INTEGER', 'FiscalMonth INTEGER'
+    ), ()),
+    'dim_product': ((
+        'ProductKey INTEGER PRIMARY KEY', 'SKU TEXT', 'ProductName TEXT', 'Vendor TEXT', 'Category TEXT',
+        'SubCategory TEXT', 'Brand TEXT', 'PackSize TEXT', 'UnitCost REAL', 'UnitPrice REAL',
+        'LaunchDate TEXT', 'Status TEXT'
+    ), (
+        ('Category',),
+        ('Vendor',)
+    )),
+    'dim_customer': ((
+        'CustomerKey INTEGER PRIMARY KEY', 'CustomerCode TEXT', 'CustomerName TEXT', 'Channel TEXT',
+        'CustomerType TEXT', 'Region TEXT', 'Province TEXT', 'City TEXT', 'CreditLimit REAL',
+        'PaymentTerms INTEGER', 'Status TEXT', 'OnboardingDate TEXT'
+    ), (
+        ('Region',),
+        ('Channel',)
+    )),
+    'dim_employee': ((
+        'EmployeeKey INTEGER PRIMARY KEY', 'EmployeeCode TEXT', 'Name TEXT', 'Position TEXT', 'Department TEXT',
+        'ReportsTo INTEGER', 'HireDate TEXT', 'Salary REAL', 'EmploymentType TEXT'
+    ), ()),
+    'fact_sales': ((
+        'SalesKey INTEGER PRIMARY KEY', 'DateKey INTEGER NOT NULL', 'ProductKey INTEGER', 'CustomerKey INTEGER',
+        'EmployeeKey INTEGER', 'Quantity INTEGER', 'DiscountPercent REAL', 'UnitPrice REAL', 'UnitCost REAL',
+        'GrossSales REAL', 'DiscountAmount REAL', 'NetSales REAL', 'Cost REAL', 'GrossProfit REAL',
+        'InvoiceNumber TEXT'
+    ), (
+        # Every index ends in (DateKey, SalesKey) so a filtered page is still
+        # read in keyset order without a sort
+        ('DateKey', 'SalesKey'),
+        ('ProductKey', 'DateKey', 'SalesKey'),
+        ('CustomerKey', 'DateKey', 'SalesKey'),
+        ('EmployeeKey', 'DateKey', 'SalesKey')
+    )),
+    'fact_inventory': ((
+        'InventoryKey INTEGER PRIMARY KEY', 'ProductKey INTEGER', 'Warehouse TEXT', 'StockOnHand INTEGER',
+        'ReorderPoint INTEGER', 'MaxStock INTEGER', 'StockValue REAL', 'DaysOnHand INTEGER', 'LastUpdated TEXT'
+    ), ())
+}
+
+# Rows inserted per executemany call
+LOAD_BATCH = 10000
+
+TRACKING_TABLE = '''
+    CREATE TABLE IF NOT EXISTS warehouse_files (
+        name TEXT PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+def csv_rows(reader, batch_size=LOAD_BATCH):
+    """Yield lists of CSV rows with empty fields as NULL"""
+    batch = []
+    for row in reader:
+        batch.append([value if value != '' else None for value in row])
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class MasterWarehouse:
+    """Keeps the master data tables in the portal database in step with their CSV files"""
+
+    def __init__(self, database_path, master_data_dir, tables=MASTER_TABLES):
+        self.database_path = database_path
+        self.master_data_dir = master_data_dir
+        self.tables = tables
+        self.lock = threading.Lock()
+        self.fingerprints = {}
+
+    def fingerprint(self, name):
+        try:
+            stat = os.stat(os.path.join(self.master_data_dir, f'{name}.csv'))
+        except OSError:
+            return None
+        return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+    def sync(self):
+        """Reload the tables whose file changed since it was loaded; returns {table: rows loaded}
+
+        Unchanged files cost a stat each, so this is cheap enough to call
+        before every query. Workers sharing the database load a changed file
+        once: the first takes the write lock, the others find its fingerprint
+        already recorded.
+        """
+        current = {name: self.fingerprint(name) for name in self.tables}
+        if all(current[name] == self.fingerprints.get(name) for name in self.tables):
+            return {}
+
+        loaded = {}
+        with self.lock:
+            conn = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+            try:
+                conn.execute(TRACKING_TABLE)
+                for name, fingerprint in current.items():
+                    if fingerprint is None or fingerprint == self.fingerprints.get(name):
+                        continue
+                    conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        stored = conn.execute('SELECT fingerprint FROM warehouse_files WHERE name = ?', (name,)).fetchone()
+                        if stored is None or stored[0] != fingerprint:
+                            loaded[name] = self.load(conn, name, fingerprint)
+                        conn.execute('COMMIT')
+                    except Exception as e:
+                        conn.execute('ROLLBACK')
+                        print(f"⚠️  Could not load {name}.csv into the warehouse: {e}")
+                        continue
+                    self.fingerprints[name] = fingerprint
+            finally:
+                conn.close()
+        return loaded
+
+    def load(self, conn, name, fingerprint):
+        """Replace one table with the contents of its CSV file inside the caller's transaction"""
+        columns, indexes = self.tables[name]
+        with open(os.path.join(self.master_data_dir, f'{name}.csv'), newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            known = {column.split()[0] for column in columns}
+            unknown = [column for column in header if column not in known]
+            if not header or unknown:
+                raise ValueError(f"unexpected columns {unknown or 'none'}")
+
+            # Readers keep seeing the old table until the transaction commits;
+            # indexes are built after the rows go in, which is much faster
+            conn.execute(f'DROP TABLE IF EXISTS {name}')
+            conn.execute(f"CREATE TABLE {name} ({', '.join(columns)})")
+            insert = f"INSERT INTO {name} ({', '.join(header)}) VALUES ({', '.join('?' * len(header))})"
+            row_count = 0
+            for batch in csv_rows(reader):
+                conn.executemany(insert, batch)
+                row_count += len(batch)
+
+        for index in indexes:
+            conn.execute(f"CREATE INDEX idx_{name}_{'_'.join(index).lower()} ON {name} ({', '.join(index)})")
+        conn.execute(f'ANALYZE {name}')
+        conn.execute('INSERT OR REPLACE INTO warehouse_files (name, fingerprint, row_count) VALUES (?, ?, ?)',
+                     (name, fingerprint, row_count))
+        return row_count
@@ -148,14 +148,16 @@ from flask_socketio import SocketIO, emit
 import sqlite3
 import os
 import secrets
-from datetime import datetime, timedelta
+from datetime import datetime
 import threading
 import time
 import random
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 import socket
 import webbrowser
 
+from database import prepare_database
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = secrets.token_hex(16)
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -178,111 +180,9 @@ def find_free_port():
         s.bind(('', 0))
         return s.getsockname()[1]
 
-class DashboardData:
-    def __init__(self):
-        self.init_database()
-        self.load_sample_data()
-    
-    def init_database(self):
-        """Initialize SQLite database"""
-        os.makedirs('data', exist_ok=True)
-        
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute(\'\'\'
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        \'\'\')
-        
-        cursor.execute(\'\'\'
-            CREATE TABLE IF NOT EXISTS sales_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                region TEXT NOT NULL,
-                product_category TEXT NOT NULL,
-                vendor TEXT NOT NULL,
-                customer_type TEXT NOT NULL,
-                sales_amount REAL NOT NULL,
-                profit_amount REAL NOT NULL,
-                quantity INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        \'\'\')
-        
-        admin_hash = generate_password_hash('admin123')
-        cursor.execute(\'\'\'
-            INSERT OR IGNORE INTO users (username, email, password_hash, role)
-            VALUES (?, ?, ?, ?)
-        \'\'\', ('admin', 'admin@bevco.com', admin_hash, 'admin'))
-        
-        conn.commit()
-        conn.close()
-    
-    def load_sample_data(self):
-        """Load sample data"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM sales_data')
-        if cursor.fetchone()[0] > 0:
-            conn.close()
-            return
-        
-        regions = ['Gauteng', 'Western Cape', 'KwaZulu-Natal', 'Eastern Cape', 'Free State']
-        categories = ['Beer', 'Wine', 'Spirits', 'Soft Drinks', 'Water']
-        vendors = ['SAB Miller', 'Distell', 'Coca-Cola', 'Pepsi', 'Local Brands']
-        customer_types = ['Retail', 'Wholesale', 'On-Trade', 'Export']
-        
-        sales_data = []
-        start_date = datetime.now() - timedelta(days=180)
-        
-        for i in range(5000):
-            date = start_date + timedelta(days=random.randint(0, 180))
-            region = random.choice(regions)
-            category = random.choice(categories)
-            vendor = random.choice(vendors)
-            customer_type = random.choice(customer_types)
-            
-            base_amount = {
-                'Beer': random.uniform(1000, 5000),
-                'Wine': random.uniform(2000, 8000),
-                'Spirits': random.uniform(3000, 12000),
-                'Soft Drinks': random.uniform(500, 3000),
-                'Water': random.uniform(200, 1500)
-            }[category]
-            
-            sales_amount = round(base_amount, 2)
-            profit_margin = random.uniform(0.15, 0.35)
-            profit_amount = round(sales_amount * profit_margin, 2)
-            quantity = random.randint(10, 500)
-            
-            sales_data.append((
-                date.strftime('%Y-%m-%d'),
-                region,
-                category,
-                vendor,
-                customer_type,
-                sales_amount,
-                profit_amount,
-                quantity
-            ))
-        
-        cursor.executemany(\'\'\'
-            INSERT INTO sales_data (date, region, product_category, vendor, customer_type, sales_amount, profit_amount, quantity)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        \'\'\', sales_data)
-        
-        conn.commit()
-        conn.close()
-
-dashboard_data = DashboardData()
+# Schema, admin user and sample data come from the shared seeding module
+# in dashboard_portal/database.py, downloaded with the project
+database_startup = prepare_database(DATABASE_PATH)
 
 def login_required(f):
     def decorated_function(*args, **kwargs):
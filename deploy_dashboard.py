@@ -8,6 +8,7 @@ import os
 import sys
 import subprocess
 import platform
+import tempfile
 import time
 import webbrowser
 from pathlib import Path
@@ -154,18 +155,23 @@ def start_dashboard():
         print_status("Dashboard is starting up...", "info")
         print_status("This may take a few moments to initialize the database and load sample data", "info")
         
+        sys.path.insert(0, str(dashboard_dir))
+        from health import READY_FILE_ENV, wait_until_ready
+        ready_file = Path(tempfile.gettempdir()) / f"bevco_portal_ready_{os.getpid()}.json"
+        if ready_file.exists():
+            ready_file.unlink()
+        
         # Start the application
         process = subprocess.Popen([
             sys.executable, str(app_path)
-        ], cwd=str(dashboard_dir))
+        ], cwd=str(dashboard_dir), env=dict(os.environ, **{READY_FILE_ENV: str(ready_file)}))
         
-        # Wait a moment for the server to start
-        time.sleep(3)
+        # Wait until the portal reports ready
+        port = os.environ.get('PORT', '5000')
+        ready, detail = wait_until_ready(f"http://localhost:{port}", process, ready_file=str(ready_file))
         
-        # Check if process is still running
-        if process.poll() is None:
-            port = os.environ.get('PORT', '5000')
-            url = f"http://localhost:{port}"
+        if ready:
+            url = detail.get('url') or f"http://localhost:{port}"
             
             print_status("Dashboard started successfully!", "success")
             print_status(f"Dashboard URL: {url}", "info")
@@ -180,7 +186,9 @@ def start_dashboard():
             
             return True
         else:
-            print_status("Dashboard failed to start", "error")
+            if process.poll() is None:
+                process.terminate()
+            print_status(f"Dashboard failed to start: {detail}", "error")
             return False
             
     except Exception as e:
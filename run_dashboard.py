@@ -7,8 +7,8 @@ Direct launcher that can be run from anywhere
 import os
 import sys
 import subprocess
+import tempfile
 import webbrowser
-import time
 from pathlib import Path
 
 def find_project_root():
@@ -89,11 +89,23 @@ def main():
         print("🤖 AI Chat: Click the chat button in bottom-right")
         print("\n⏳ Please wait while the server starts...")
         
+        sys.path.insert(0, str(dashboard_dir))
+        from health import READY_FILE_ENV, wait_until_ready
+        ready_file = Path(tempfile.gettempdir()) / f"bevco_portal_ready_{os.getpid()}.json"
+        if ready_file.exists():
+            ready_file.unlink()
+        
         # Start the Flask app
-        process = subprocess.Popen([sys.executable, "app.py"])
+        process = subprocess.Popen([sys.executable, "app.py"],
+                                   env=dict(os.environ, **{READY_FILE_ENV: str(ready_file)}))
         
-        # Wait a moment then open browser
-        time.sleep(3)
+        # Open the browser once the portal reports ready
+        ready, detail = wait_until_ready("http://localhost:5000", process, ready_file=str(ready_file))
+        if not ready:
+            print(f"❌ Dashboard failed to start: {detail}")
+            if process.poll() is None:
+                process.terminate()
+            return 1
         try:
             webbrowser.open("http://localhost:5000")
             print("🌐 Opening dashboard in your browser...")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Trend Downsampling Benchmark
+Builds multi-year daily sales series for every category, thins them with
+LTTB at several point limits and reports the JSON payload size and the
+time taken, next to a plain Python LTTB loop over the same series
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT / "dashboard_portal"))
+
+from downsample import keep_points, lttb  # noqa: E402
+
+CATEGORIES = ['Beer', 'Wine', 'Spirits', 'Soft Drinks', 'Water']
+
+def make_series(days, seed=1):
+    """Seasonal daily sales per category with noise and a few promotion spikes"""
+    rng = np.random.default_rng(seed)
+    x = np.arange(days, dtype=float)
+    series = []
+    for index in range(len(CATEGORIES)):
+        base = 20000 + 5000 * index
+        season = 0.25 * base * np.sin(2 * np.pi * (x + 30 * index) / 365)
+        values = base + season + rng.normal(0, 0.1 * base, days)
+        spikes = rng.choice(days, days // 60, replace=False)
+        values[spikes] *= rng.uniform(1.5, 3, len(spikes))
+        series.append(values)
+    return x, series
+
+def python_lttb(x, y, max_points):
+    """Straightforward LTTB over Python lists, for comparison"""
+    count = len(x)
+    buckets = max_points - 2
+    kept = [0]
+    a = 0
+    for bucket in range(buckets):
+        start, end = bucket * (count - 2) // buckets + 1, (bucket + 1) * (count - 2) // buckets + 1
+        next_start, next_end = end, min((bucket + 2) * (count - 2) // buckets + 1, count)
+        if bucket == max_points - 3:
+            average_x, average_y = x[-1], y[-1]
+        else:
+            average_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            average_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        best, area = start, -1.0
+        for index in range(start, end):
+            candidate = abs((x[a] - average_x) * (y[index] - y[a]) - (x[a] - x[index]) * (average_y - y[a]))
+            if candidate > area:
+                best, area = index, candidate
+        kept.append(best)
+        a = best
+    kept.append(count - 1)
+    return kept
+
+def payload_bytes(x, series, kept):
+    """Size of the category_trend records for the kept days"""
+    return len(json.dumps([
+        {'product_category': category, 'date': int(x[index]), 'sales': round(float(values[index]), 2)}
+        for index in kept for category, values in zip(CATEGORIES, series)
+    ]))
+
+def timed(work, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LTTB downsampling of long category trends")
+    parser.add_argument("--years", type=int, default=5, help="Years of daily history")
+    parser.add_argument("--points", type=int, nargs="+", default=[100, 250, 500, 1000], help="max_points values")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs (median reported)")
+    args = parser.parse_args()
+
+    days = args.years * 365
+    x, series = make_series(days)
+    full = payload_bytes(x, series, range(days))
+
+    print("🧪 Trend Downsampling Benchmark")
+    print("=" * 72)
+    print(f"📈 {len(CATEGORIES)} categories x {days:,} days, {full / 1024:,.0f} KB as category_trend JSON")
+    print()
+    print(f"{'max_points':>10} {'Days kept':>10} {'Payload KB':>11} {'Shared ms':>10} {'LTTB ms':>9} {'Python ms':>10}")
+    lists = (x.tolist(), series[0].tolist())
+    for points in args.points:
+        kept = keep_points(x, series, points)
+        shared_ms = timed(lambda: keep_points(x, series, points), args.repeats)
+        single_ms = timed(lambda: lttb(x, series[0], points), args.repeats)
+        python_ms = timed(lambda: python_lttb(*lists, points), args.repeats)
+        print(f"{points:>10} {len(kept):>10} {payload_bytes(x, series, kept) / 1024:>11,.1f} "
+              f"{shared_ms:>10.2f} {single_ms:>9.2f} {python_ms:>10.2f}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - ETL and Template Micro-Benchmarks
+Times the master data generators, the data quality check and the PBIX/PBIT
+creators at several data scales, each case in a fresh process, records wall
+time, peak RSS and rows/s to a JSON history and compares runs
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_HISTORY = PROJECT_ROOT / "data" / "processed" / "benchmarks" / "etl_history.json"
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts" / "etl"))
+
+CASES = [
+    "generate_sales_facts",
+    "generate_budget_data",
+    "generate_inventory_data",
+    "check_data_quality",
+    "PBIXCreator.create_all_pbix_files",
+    "PBITCreator.create_all_templates"
+]
+
+DATA_FILES = [
+    "dim_date", "dim_product", "dim_customer", "dim_employee",
+    "fact_sales", "fact_budget", "fact_inventory", "dim_kpi_targets"
+]
+
+def load_generator():
+    """Import the master data generator without its import-time directory messages"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import generate_master_data
+    return generate_master_data
+
+def replicate(frame, key, scale):
+    """Stack scale copies of a dimension with non-overlapping keys"""
+    import pandas as pd
+    step = int(frame[key].max()) + 1
+    copies = []
+    for index in range(scale):
+        copy = frame.copy()
+        copy[key] = copy[key] + index * step
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def scaled_inputs(data_dir, scale):
+    """Load a dataset's dimensions, with the date dimension repeated so date-driven facts grow with the scale"""
+    import pandas as pd
+    frames = {name: pd.read_csv(Path(data_dir) / f"{name}.csv") for name in ("dim_date", "dim_product", "dim_customer", "dim_employee")}
+    frames["date_input"] = pd.concat([frames["dim_date"]] * scale, ignore_index=True)
+    return frames
+
+def build_dataset(data_dir, scale, seed):
+    """Write the full set of master data files at a scale: dimensions and date-driven facts grow scale times"""
+    import numpy as np
+    generator = load_generator()
+    np.random.seed(seed)
+    random.seed(seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        date_dim = generator.generate_date_dimension()
+        product_dim = replicate(generator.generate_product_dimension(), "ProductKey", scale)
+        customer_dim = replicate(generator.generate_customer_dimension(), "CustomerKey", scale)
+        employee_dim = generator.generate_employee_dimension()
+
+        import pandas as pd
+        date_input = pd.concat([date_dim] * scale, ignore_index=True)
+        tables = {
+            "dim_date": date_dim,
+            "dim_product": product_dim,
+            "dim_customer": customer_dim,
+            "dim_employee": employee_dim,
+            "fact_sales": generator.generate_sales_facts(date_input, product_dim, customer_dim, employee_dim),
+            "fact_budget": generator.generate_budget_data(date_input),
+            "fact_inventory": generator.generate_inventory_data(product_dim),
+            "dim_kpi_targets": generator.generate_kpi_targets()
+        }
+
+    os.makedirs(data_dir, exist_ok=True)
+    for name, frame in tables.items():
+        frame.to_csv(Path(data_dir) / f"{name}.csv", index=False)
+    return sum(len(frame) for frame in tables.values())
+
+def count_rows(data_dir):
+    """Data rows across the master data files"""
+    total = 0
+    for name in DATA_FILES:
+        with open(Path(data_dir) / f"{name}.csv", "rb") as f:
+            total += sum(1 for _ in f) - 1
+    return total
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or None where it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_case(case, data_dir, work_dir, scale, seed, results):
+    """Set up one case, time it and report wall time, rows processed and peak RSS"""
+    import numpy as np
+    np.random.seed(seed)
+    random.seed(seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case.startswith("generate_"):
+            generator = load_generator()
+            inputs = scaled_inputs(data_dir, scale)
+            call = {
+                "generate_sales_facts": lambda: generator.generate_sales_facts(
+                    inputs["date_input"], inputs["dim_product"], inputs["dim_customer"], inputs["dim_employee"]),
+                "generate_budget_data": lambda: generator.generate_budget_data(inputs["date_input"]),
+                "generate_inventory_data": lambda: generator.generate_inventory_data(inputs["dim_product"])
+            }[case]
+            start = time.perf_counter()
+            rows = len(call())
+            elapsed = time.perf_counter() - start
+        else:
+            rows = count_rows(data_dir)
+            if case == "check_data_quality":
+                import data_quality_check
+                data_quality_check.data_dir = str(data_dir)
+                data_quality_check.output_dir = str(Path(work_dir) / "processed")
+                call = data_quality_check.check_data_quality
+            else:
+                from schema_inference import SchemaInferencer
+                if case.startswith("PBIX"):
+                    from create_pbix_files import PBIXCreator as Creator
+                    method = "create_all_pbix_files"
+                else:
+                    from create_pbit_templates import PBITCreator as Creator
+                    method = "create_all_templates"
+                creator = Creator()
+                creator.data_dir = Path(data_dir)
+                creator.output_dir = Path(work_dir) / "output"
+                # No fingerprint cache, so every run infers the schema from the files
+                creator.schema = SchemaInferencer(data_dir)
+                call = getattr(creator, method)
+            start = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - start
+
+    results.put({"wall_s": round(elapsed, 4), "rows": rows, "peak_rss_mb": peak_rss_mb()})
+
+def measure(case, data_dir, scale, seed, repeats):
+    """Best wall time of several fresh-process runs, with the peak RSS of the largest run"""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as work_dir:
+            results = context.Queue()
+            process = context.Process(target=run_case, args=(case, data_dir, work_dir, scale, seed, results))
+            process.start()
+            try:
+                runs.append(results.get(timeout=1800))
+            finally:
+                process.join()
+    best = min(runs, key=lambda run: run["wall_s"])
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "case": case,
+        "scale": scale,
+        "wall_s": best["wall_s"],
+        "rows": best["rows"],
+        "rows_per_s": round(best["rows"] / best["wall_s"], 1) if best["wall_s"] else 0.0,
+        "peak_rss_mb": max(peaks) if peaks else None
+    }
+
+def git_label():
+    """Short commit hash of the working tree, used as the default run label"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return "local"
+    return result.stdout.strip() or "local"
+
+def load_history(path):
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
+
+def print_results(results):
+    print(f"{'Case':<36} {'Scale':>5} {'Rows':>10} {'Wall s':>9} {'Rows/s':>12} {'Peak MB':>9}")
+    for result in results:
+        peak = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{result['case']:<36} {result['scale']:>5} {result['rows']:>10,} {result['wall_s']:>9.3f} "
+              f"{result['rows_per_s']:>12,.0f} {peak:>9}")
+
+def compare(previous, current, tolerance):
+    """Print a speedup table of current against previous and return the regressed cases"""
+    before = {(result["case"], result["scale"]): result for result in previous["results"]}
+    regressions = []
+    print(f"\n📈 {current['label']} vs {previous['label']} ({previous['recorded']})")
+    print(f"{'Case':<36} {'Scale':>5} {'Before s':>9} {'After s':>9} {'Speedup':>8} {'RSS MB':>14}")
+    for result in current["results"]:
+        old = before.get((result["case"], result["scale"]))
+        if old is None or not result["wall_s"]:
+            continue
+        speedup = old["wall_s"] / result["wall_s"]
+        if old["peak_rss_mb"] is not None and result["peak_rss_mb"] is not None:
+            rss = f"{old['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f}"
+        else:
+            rss = "n/a"
+        marker = ""
+        if speedup < 1 - tolerance:
+            marker = " ❌"
+            regressions.append(f"{result['case']} x{result['scale']}")
+        elif speedup > 1 + tolerance:
+            marker = " ✅"
+        print(f"{result['case']:<36} {result['scale']:>5} {old['wall_s']:>9.3f} {result['wall_s']:>9.3f} "
+              f"{speedup:>7.2f}x {rss:>14}{marker}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ETL and Power BI template scripts at several data scales")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4], help="Data scale factors")
+    parser.add_argument("--cases", nargs="+", default=CASES, choices=CASES, help="Cases to run")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh-process runs per case; the fastest counts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the datasets and generators")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY), help="JSON file the runs are appended to")
+    parser.add_argument("--label", help="Name for this run (default: current commit)")
+    parser.add_argument("--against", help="Label of the run to compare with (default: the previous run)")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Slowdown that counts as a regression, e.g. 0.1 = 10%%")
+    parser.add_argument("--no-record", action="store_true", help="Compare without appending this run to the history")
+    args = parser.parse_args()
+
+    print("🧪 ETL and Template Micro-Benchmarks")
+    print("=" * 88)
+
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        for scale in args.scales:
+            data_dir = Path(root) / f"scale_{scale}"
+            rows = build_dataset(data_dir, scale, args.seed)
+            print(f"🌱 Scale {scale}: {rows:,} rows of master data")
+            for case in args.cases:
+                results.append(measure(case, data_dir, scale, args.seed, args.repeats))
+
+    print()
+    print_results(results)
+
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    run = {
+        "label": args.label or git_label(),
+        "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "repeats": args.repeats,
+        "seed": args.seed,
+        "results": results
+    }
+
+    if args.against:
+        previous = next((entry for entry in reversed(history) if entry["label"] == args.against), None)
+        if previous is None:
+            print(f"❌ No run labelled {args.against} in {history_path}")
+            return 1
+    else:
+        previous = history[-1] if history else None
+
+    regressions = compare(previous, run, args.tolerance) if previous else []
+
+    if not args.no_record:
+        history.append(run)
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        history_path.write_text(json.dumps(history, indent=2) + "\n")
+        print(f"\n💾 Recorded as {run['label']} in {history_path}")
+
+    if regressions:
+        print(f"❌ Slower than {previous['label']} by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
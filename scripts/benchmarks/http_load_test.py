@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - HTTP Load Test
+Boots the portal against a generated dataset, drives the dashboard APIs and
+the chat endpoint with a weighted concurrent client mix plus SocketIO
+connections, reports p50/p95/p99 latency and throughput, and fails when
+they regress against a stored baseline. Chat latency runs until the answer
+is collected, not just until the question is queued
+"""
+
+import argparse
+import http.cookiejar
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+PORTAL_DIR = Path(__file__).parent.parent.parent / "dashboard_portal"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "http_load_test.json"
+
+sys.path.insert(0, str(PORTAL_DIR))
+
+from database import prepare_database
+from health import wait_until_ready
+
+# Share of requests per endpoint in the client mix
+REQUEST_MIX = {
+    '/api/dashboard_data': 35,
+    '/api/sales_data': 20,
+    '/api/financial_data': 15,
+    '/api/kpi_data': 15,
+    '/api/chat': 15
+}
+
+CHAT_QUESTIONS = [
+    "What are sales in Gauteng this month?",
+    "Show me profit margins by product category",
+    "How is our budget performance this quarter?",
+    "Which products need reordering?",
+    "Are we on track with our KPIs?",
+    "Sales in Western Cape last 30 days",
+    "Margin for spirits",
+    "How did KwaZulu-Natal do last week?"
+]
+
+# Endpoints with fewer samples than this are reported but not compared
+MIN_SAMPLES = 20
+
+# Pause between polls for a queued chat answer, and the longest wait for one
+CHAT_POLL_INTERVAL = 0.01
+CHAT_TIMEOUT = 30
+
+def percentile(values, pct):
+    """Get a percentile from a list of timings"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def login(base_url):
+    """Log in as the default admin and return an opener carrying the session cookie"""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    form = urllib.parse.urlencode({'username': 'admin', 'password': 'admin123'}).encode('utf-8')
+    opener.open(f"{base_url}/login", data=form, timeout=10).read()
+    return opener, jar
+
+def ask_chat(opener, base_url, question):
+    """Ask a question and wait until its answer is in, polling /api/chat/<request_id> while it is queued"""
+    body = json.dumps({'message': question}).encode('utf-8')
+    request = urllib.request.Request(f"{base_url}/api/chat", data=body, headers={'Content-Type': 'application/json'})
+    result = json.loads(opener.open(request, timeout=30).read())
+    deadline = time.perf_counter() + CHAT_TIMEOUT
+    while result.get('status') == 'pending':
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"no chat answer after {CHAT_TIMEOUT}s")
+        time.sleep(CHAT_POLL_INTERVAL)
+        result = json.loads(opener.open(f"{base_url}/api/chat/{result['request_id']}", timeout=30).read())
+    return result
+
+def http_client(index, base_url, duration, seed, results):
+    """Request a weighted random endpoint in a loop and report latencies per endpoint"""
+    generator = random.Random(seed + index)
+    paths = list(REQUEST_MIX)
+    weights = [REQUEST_MIX[path] for path in paths]
+    latencies = {path: [] for path in paths}
+    errors = {path: 0 for path in paths}
+
+    opener, _ = login(base_url)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        path = generator.choices(paths, weights)[0]
+        start = time.perf_counter()
+        try:
+            if path == '/api/chat':
+                ask_chat(opener, base_url, generator.choice(CHAT_QUESTIONS))
+            else:
+                opener.open(f"{base_url}{path}", timeout=30).read()
+            latencies[path].append(time.perf_counter() - start)
+        except (urllib.error.URLError, OSError, ValueError):
+            errors[path] += 1
+    results.put(('http', latencies, errors))
+
+def socket_clients(count, base_url, duration, websocket_only, results):
+    """Hold count logged-in SocketIO connections and time resync round trips on each"""
+    try:
+        import socketio
+    except ImportError:
+        results.put(('socket', None, 'python-socketio client is not installed'))
+        return
+
+    connect_times, round_trips, received = [], [], [0]
+    errors = 0
+    clients = []
+    lock = threading.Lock()
+
+    for _ in range(count):
+        _, jar = login(base_url)
+        cookie = '; '.join(f"{c.name}={c.value}" for c in jar)
+        client = socketio.Client(reconnection=False)
+        arrived = threading.Event()
+
+        def on_patch(data, arrived=arrived):
+            with lock:
+                received[0] += 1
+            arrived.set()
+
+        client.on('view_patch', on_patch)
+        client.on('real_time_update', lambda data: received.__setitem__(0, received[0] + 1))
+        start = time.perf_counter()
+        try:
+            client.connect(base_url, headers={'Cookie': cookie},
+                           transports=['websocket'] if websocket_only else None, wait_timeout=10)
+        except Exception:
+            errors += 1
+            continue
+        connect_times.append(time.perf_counter() - start)
+        client.emit('subscribe', {'topics': ['sales', 'kpi', 'view:dashboard']})
+        clients.append((client, arrived))
+
+    deadline = time.perf_counter() + duration
+    while clients and time.perf_counter() < deadline:
+        for client, arrived in clients:
+            arrived.clear()
+            start = time.perf_counter()
+            client.emit('resync', {'view': 'dashboard', 'version': 0})
+            if arrived.wait(10):
+                round_trips.append(time.perf_counter() - start)
+            else:
+                errors += 1
+        time.sleep(0.2)
+
+    for client, _ in clients:
+        client.disconnect()
+    results.put(('socket', {'connected': len(clients), 'connect': connect_times,
+                            'round_trips': round_trips, 'received': received[0]}, errors))
+
+def summarize(latencies, elapsed):
+    """Count, throughput and latency percentiles in milliseconds"""
+    if not latencies:
+        return {'count': 0, 'rps': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+    return {
+        'count': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2)
+    }
+
+def run_load(args, workdir):
+    """Start the portal in workdir, run the client mix and return the summarized results"""
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, PYTHONPATH=str(PORTAL_DIR))
+    server = subprocess.Popen(
+        [sys.executable, str(PORTAL_DIR / "serve.py"), "--workers", str(args.workers), "--host", "127.0.0.1",
+         "--port", str(args.port), "--app", args.app, "--broker-port", str(args.broker_port)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        ready, status = wait_until_ready(base_url, process=server, timeout=args.startup_timeout)
+        if not ready:
+            raise RuntimeError(f"portal did not start: {status}")
+
+        # One pass over every endpoint so the run measures steady state, not the first builds
+        opener, _ = login(base_url)
+        for path in REQUEST_MIX:
+            if path != '/api/chat':
+                opener.open(f"{base_url}{path}", timeout=60).read()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=http_client, args=(index, base_url, args.duration, args.seed, results))
+            for index in range(args.clients)
+        ]
+        if args.socket_clients:
+            processes.append(multiprocessing.Process(
+                target=socket_clients, args=(args.socket_clients, base_url, args.duration, args.workers > 1, results)))
+
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = {path: [] for path in REQUEST_MIX}
+    errors = {path: 0 for path in REQUEST_MIX}
+    socket_result = None
+    for kind, data, failures in collected:
+        if kind == 'http':
+            for path in REQUEST_MIX:
+                latencies[path].extend(data[path])
+                errors[path] += failures[path]
+        else:
+            socket_result = (data, failures)
+
+    endpoints = {path: dict(summarize(latencies[path], elapsed), errors=errors[path]) for path in REQUEST_MIX}
+    overall = dict(summarize([value for values in latencies.values() for value in values], elapsed),
+                   errors=sum(errors.values()))
+
+    sockets = None
+    if socket_result is not None:
+        data, failures = socket_result
+        if data is None:
+            print(f"⚠️  SocketIO clients skipped: {failures}")
+        else:
+            sockets = dict(summarize(data['round_trips'], elapsed), errors=failures,
+                           connected=data['connected'], received=data['received'],
+                           connect_p95_ms=round(percentile(data['connect'], 95) * 1000, 2) if data['connect'] else 0.0)
+    return {'endpoints': endpoints, 'overall': overall, 'sockets': sockets}
+
+def settings(args):
+    """The run parameters a baseline is only comparable under"""
+    return {'rows': args.rows, 'seed': args.seed, 'duration': args.duration, 'clients': args.clients,
+            'socket_clients': args.socket_clients, 'app': args.app, 'workers': args.workers, 'mix': REQUEST_MIX}
+
+def print_results(results):
+    print(f"{'Endpoint':<24} {'Count':>8} {'Req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Errors':>7}")
+    rows = list(results['endpoints'].items()) + [('overall', results['overall'])]
+    if results['sockets']:
+        rows.append(('socketio resync', results['sockets']))
+    for name, stats in rows:
+        print(f"{name:<24} {stats['count']:>8} {stats['rps']:>9.1f} {stats['p50_ms']:>9.2f} "
+              f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['errors']:>7}")
+    if results['sockets']:
+        sockets = results['sockets']
+        print(f"SocketIO: {sockets['connected']} connected (connect p95 {sockets['connect_p95_ms']:.1f} ms), "
+              f"{sockets['received']} messages received")
+
+def compare(results, baseline, tolerance):
+    """List regressions beyond the tolerance: slower percentiles, lower throughput or new errors"""
+    regressions = []
+    current = dict(results['endpoints'], overall=results['overall'])
+    previous = dict(baseline['endpoints'], overall=baseline['overall'])
+    if results['sockets'] and baseline.get('sockets'):
+        current['socketio resync'] = results['sockets']
+        previous['socketio resync'] = baseline['sockets']
+
+    for name, stats in current.items():
+        before = previous.get(name)
+        if before is None or before['count'] < MIN_SAMPLES or stats['count'] < MIN_SAMPLES:
+            continue
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if stats[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name} {key} {before[key]:.2f} -> {stats[key]:.2f}")
+        if stats['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append(f"{name} req/s {before['rps']:.1f} -> {stats['rps']:.1f}")
+        if stats['errors'] > before['errors']:
+            regressions.append(f"{name} errors {before['errors']} -> {stats['errors']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the portal over HTTP and SocketIO against a stored baseline")
+    parser.add_argument("--rows", type=int, default=100000, help="Sales rows in the generated dataset")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the dataset and the client mix")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to drive the portal")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent HTTP client processes")
+    parser.add_argument("--socket-clients", type=int, default=10, help="SocketIO connections (0 to skip)")
+    parser.add_argument("--app", default="app_simple", choices=["app", "app_simple"], help="Portal module to serve")
+    parser.add_argument("--workers", type=int, default=1, help="Portal worker processes")
+    parser.add_argument("--port", type=int, default=5056, help="Port for the benchmark portal")
+    parser.add_argument("--broker-port", type=int, default=6396, help="Port for the local broker")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="Seconds to wait for the portal")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a regression, e.g. 0.25 = 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    print("🏋️  Portal HTTP Load Test")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"🌱 Generating {args.rows:,} sales rows (seed {args.seed})...")
+        prepare_database(os.path.join(workdir, 'data', 'bevco_dashboard.db'), snapshot_path=None,
+                         rows=args.rows, seed=args.seed)
+        print(f"🚀 Driving {args.app} with {args.workers} worker(s), {args.clients} HTTP clients and "
+              f"{args.socket_clients} SocketIO clients for {args.duration:.0f}s...")
+        try:
+            results = run_load(args, workdir)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+
+    print_results(results)
+    record = {
+        'settings': settings(args),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+        **results
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(record, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(record, indent=2) + "\n")
+        print(f"💾 Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"⚠️  No baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0 if results['overall']['errors'] == 0 else 1
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline['settings'] != settings(args):
+        print("❌ The baseline was recorded with different settings; rerun with them or --update-baseline")
+        return 1
+    if baseline['machine']['cpus'] != os.cpu_count():
+        print(f"⚠️  Baseline recorded on {baseline['machine']['cpus']} CPUs, this machine has {os.cpu_count()}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"❌ Regressions beyond {args.tolerance:.0%} of the baseline from {baseline['recorded']}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print(f"✅ Within {args.tolerance:.0%} of the baseline from {baseline['recorded']}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Payload Size and Slow Link Benchmark
+Boots the portal against a generated dataset and fetches the dashboard APIs
+through a proxy that adds the latency and bandwidth of a branch-office link,
+as records and as columns, with and without compression, and reports the
+bytes on the wire and the end-to-end time to a decoded JSON document
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import queue
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+PORTAL_DIR = Path(__file__).parent.parent.parent / "dashboard_portal"
+
+sys.path.insert(0, str(PORTAL_DIR))
+
+from database import prepare_database  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PATHS = ['/api/dashboard_data', '/api/sales_data', '/api/financial_data', '/api/batch?panels=sales,dashboard']
+
+# name -> (round trip ms, downstream kbit/s)
+LINKS = {
+    'lan': (2, 100000),
+    'branch-dsl': (60, 4000),
+    'branch-3g': (150, 1000)
+}
+
+CHUNK = 16 * 1024
+
+class SlowLinkProxy:
+    """TCP proxy adding half the round trip to every chunk in each direction and pacing data to the link rate"""
+
+    def __init__(self, upstream_port, round_trip_ms, kbit_per_second):
+        self.upstream_port = upstream_port
+        self.delay = round_trip_ms / 2000
+        self.bytes_per_second = kbit_per_second * 1000 / 8
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        while True:
+            client, _ = self.listener.accept()
+            upstream = socket.create_connection(("127.0.0.1", self.upstream_port))
+            for source, target, paced in ((client, upstream, False), (upstream, client, True)):
+                chunks = queue.Queue()
+                threading.Thread(target=self.read, args=(source, chunks), daemon=True).start()
+                threading.Thread(target=self.write, args=(target, chunks, paced), daemon=True).start()
+
+    def read(self, source, chunks):
+        while True:
+            try:
+                data = source.recv(CHUNK)
+            except OSError:
+                data = b''
+            chunks.put((time.perf_counter(), data))
+            if not data:
+                return
+
+    def write(self, target, chunks, paced):
+        free_at = 0.0
+        while True:
+            arrived, data = chunks.get()
+            send_at = max(arrived + self.delay, free_at)
+            if paced:
+                send_at += len(data) / self.bytes_per_second
+            time.sleep(max(send_at - time.perf_counter(), 0))
+            free_at = send_at
+            try:
+                if not data:
+                    target.shutdown(socket.SHUT_WR)
+                    return
+                target.sendall(data)
+            except OSError:
+                return
+
+def decode(body, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        return brotli.decompress(body)
+    return body
+
+def fetch(port, path, cookie, encoding):
+    """One request on a fresh connection: bytes on the wire and seconds until the JSON is decoded"""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    headers = {'Cookie': cookie, 'Accept-Encoding': encoding}
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    header_bytes = sum(len(name) + len(value) + 4 for name, value in response.getheaders())
+    json.loads(decode(body, response.getheader('Content-Encoding')))
+    elapsed = time.perf_counter() - start
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{path} returned {response.status}")
+    return len(body) + header_bytes, elapsed
+
+def login(port):
+    """Log in as the default admin and return the session cookie header"""
+    form = urllib.parse.urlencode({'username': 'admin', 'password': 'admin123'})
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    connection.request('POST', '/login', body=form, headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie').split(';')[0]
+    connection.close()
+    return cookie
+
+def wait_until_ready(base_url, timeout):
+    """Poll /readyz until the portal has warmed its views"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/readyz", timeout=2).read()
+            return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    return False
+
+def variants():
+    """(label, layout, Accept-Encoding) pairs to compare"""
+    encodings = [('identity', 'identity'), ('gzip', 'gzip')] + ([('br', 'br')] if brotli is not None else [])
+    return [(f"{layout}+{label}", layout, accept) for layout in ('records', 'columns') for label, accept in encodings]
+
+def with_layout(path, layout):
+    if layout == 'records':
+        return path
+    return f"{path}{'&' if '?' in path else '?'}layout={layout}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API payload bytes and latency over emulated slow links")
+    parser.add_argument("--rows", type=int, default=100000, help="Sales rows in the generated dataset")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the dataset")
+    parser.add_argument("--repeats", type=int, default=5, help="Requests per endpoint and variant (median reported)")
+    parser.add_argument("--links", nargs="+", default=list(LINKS), choices=list(LINKS), help="Link profiles to emulate")
+    parser.add_argument("--app", default="app_simple", choices=["app", "app_simple"], help="Portal module to serve")
+    parser.add_argument("--port", type=int, default=5057, help="Port for the benchmark portal")
+    parser.add_argument("--broker-port", type=int, default=6397, help="Port for the local broker")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="Seconds to wait for the portal")
+    args = parser.parse_args()
+
+    print("🧪 Payload Size and Slow Link Benchmark")
+    print("=" * 78)
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"🌱 Generating {args.rows:,} sales rows (seed {args.seed})...")
+        prepare_database(os.path.join(workdir, 'data', 'bevco_dashboard.db'), snapshot_path=None,
+                         rows=args.rows, seed=args.seed)
+        env = dict(os.environ, PYTHONPATH=str(PORTAL_DIR))
+        server = subprocess.Popen(
+            [sys.executable, str(PORTAL_DIR / "serve.py"), "--workers", "1", "--host", "127.0.0.1",
+             "--port", str(args.port), "--app", args.app, "--broker-port", str(args.broker_port)],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            if not wait_until_ready(f"http://127.0.0.1:{args.port}", args.startup_timeout):
+                print("❌ portal did not start")
+                return 1
+            cookie = login(args.port)
+            for path in PATHS:
+                for _, layout, accept in variants():
+                    fetch(args.port, with_layout(path, layout), cookie, accept)
+
+            for link in args.links:
+                round_trip_ms, kbit = LINKS[link]
+                proxy = SlowLinkProxy(args.port, round_trip_ms, kbit)
+                print()
+                print(f"🌐 {link}: {round_trip_ms} ms round trip, {kbit / 1000:g} Mbit/s down")
+                print(f"{'Endpoint':<36} {'Variant':<18} {'Bytes':>9} {'Median ms':>10}")
+                for path in PATHS:
+                    for label, layout, accept in variants():
+                        results = [fetch(proxy.port, with_layout(path, layout), cookie, accept)
+                                   for _ in range(args.repeats)]
+                        size = results[-1][0]
+                        median_ms = statistics.median(elapsed for _, elapsed in results) * 1000
+                        print(f"{path:<36} {label:<18} {size:>9,} {median_ms:>10.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+    if brotli is None:
+        print()
+        print("ℹ️  Install brotli to compare br as well")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Sales Cube Benchmark
+Seeds a scratch database with sample sales, then times random date-range
+views answered by SQL aggregates over sales_data and by the sales cube,
+plus the cube's full build and the refresh that folds in new rows
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT / "dashboard_portal"))
+
+from database import create_schema, seed_sample_data  # noqa: E402
+from sales_cube import SalesCube  # noqa: E402
+
+SQL_QUERIES = (
+    "SELECT SUM(sales_amount), SUM(profit_amount) FROM sales_data WHERE date BETWEEN ? AND ?",
+    "SELECT region, SUM(sales_amount) FROM sales_data WHERE date BETWEEN ? AND ? GROUP BY region",
+    "SELECT DATE(date), SUM(sales_amount) FROM sales_data WHERE date BETWEEN ? AND ? GROUP BY DATE(date)",
+    "SELECT vendor, SUM(sales_amount), SUM(profit_amount) FROM sales_data WHERE date BETWEEN ? AND ? GROUP BY vendor"
+)
+
+def random_ranges(first, days, count, seed=1):
+    """Inclusive (from, to) ISO date pairs inside the seeded days"""
+    generator = random.Random(seed)
+    ranges = []
+    for _ in range(count):
+        start = generator.randrange(days)
+        end = generator.randrange(start, days)
+        ranges.append(((first + timedelta(days=start)).isoformat(), (first + timedelta(days=end)).isoformat()))
+    return ranges
+
+def sql_view(conn, start, end):
+    for sql in SQL_QUERIES:
+        conn.execute(sql, (start, end)).fetchall()
+
+def cube_view(state, start, end):
+    state.totals(start, end)
+    state.totals(start, end, by='region')
+    state.daily(start, end)
+    state.totals(start, end, by='vendor')
+
+def timed(work, ranges):
+    times = []
+    for start, end in ranges:
+        began = time.perf_counter()
+        work(start, end)
+        times.append((time.perf_counter() - began) * 1000)
+    return statistics.median(times), max(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time date-range views from SQL aggregates and from the sales cube")
+    parser.add_argument("--rows", type=int, default=1000000, help="Sample sales rows")
+    parser.add_argument("--ranges", type=int, default=50, help="Random date ranges to time")
+    parser.add_argument("--append", type=int, default=500, help="Rows added before timing a refresh")
+    args = parser.parse_args()
+
+    print("🧪 Sales Cube Benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = str(Path(workdir) / "bevco_dashboard.db")
+        conn = sqlite3.connect(database_path)
+        create_schema(conn)
+        print(f"⏳ Seeding {args.rows:,} sales rows...")
+        seed_sample_data(conn, rows=args.rows, seed=1)
+        conn.commit()
+
+        cube = SalesCube(database_path)
+        began = time.perf_counter()
+        state = cube.refresh()
+        build_ms = (time.perf_counter() - began) * 1000
+        first = date.fromisoformat(state.day(0))
+        ranges = random_ranges(first, state.days, args.ranges)
+
+        sql_median, sql_max = timed(lambda start, end: sql_view(conn, start, end), ranges)
+        cube_median, cube_max = timed(lambda start, end: cube_view(state, start, end), ranges)
+
+        conn.executemany('''
+            INSERT INTO sales_data (date, region, product_category, vendor, customer_type, sales_amount, profit_amount, quantity)
+            VALUES (date('now'), 'Gauteng', 'Beer', 'Distell', 'Retail', 100, 25, 5)
+        ''', [()] * args.append)
+        conn.commit()
+        began = time.perf_counter()
+        cube.refresh()
+        refresh_ms = (time.perf_counter() - began) * 1000
+        conn.close()
+
+    print(f"📦 {args.rows:,} rows over {state.days} days, cube {state.cumulative.nbytes / 1024 / 1024:.1f} MB")
+    print()
+    print(f"{'Date-range view':<22} {'Median ms':>10} {'Max ms':>10}")
+    print(f"{'SQL aggregates':<22} {sql_median:>10.2f} {sql_max:>10.2f}")
+    print(f"{'Sales cube':<22} {cube_median:>10.3f} {cube_max:>10.3f}")
+    print()
+    print(f"🧊 Full cube build: {build_ms:.0f} ms; refresh after {args.append} new rows: {refresh_ms:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - SocketIO Broadcast Load Test
+Drives the portal's Broadcaster with thousands of simulated socket clients,
+a share of them slow, and checks that queues stay bounded and fast clients
+keep receiving every update
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "dashboard_portal"))
+
+from broadcaster import Broadcaster
+
+REGIONS = ['Gauteng', 'Western Cape', 'KwaZulu-Natal', 'Eastern Cape', 'Free State']
+
+class SimulatedQueue:
+    """Transport send queue of one simulated client"""
+
+    def __init__(self, drain_rate):
+        self.size = 0
+        self.drain_rate = drain_rate
+
+    def qsize(self):
+        return self.size
+
+    def tick(self):
+        self.size = max(0, self.size - self.drain_rate)
+
+class SimulatedSocket:
+    def __init__(self, drain_rate):
+        self.queue = SimulatedQueue(drain_rate)
+
+class SimulatedSocketIO:
+    """Stand-in for Flask-SocketIO exposing what the Broadcaster touches"""
+
+    def __init__(self):
+        self.server = self
+        self.manager = self
+        self.eio = self
+        self.sockets = {}
+        self.received = {}
+
+    def eio_sid_from_sid(self, sid, namespace):
+        return sid
+
+    def add_client(self, sid, drain_rate):
+        self.sockets[sid] = SimulatedSocket(drain_rate)
+        self.received[sid] = 0
+
+    def emit(self, event, data, to=None, ignore_queue=False):
+        self.sockets[to].queue.size += 1
+        self.received[to] += 1
+
+    def tick(self):
+        for eio_socket in self.sockets.values():
+            eio_socket.queue.tick()
+
+def percentile(values, pct):
+    """Get a percentile from a list of timings"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run(args):
+    """Run the load test and return a process exit code"""
+    socketio = SimulatedSocketIO()
+    broadcaster = Broadcaster(socketio, max_queue=args.max_queue, batch_size=args.batch_size,
+                              transport_limit=args.transport_limit)
+
+    slow_every = int(1 / args.slow_fraction) if args.slow_fraction > 0 else 0
+    slow_clients = set()
+    for index in range(args.clients):
+        sid = f"client-{index}"
+        slow = slow_every and index % slow_every == 0
+        socketio.add_client(sid, 0 if slow else 1000)
+        if slow:
+            slow_clients.add(sid)
+        broadcaster.connect(sid)
+        broadcaster.join(sid, 'sales')
+        broadcaster.join(sid, 'view:dashboard')
+        broadcaster.join(sid, f"region:{REGIONS[index % len(REGIONS)]}")
+
+    publish_times = []
+    drain_times = []
+
+    # Every client sees each sales update and one region update in every len(REGIONS) rounds
+    expected_per_client = args.events + args.events // len(REGIONS)
+
+    for event_index in range(args.events):
+        start = time.perf_counter()
+        broadcaster.publish('sales', 'real_time_update', {'type': 'sales', 'total_sales': event_index})
+        broadcaster.publish(f"region:{REGIONS[event_index % len(REGIONS)]}", 'real_time_update',
+                            {'type': 'sales', 'total_sales': event_index})
+        broadcaster.publish('view:dashboard', 'view_patch',
+                            {'view': 'dashboard', 'version': event_index + 1, 'ops': []},
+                            key='view_patch:dashboard')
+        publish_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        broadcaster.drain()
+        drain_times.append(time.perf_counter() - start)
+        socketio.tick()
+
+    # Let fast clients catch up on anything still queued
+    while broadcaster.drain():
+        socketio.tick()
+
+    stats = broadcaster.stats()
+    fast_clients = [sid for sid in socketio.received if sid not in slow_clients]
+    fast_min = min(socketio.received[sid] for sid in fast_clients) if fast_clients else 0
+    slow_max = max((socketio.received[sid] for sid in slow_clients), default=0)
+    total_time = sum(publish_times) + sum(drain_times)
+
+    print("📡 SocketIO Broadcast Load Test")
+    print("=" * 45)
+    print(f"Clients:                {args.clients} ({len(slow_clients)} slow)")
+    print(f"Events published:       {args.events} x 3 rooms")
+    print(f"Publish p50/p95/max:    {percentile(publish_times, 50) * 1000:.2f} / "
+          f"{percentile(publish_times, 95) * 1000:.2f} / {max(publish_times) * 1000:.2f} ms")
+    print(f"Drain p50/p95/max:      {percentile(drain_times, 50) * 1000:.2f} / "
+          f"{percentile(drain_times, 95) * 1000:.2f} / {max(drain_times) * 1000:.2f} ms")
+    print(f"Messages sent:          {stats['sent']} ({stats['sent'] / total_time:,.0f}/s)")
+    print(f"Fast client min recv:   {fast_min} (at least {expected_per_client} sales and region updates)")
+    print(f"Slow client max recv:   {slow_max}")
+    print(f"Max queue depth:        {stats['max_depth']} (limit {args.max_queue})")
+    print(f"Dropped / coalesced:    {stats['dropped']} / {stats['coalesced']}")
+    print(f"Mean publish:           {statistics.mean(publish_times) * 1000:.2f} ms")
+
+    failures = []
+    if stats['max_depth'] > args.max_queue:
+        failures.append("queue depth exceeded the per-client limit")
+    if fast_min < expected_per_client:
+        failures.append("fast clients missed updates")
+    if slow_max > args.transport_limit:
+        failures.append("slow clients were sent more than the transport backlog limit")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+
+    print("✅ Queues stayed bounded and fast clients received every update")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the portal's SocketIO broadcaster")
+    parser.add_argument("--clients", type=int, default=5000, help="Simulated socket clients")
+    parser.add_argument("--events", type=int, default=200, help="Update rounds to publish")
+    parser.add_argument("--slow-fraction", type=float, default=0.1, help="Share of clients that never read")
+    parser.add_argument("--max-queue", type=int, default=50, help="Per-client outbound queue limit")
+    parser.add_argument("--batch-size", type=int, default=10, help="Messages handed to a client per drain")
+    parser.add_argument("--transport-limit", type=int, default=20, help="Transport backlog that marks a client slow")
+    return run(parser.parse_args())
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Startup Time Benchmark
+Times portal cold starts in fresh interpreter processes: a first start
+that restores the sample snapshot, a warm start that only checks the
+schema marker, and the database startup paths on their own
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PORTAL_DIR = Path(__file__).parent.parent.parent / "dashboard_portal"
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+DATABASE_PROBE = """
+import time
+from database import prepare_database
+start = time.perf_counter()
+path = prepare_database('data/bevco_dashboard.db', snapshot_path={snapshot})
+print(time.perf_counter() - start, path)
+"""
+
+def run_probe(code, workdir):
+    """Run a probe in a fresh interpreter and return the seconds it printed and the whole process time"""
+    env = dict(os.environ, PYTHONPATH=str(PORTAL_DIR))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env,
+                            capture_output=True, text=True, timeout=300)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    return float(result.stdout.split()[0]), elapsed
+
+def measure(code, repeats, fresh):
+    """Median probe and process times over several runs, each in its own working directory"""
+    probe_times, process_times = [], []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        if not fresh:
+            # Prime once so every measured run finds an existing database
+            run_probe(code, warm_dir)
+        for _ in range(repeats):
+            if fresh:
+                with tempfile.TemporaryDirectory() as workdir:
+                    probe, process = run_probe(code, workdir)
+            else:
+                probe, process = run_probe(code, warm_dir)
+            probe_times.append(probe)
+            process_times.append(process)
+    return statistics.median(probe_times), statistics.median(process_times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure portal startup time in fresh processes")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per scenario")
+    parser.add_argument("--modules", nargs="+", default=["app_simple", "app"], help="Portal modules to import")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("Database: generate and seed", DATABASE_PROBE.format(snapshot=None), True),
+        ("Database: restore snapshot", DATABASE_PROBE.format(snapshot="__import__('database').SAMPLE_SNAPSHOT_PATH"), True),
+        ("Database: schema marker hit", DATABASE_PROBE.format(snapshot=None), False)
+    ]
+    for module in args.modules:
+        scenarios.append((f"import {module}: first start", IMPORT_PROBE.format(module=module), True))
+        scenarios.append((f"import {module}: warm start", IMPORT_PROBE.format(module=module), False))
+
+    print("⏱️  Portal Startup Time Benchmark")
+    print("=" * 72)
+    print(f"{'Scenario':<40} {'Startup ms':>14} {'Process ms':>14}")
+
+    failed = False
+    for name, code, fresh in scenarios:
+        try:
+            probe, process = measure(code, args.repeats, fresh)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{name:<40} ❌ {e}")
+            failed = True
+            continue
+        print(f"{name:<40} {probe * 1000:>14.1f} {process * 1000:>14.1f}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    exit(main())
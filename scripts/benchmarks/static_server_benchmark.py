@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Static Server Concurrency Benchmark
+Serves the web-import tool and a large CSV with the old single-threaded
+TCPServer and with the shared threaded static server, keeps a few slow
+clients downloading the CSV while other clients load the page, and reports
+page latency percentiles, throughput and bytes on the wire for each
+"""
+
+import argparse
+import http.client
+import http.server
+import multiprocessing
+import os
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+WEB_DIR = PROJECT_ROOT / "web-import"
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+SERVERS = ["tcpserver", "static"]
+
+def percentile(values, pct):
+    """Get a percentile from a list of timings"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def serve(kind, site_dir, port, cache_dir):
+    """Run one server flavour over site_dir until terminated"""
+    os.chdir(site_dir)
+    if kind == "tcpserver":
+        class QuietHandler(http.server.SimpleHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+        socketserver.TCPServer.allow_reuse_address = True
+        server = socketserver.TCPServer(("127.0.0.1", port), QuietHandler)
+    else:
+        from static_server import StaticRequestHandler, StaticServer
+
+        class QuietHandler(StaticRequestHandler):
+            def log_message(self, format, *args):
+                pass
+        server = StaticServer(("127.0.0.1", port), QuietHandler, cache_dir=cache_dir)
+    server.serve_forever()
+
+def build_site(site_dir, file_mb):
+    """Copy the web-import page and write a CSV of about file_mb megabytes next to it"""
+    shutil.copytree(WEB_DIR, site_dir)
+    row = "2024-01-15,1042,Sparkling Water 500ml,Gauteng,Retail,24,18.50,444.00,133.20\n"
+    with open(Path(site_dir) / "fact_sales.csv", "w") as f:
+        f.write("Date,ProductKey,Product,Region,Channel,Quantity,UnitPrice,Revenue,Profit\n")
+        f.write(row * (file_mb * 1024 * 1024 // len(row)))
+
+def wait_for_port(port, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def slow_download(port, rate_kb, stop):
+    """Download the CSV again and again at rate_kb KB/s, like a user on a slow link"""
+    chunk = 16 * 1024
+    pause = chunk / (rate_kb * 1024)
+    while not stop.is_set():
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            connection.request("GET", "/fact_sales.csv")
+            response = connection.getresponse()
+            while not stop.is_set() and response.read(chunk):
+                time.sleep(pause)
+            connection.close()
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.1)
+
+def page_client(port, duration, encoding, latencies, failures):
+    """Load the page in a loop and record each response time"""
+    deadline = time.perf_counter() + duration
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            connection.request("GET", "/index.html", headers=headers)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            failures.append(time.perf_counter() - start)
+
+def wire_bytes(port, path, encoding):
+    """Bytes of body sent for one request"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    connection.request("GET", path, headers={"Accept-Encoding": encoding} if encoding else {})
+    body = connection.getresponse().read()
+    connection.close()
+    return len(body)
+
+def run(kind, site_dir, cache_dir, args):
+    port = free_port()
+    process = multiprocessing.get_context("spawn").Process(target=serve, args=(kind, site_dir, port, cache_dir))
+    process.start()
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError(f"{kind} server did not start")
+        # Sizes first, which also builds the compressed copies before timing
+        sizes = {path: wire_bytes(port, path, args.encoding) for path in ("/index.html", "/fact_sales.csv")}
+
+        stop = threading.Event()
+        slow = [threading.Thread(target=slow_download, args=(port, args.slow_rate_kb, stop), daemon=True)
+                for _ in range(args.slow_clients)]
+        for thread in slow:
+            thread.start()
+        # Let the slow downloads get going before the page loads start
+        time.sleep(0.5)
+
+        latencies, failures = [], []
+        started = time.perf_counter()
+        clients = [threading.Thread(target=page_client, args=(port, args.duration, args.encoding, latencies, failures))
+                   for _ in range(args.clients)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+    finally:
+        process.terminate()
+        process.join()
+
+    return {
+        "server": kind,
+        "requests": len(latencies),
+        "failures": len(failures),
+        "req_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+        "page_bytes": sizes["/index.html"],
+        "csv_bytes": sizes["/fact_sales.csv"]
+    }
+
+def print_results(results):
+    print(f"{'Server':<10} {'Requests':>9} {'Failed':>7} {'Req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'Page B':>8} {'CSV KB':>9}")
+    for result in results:
+        timings = [f"{result[key]:>9.1f}" if result[key] is not None else f"{'n/a':>9}" for key in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{result['server']:<10} {result['requests']:>9} {result['failures']:>7} {result['req_per_s']:>9.1f} "
+              f"{' '.join(timings)} {result['page_bytes']:>8} {result['csv_bytes'] / 1024:>9.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old single-threaded web tools server with the threaded static server")
+    parser.add_argument("--servers", nargs="+", default=SERVERS, choices=SERVERS, help="Servers to run")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent page-loading clients")
+    parser.add_argument("--slow-clients", type=int, default=2, help="Clients downloading the CSV over a slow link")
+    parser.add_argument("--slow-rate-kb", type=int, default=256, help="Download speed of each slow client in KB/s")
+    parser.add_argument("--file-mb", type=int, default=8, help="Size of the CSV data file in MB")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of page loads per server")
+    parser.add_argument("--encoding", default="gzip, br", help="Accept-Encoding sent by the clients ('' for none)")
+    args = parser.parse_args()
+
+    print("🧪 Static Server Concurrency Benchmark")
+    print("=" * 88)
+    print(f"👥 {args.clients} page clients, {args.slow_clients} slow downloads at {args.slow_rate_kb} KB/s "
+          f"of a {args.file_mb} MB CSV, {args.duration:.0f}s per server")
+
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        site_dir = Path(root) / "site"
+        build_site(site_dir, args.file_mb)
+        for kind in args.servers:
+            print(f"⏳ {kind}...")
+            results.append(run(kind, site_dir, Path(root) / "cache", args))
+
+    print()
+    print_results(results)
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
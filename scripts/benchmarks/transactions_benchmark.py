@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Transactions Paging Benchmark
+Loads the master data into a scratch warehouse, repeats the fact_sales
+lines to a large table and times pages of the transactions query at
+growing depths, read with the keyset cursor and with the OFFSET it
+replaces, unfiltered and with dashboard filters
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+MASTER_DATA_DIR = PROJECT_ROOT / "data" / "master"
+
+sys.path.insert(0, str(PROJECT_ROOT / "dashboard_portal"))
+
+from transactions import TRANSACTION_COLUMNS, TRANSACTION_CONDITIONS, transactions_page  # noqa: E402
+from filters import where_clause  # noqa: E402
+from warehouse import MasterWarehouse  # noqa: E402
+
+FILTERS = {
+    "none": {},
+    "category": {"product_category": ["Beer"]},
+    "region+category": {"region": ["Gauteng"], "product_category": ["Beer"]},
+    "product": {"product": [1131]}
+}
+
+def build_warehouse(database_path, rows):
+    """Load data/master, then repeat the fact lines with new keys until the table has about rows lines"""
+    MasterWarehouse(database_path, str(MASTER_DATA_DIR)).sync()
+    conn = sqlite3.connect(database_path, isolation_level=None)
+    base, top = conn.execute("SELECT COUNT(*), MAX(SalesKey) FROM fact_sales").fetchone()
+    conn.execute("BEGIN")
+    for copy in range(1, max(rows // base, 1)):
+        conn.execute("""
+            INSERT INTO fact_sales
+            SELECT SalesKey + ?, DateKey, ProductKey, CustomerKey, EmployeeKey, Quantity, DiscountPercent,
+                   UnitPrice, UnitCost, GrossSales, DiscountAmount, NetSales, Cost, GrossProfit, InvoiceNumber
+            FROM fact_sales WHERE SalesKey <= ?
+        """, (copy * top, top))
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE fact_sales")
+    total = conn.execute("SELECT COUNT(*) FROM fact_sales").fetchone()[0]
+    conn.close()
+    return total
+
+def offset_page(conn, filters, offset, limit):
+    """The same page read with LIMIT/OFFSET"""
+    where, parameters = where_clause(filters, TRANSACTION_CONDITIONS)
+    return conn.execute(f"""
+        SELECT {', '.join(TRANSACTION_COLUMNS)}
+        FROM fact_sales f
+        LEFT JOIN dim_date d ON d.DateKey = f.DateKey
+        LEFT JOIN dim_product p ON p.ProductKey = f.ProductKey
+        LEFT JOIN dim_customer c ON c.CustomerKey = f.CustomerKey
+        LEFT JOIN dim_employee e ON e.EmployeeKey = f.EmployeeKey
+        {where}
+        ORDER BY f.DateKey DESC, f.SalesKey DESC
+        LIMIT ? OFFSET ?
+    """, (*parameters, limit, offset)).fetchall()
+
+def cursor_at(conn, filters, offset):
+    """The cursor a client paging from the start would hold before the row at offset"""
+    if offset == 0:
+        return None
+    where, parameters = where_clause(filters, TRANSACTION_CONDITIONS)
+    row = conn.execute(f"""
+        SELECT f.DateKey, f.SalesKey FROM fact_sales f {where}
+        ORDER BY f.DateKey DESC, f.SalesKey DESC LIMIT 1 OFFSET ?
+    """, (*parameters, offset - 1)).fetchone()
+    return tuple(row) if row else None
+
+def timed(work, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time keyset against OFFSET paging of the transactions API query")
+    parser.add_argument("--rows", type=int, default=2000000, help="Approximate fact_sales lines")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per page (median reported)")
+    args = parser.parse_args()
+
+    print("🧪 Transactions Paging Benchmark")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = str(Path(workdir) / "warehouse.db")
+        print("⏳ Building warehouse...")
+        total = build_warehouse(database_path, args.rows)
+        print(f"📦 {total:,} fact_sales lines, {args.limit} per page")
+        print()
+        print(f"{'Filter':<17} {'Depth':>6} {'Rows skipped':>13} {'Keyset ms':>10} {'OFFSET ms':>10}")
+
+        conn = sqlite3.connect(database_path)
+        for name, filters in FILTERS.items():
+            where, parameters = where_clause(filters, TRANSACTION_CONDITIONS)
+            matching = conn.execute(f"SELECT COUNT(*) FROM fact_sales f {where}", parameters).fetchone()[0]
+            for depth in (0.0, 0.1, 0.5, 0.99):
+                offset = int(matching * depth)
+                after = cursor_at(conn, filters, offset)
+                keyset_ms = timed(lambda: transactions_page(conn, filters, after, args.limit), args.repeats)
+                offset_ms = timed(lambda: offset_page(conn, filters, offset, args.limit), args.repeats)
+                print(f"{name:<17} {depth:>6.0%} {offset:>13,} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+        conn.close()
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
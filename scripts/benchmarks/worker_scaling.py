@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Worker Scaling Benchmark
+Starts the production launcher with 1, 2, 4 ... workers up to the core
+count, drives the dashboard API from several client processes and reports
+how request throughput scales with the worker count
+"""
+
+import argparse
+import http.cookiejar
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+PORTAL_DIR = Path(__file__).parent.parent.parent / "dashboard_portal"
+
+def login(base_url):
+    """Log in as the default admin and return an opener carrying the session cookie"""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urllib.parse.urlencode({'username': 'admin', 'password': 'admin123'}).encode('utf-8')
+    opener.open(f"{base_url}/login", data=form, timeout=10).read()
+    return opener
+
+def client(base_url, path, duration, results):
+    """Request one endpoint in a loop for duration seconds and report the completed count"""
+    opener = login(base_url)
+    completed = 0
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            opener.open(f"{base_url}{path}", timeout=10).read()
+            completed += 1
+        except (urllib.error.URLError, OSError):
+            errors += 1
+    results.put((completed, errors))
+
+def wait_until_ready(base_url, timeout):
+    """Poll the login page until every worker has bound the port"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/login", timeout=2).read()
+            return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    return False
+
+def measure(workers, args):
+    """Run the portal with a number of workers and return requests per second"""
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1",
+         "--port", str(args.port), "--app", args.app, "--broker-port", str(args.broker_port)],
+        cwd=PORTAL_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_until_ready(base_url, args.startup_timeout):
+            raise RuntimeError(f"portal with {workers} workers did not start")
+        # Give the remaining workers a moment to join the shared port
+        time.sleep(1)
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client, args=(base_url, args.path, args.duration, results))
+            for _ in range(args.clients_per_worker * workers)
+        ]
+        for process in clients:
+            process.start()
+        totals = [results.get() for _ in clients]
+        for process in clients:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    completed = sum(count for count, _ in totals)
+    errors = sum(count for _, count in totals)
+    return completed / args.duration, errors
+
+def worker_counts(limit):
+    """Powers of two up to the limit, always ending at the limit itself"""
+    counts = []
+    workers = 1
+    while workers < limit:
+        counts.append(workers)
+        workers *= 2
+    counts.append(limit)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request throughput against the portal worker count")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest worker count (default: CPU count)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to drive each configuration")
+    parser.add_argument("--clients-per-worker", type=int, default=4, help="Client processes per portal worker")
+    parser.add_argument("--path", default="/api/dashboard_data", help="Endpoint to request")
+    parser.add_argument("--app", default="app_simple", choices=["app", "app_simple"], help="Portal module to serve")
+    parser.add_argument("--port", type=int, default=5055, help="Port for the benchmark portal")
+    parser.add_argument("--broker-port", type=int, default=6395, help="Port for the local broker")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="Seconds to wait for the portal")
+    args = parser.parse_args()
+
+    # Clients and workers compete for the same cores, so the client load scales with the workers
+    print("⚙️  Portal Worker Scaling Benchmark")
+    print("=" * 60)
+    print(f"{'Workers':>8} {'Req/s':>12} {'Speedup':>10} {'Efficiency':>12} {'Errors':>8}")
+
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        try:
+            rate, errors = measure(workers, args)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        baseline = baseline or rate
+        speedup = rate / baseline if baseline else 0
+        print(f"{workers:>8} {rate:>12,.1f} {speedup:>9.2f}x {speedup / workers:>11.0%} {errors:>8}")
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Sample Snapshot Builder
+Generates a fresh sample database and stores it as the gzipped snapshot
+the portal restores on first start instead of seeding
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard_portal"))
+
+from database import SAMPLE_SNAPSHOT_PATH, build_snapshot, prepare_database
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the portal's prebuilt sample database snapshot")
+    parser.add_argument("--output", default=SAMPLE_SNAPSHOT_PATH, help="Snapshot file to write")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = str(Path(workdir) / "bevco_dashboard.db")
+        # No snapshot to restore from: always generate and seed from scratch
+        prepare_database(database_path, snapshot_path=None)
+        size = build_snapshot(database_path, args.output)
+
+    print(f"✅ Sample snapshot written to {args.output} ({size / 1024:.0f} KB)")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
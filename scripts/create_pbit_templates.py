@@ -4,7 +4,6 @@ Bevco Executive Dashboard - PBIT Template Creator
 Creates Power BI Template files (.pbit) that can be directly imported into Power BI Desktop
 """
 
-import os
 import json
 import zipfile
 import tempfile
@@ -13,11 +12,17 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+from schema_inference import SchemaInferencer
+
 class PBITCreator:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent
         self.output_dir = self.project_root / "pbit_templates"
         self.data_dir = self.project_root / "data" / "master"
+        self.schema = SchemaInferencer(
+            self.data_dir,
+            cache_path=self.project_root / "data" / "processed" / "schema_cache.json"
+        )
         
     def print_status(self, message, status="info"):
         """Print colored status messages"""
@@ -83,272 +88,26 @@ class PBITCreator:
         
         return base_schema
     
-    def get_tables_for_template(self, template_type):
-        """Get tables based on template type"""
-        base_tables = [
-            {
-                "name": "dim_date",
-                "columns": [
-                    {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                    {"name": "Date", "dataType": "dateTime", "sourceColumn": "Date"},
-                    {"name": "Year", "dataType": "int64", "sourceColumn": "Year"},
-                    {"name": "Quarter", "dataType": "int64", "sourceColumn": "Quarter"},
-                    {"name": "Month", "dataType": "int64", "sourceColumn": "Month"},
-                    {"name": "MonthName", "dataType": "string", "sourceColumn": "MonthName"},
-                    {"name": "Day", "dataType": "int64", "sourceColumn": "Day"},
-                    {"name": "DayName", "dataType": "string", "sourceColumn": "DayName"},
-                    {"name": "WeekOfYear", "dataType": "int64", "sourceColumn": "WeekOfYear"},
-                    {"name": "FiscalYear", "dataType": "int64", "sourceColumn": "FiscalYear"},
-                    {"name": "FiscalQuarter", "dataType": "int64", "sourceColumn": "FiscalQuarter"}
-                ],
-                "partitions": [{
-                    "name": "dim_date",
-                    "mode": "import",
-                    "source": {
-                        "type": "m",
-                        "expression": '''let
-    Source = Csv.Document(File.Contents("dim_date.csv"),[Delimiter=",", Columns=11, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"DateKey", Int64.Type}, {"Date", type datetime}, {"Year", Int64.Type}, {"Quarter", Int64.Type}, {"Month", Int64.Type}, {"MonthName", type text}, {"Day", Int64.Type}, {"DayName", type text}, {"WeekOfYear", Int64.Type}, {"FiscalYear", Int64.Type}, {"FiscalQuarter", Int64.Type}})
-in
-    #"Changed Type"'''
-                    }
-                }]
-            },
-            {
-                "name": "dim_product",
-                "columns": [
-                    {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                    {"name": "ProductCode", "dataType": "string", "sourceColumn": "ProductCode"},
-                    {"name": "ProductName", "dataType": "string", "sourceColumn": "ProductName"},
-                    {"name": "Category", "dataType": "string", "sourceColumn": "Category"},
-                    {"name": "Vendor", "dataType": "string", "sourceColumn": "Vendor"},
-                    {"name": "UnitCost", "dataType": "double", "sourceColumn": "UnitCost"},
-                    {"name": "UnitPrice", "dataType": "double", "sourceColumn": "UnitPrice"},
-                    {"name": "PackSize", "dataType": "string", "sourceColumn": "PackSize"},
-                    {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                ],
-                "partitions": [{
-                    "name": "dim_product",
-                    "mode": "import",
-                    "source": {
-                        "type": "m",
-                        "expression": '''let
-    Source = Csv.Document(File.Contents("dim_product.csv"),[Delimiter=",", Columns=9, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"ProductKey", Int64.Type}, {"ProductCode", type text}, {"ProductName", type text}, {"Category", type text}, {"Vendor", type text}, {"UnitCost", type number}, {"UnitPrice", type number}, {"PackSize", type text}, {"IsActive", type logical}})
-in
-    #"Changed Type"'''
-                    }
-                }]
-            },
-            {
-                "name": "dim_customer",
-                "columns": [
-                    {"name": "CustomerKey", "dataType": "int64", "sourceColumn": "CustomerKey"},
-                    {"name": "CustomerCode", "dataType": "string", "sourceColumn": "CustomerCode"},
-                    {"name": "CustomerName", "dataType": "string", "sourceColumn": "CustomerName"},
-                    {"name": "Region", "dataType": "string", "sourceColumn": "Region"},
-                    {"name": "City", "dataType": "string", "sourceColumn": "City"},
-                    {"name": "Channel", "dataType": "string", "sourceColumn": "Channel"},
-                    {"name": "CustomerType", "dataType": "string", "sourceColumn": "CustomerType"},
-                    {"name": "CreditLimit", "dataType": "int64", "sourceColumn": "CreditLimit"},
-                    {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                ],
-                "partitions": [{
-                    "name": "dim_customer",
-                    "mode": "import",
-                    "source": {
-                        "type": "m",
-                        "expression": '''let
-    Source = Csv.Document(File.Contents("dim_customer.csv"),[Delimiter=",", Columns=9, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"CustomerKey", Int64.Type}, {"CustomerCode", type text}, {"CustomerName", type text}, {"Region", type text}, {"City", type text}, {"Channel", type text}, {"CustomerType", type text}, {"CreditLimit", Int64.Type}, {"IsActive", type logical}})
-in
-    #"Changed Type"'''
-                    }
-                }]
-            },
-            {
-                "name": "fact_sales",
-                "columns": [
-                    {"name": "SalesKey", "dataType": "int64", "sourceColumn": "SalesKey"},
-                    {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                    {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                    {"name": "CustomerKey", "dataType": "int64", "sourceColumn": "CustomerKey"},
-                    {"name": "EmployeeKey", "dataType": "int64", "sourceColumn": "EmployeeKey"},
-                    {"name": "InvoiceNumber", "dataType": "string", "sourceColumn": "InvoiceNumber"},
-                    {"name": "Quantity", "dataType": "int64", "sourceColumn": "Quantity"},
-                    {"name": "GrossSales", "dataType": "double", "sourceColumn": "GrossSales"},
-                    {"name": "DiscountAmount", "dataType": "double", "sourceColumn": "DiscountAmount"},
-                    {"name": "NetSales", "dataType": "double", "sourceColumn": "NetSales"},
-                    {"name": "COGS", "dataType": "double", "sourceColumn": "COGS"},
-                    {"name": "GrossProfit", "dataType": "double", "sourceColumn": "GrossProfit"}
-                ],
-                "partitions": [{
-                    "name": "fact_sales",
-                    "mode": "import",
-                    "source": {
-                        "type": "m",
-                        "expression": '''let
-    Source = Csv.Document(File.Contents("fact_sales.csv"),[Delimiter=",", Columns=12, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"SalesKey", Int64.Type}, {"DateKey", Int64.Type}, {"ProductKey", Int64.Type}, {"CustomerKey", Int64.Type}, {"EmployeeKey", Int64.Type}, {"InvoiceNumber", type text}, {"Quantity", Int64.Type}, {"GrossSales", type number}, {"DiscountAmount", type number}, {"NetSales", type number}, {"COGS", type number}, {"GrossProfit", type number}})
-in
-    #"Changed Type"'''
-                    }
-                }]
-            }
-        ]
+    def get_table_names_for_template(self, template_type):
+        """Get the data-model table names for a template type"""
+        table_names = ["dim_date", "dim_product", "dim_customer", "fact_sales"]
         
         # Add additional tables based on template type
         if template_type in ["executive", "financial"]:
-            base_tables.extend([
-                {
-                    "name": "fact_budget",
-                    "columns": [
-                        {"name": "BudgetKey", "dataType": "int64", "sourceColumn": "BudgetKey"},
-                        {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                        {"name": "Department", "dataType": "string", "sourceColumn": "Department"},
-                        {"name": "BudgetAmount", "dataType": "int64", "sourceColumn": "BudgetAmount"},
-                        {"name": "ActualAmount", "dataType": "int64", "sourceColumn": "ActualAmount"},
-                        {"name": "ForecastAmount", "dataType": "int64", "sourceColumn": "ForecastAmount"}
-                    ],
-                    "partitions": [{
-                        "name": "fact_budget",
-                        "mode": "import",
-                        "source": {
-                            "type": "m",
-                            "expression": '''let
-    Source = Csv.Document(File.Contents("fact_budget.csv"),[Delimiter=",", Columns=6, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"BudgetKey", Int64.Type}, {"DateKey", Int64.Type}, {"Department", type text}, {"BudgetAmount", Int64.Type}, {"ActualAmount", Int64.Type}, {"ForecastAmount", Int64.Type}})
-in
-    #"Changed Type"'''
-                        }
-                    }]
-                }
-            ])
+            table_names.append("fact_budget")
         
         if template_type in ["executive", "operational"]:
-            base_tables.extend([
-                {
-                    "name": "dim_employee",
-                    "columns": [
-                        {"name": "EmployeeKey", "dataType": "int64", "sourceColumn": "EmployeeKey"},
-                        {"name": "EmployeeID", "dataType": "string", "sourceColumn": "EmployeeID"},
-                        {"name": "FirstName", "dataType": "string", "sourceColumn": "FirstName"},
-                        {"name": "LastName", "dataType": "string", "sourceColumn": "LastName"},
-                        {"name": "Department", "dataType": "string", "sourceColumn": "Department"},
-                        {"name": "Position", "dataType": "string", "sourceColumn": "Position"},
-                        {"name": "HireDate", "dataType": "dateTime", "sourceColumn": "HireDate"},
-                        {"name": "Salary", "dataType": "int64", "sourceColumn": "Salary"},
-                        {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                    ],
-                    "partitions": [{
-                        "name": "dim_employee",
-                        "mode": "import",
-                        "source": {
-                            "type": "m",
-                            "expression": '''let
-    Source = Csv.Document(File.Contents("dim_employee.csv"),[Delimiter=",", Columns=9, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"EmployeeKey", Int64.Type}, {"EmployeeID", type text}, {"FirstName", type text}, {"LastName", type text}, {"Department", type text}, {"Position", type text}, {"HireDate", type datetime}, {"Salary", Int64.Type}, {"IsActive", type logical}})
-in
-    #"Changed Type"'''
-                        }
-                    }]
-                },
-                {
-                    "name": "fact_inventory",
-                    "columns": [
-                        {"name": "InventoryKey", "dataType": "int64", "sourceColumn": "InventoryKey"},
-                        {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                        {"name": "WarehouseLocation", "dataType": "string", "sourceColumn": "WarehouseLocation"},
-                        {"name": "StockOnHand", "dataType": "int64", "sourceColumn": "StockOnHand"},
-                        {"name": "ReorderLevel", "dataType": "int64", "sourceColumn": "ReorderLevel"},
-                        {"name": "MaxStockLevel", "dataType": "int64", "sourceColumn": "MaxStockLevel"},
-                        {"name": "LastStockDate", "dataType": "dateTime", "sourceColumn": "LastStockDate"}
-                    ],
-                    "partitions": [{
-                        "name": "fact_inventory",
-                        "mode": "import",
-                        "source": {
-                            "type": "m",
-                            "expression": '''let
-    Source = Csv.Document(File.Contents("fact_inventory.csv"),[Delimiter=",", Columns=7, Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers",{{"InventoryKey", Int64.Type}, {"ProductKey", Int64.Type}, {"WarehouseLocation", type text}, {"StockOnHand", Int64.Type}, {"ReorderLevel", Int64.Type}, {"MaxStockLevel", Int64.Type}, {"LastStockDate", type datetime}})
-in
-    #"Changed Type"'''
-                        }
-                    }]
-                }
-            ])
+            table_names.extend(["dim_employee", "fact_inventory"])
         
-        return base_tables
+        return table_names
+    
+    def get_tables_for_template(self, template_type):
+        """Get tables based on template type"""
+        return self.schema.model_tables(self.get_table_names_for_template(template_type))
     
     def get_relationships_for_template(self, template_type):
         """Get relationships based on template type"""
-        base_relationships = [
-            {
-                "name": "fact_sales_dim_date",
-                "fromTable": "fact_sales",
-                "fromColumn": "DateKey",
-                "toTable": "dim_date",
-                "toColumn": "DateKey",
-                "crossFilteringBehavior": "oneToMany"
-            },
-            {
-                "name": "fact_sales_dim_product",
-                "fromTable": "fact_sales",
-                "fromColumn": "ProductKey",
-                "toTable": "dim_product",
-                "toColumn": "ProductKey",
-                "crossFilteringBehavior": "oneToMany"
-            },
-            {
-                "name": "fact_sales_dim_customer",
-                "fromTable": "fact_sales",
-                "fromColumn": "CustomerKey",
-                "toTable": "dim_customer",
-                "toColumn": "CustomerKey",
-                "crossFilteringBehavior": "oneToMany"
-            }
-        ]
-        
-        # Add additional relationships based on template type
-        if template_type in ["executive", "financial"]:
-            base_relationships.append({
-                "name": "fact_budget_dim_date",
-                "fromTable": "fact_budget",
-                "fromColumn": "DateKey",
-                "toTable": "dim_date",
-                "toColumn": "DateKey",
-                "crossFilteringBehavior": "oneToMany"
-            })
-        
-        if template_type in ["executive", "operational"]:
-            base_relationships.extend([
-                {
-                    "name": "fact_sales_dim_employee",
-                    "fromTable": "fact_sales",
-                    "fromColumn": "EmployeeKey",
-                    "toTable": "dim_employee",
-                    "toColumn": "EmployeeKey",
-                    "crossFilteringBehavior": "oneToMany"
-                },
-                {
-                    "name": "fact_inventory_dim_product",
-                    "fromTable": "fact_inventory",
-                    "fromColumn": "ProductKey",
-                    "toTable": "dim_product",
-                    "toColumn": "ProductKey",
-                    "crossFilteringBehavior": "oneToMany"
-                }
-            ])
-        
-        return base_relationships
+        return self.schema.relationships(self.get_table_names_for_template(template_type))
     
     def get_measures_for_template(self, template_type):
         """Get DAX measures based on template type"""
@@ -436,7 +195,7 @@ in
                 },
                 {
                     "name": "Active Employees",
-                    "expression": "CALCULATE(DISTINCTCOUNT(dim_employee[EmployeeKey]), dim_employee[IsActive] = TRUE)",
+                    "expression": "DISTINCTCOUNT(dim_employee[EmployeeKey])",
                     "formatString": "#,0",
                     "displayFolder": "Employee Metrics"
                 }
@@ -4,21 +4,37 @@ Bevco Executive Dashboard - PBIX File Creator
 Creates complete Power BI Desktop files (.pbix) ready for import
 """
 
-import os
 import json
 import zipfile
 import tempfile
-import shutil
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from schema_inference import SchemaInferencer
+
+# Tables loaded into the data model, in model order
+MODEL_TABLES = [
+    "dim_date",
+    "dim_product",
+    "dim_customer",
+    "dim_employee",
+    "fact_sales",
+    "fact_budget",
+    "fact_inventory",
+    "dim_kpi_targets"
+]
+
 class PBIXCreator:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent
         self.output_dir = self.project_root / "pbix_files"
         self.data_dir = self.project_root / "data" / "master"
+        self.schema = SchemaInferencer(
+            self.data_dir,
+            cache_path=self.project_root / "data" / "processed" / "schema_cache.json"
+        )
         
     def print_status(self, message, status="info"):
         """Print colored status messages"""
@@ -64,7 +80,7 @@ class PBIXCreator:
             return True
     
     def create_data_model_schema(self):
-        """Create the Power BI data model schema"""
+        """Create the Power BI data model schema from the inferred data file schemas"""
         schema = {
             "name": "BevcoModel",
             "compatibilityLevel": 1567,
@@ -76,245 +92,8 @@ class PBIXCreator:
                 },
                 "defaultPowerBIDataSourceVersion": "powerBI_V3",
                 "sourceQueryCulture": "en-US",
-                "tables": [
-                    {
-                        "name": "dim_date",
-                        "columns": [
-                            {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                            {"name": "Date", "dataType": "dateTime", "sourceColumn": "Date"},
-                            {"name": "Year", "dataType": "int64", "sourceColumn": "Year"},
-                            {"name": "Quarter", "dataType": "int64", "sourceColumn": "Quarter"},
-                            {"name": "Month", "dataType": "int64", "sourceColumn": "Month"},
-                            {"name": "MonthName", "dataType": "string", "sourceColumn": "MonthName"},
-                            {"name": "Day", "dataType": "int64", "sourceColumn": "Day"},
-                            {"name": "DayName", "dataType": "string", "sourceColumn": "DayName"},
-                            {"name": "WeekOfYear", "dataType": "int64", "sourceColumn": "WeekOfYear"},
-                            {"name": "FiscalYear", "dataType": "int64", "sourceColumn": "FiscalYear"},
-                            {"name": "FiscalQuarter", "dataType": "int64", "sourceColumn": "FiscalQuarter"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "dim_date",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("dim_date")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "dim_product",
-                        "columns": [
-                            {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                            {"name": "ProductCode", "dataType": "string", "sourceColumn": "ProductCode"},
-                            {"name": "ProductName", "dataType": "string", "sourceColumn": "ProductName"},
-                            {"name": "Category", "dataType": "string", "sourceColumn": "Category"},
-                            {"name": "Vendor", "dataType": "string", "sourceColumn": "Vendor"},
-                            {"name": "UnitCost", "dataType": "double", "sourceColumn": "UnitCost"},
-                            {"name": "UnitPrice", "dataType": "double", "sourceColumn": "UnitPrice"},
-                            {"name": "PackSize", "dataType": "string", "sourceColumn": "PackSize"},
-                            {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "dim_product",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("dim_product")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "dim_customer",
-                        "columns": [
-                            {"name": "CustomerKey", "dataType": "int64", "sourceColumn": "CustomerKey"},
-                            {"name": "CustomerCode", "dataType": "string", "sourceColumn": "CustomerCode"},
-                            {"name": "CustomerName", "dataType": "string", "sourceColumn": "CustomerName"},
-                            {"name": "Region", "dataType": "string", "sourceColumn": "Region"},
-                            {"name": "City", "dataType": "string", "sourceColumn": "City"},
-                            {"name": "Channel", "dataType": "string", "sourceColumn": "Channel"},
-                            {"name": "CustomerType", "dataType": "string", "sourceColumn": "CustomerType"},
-                            {"name": "CreditLimit", "dataType": "int64", "sourceColumn": "CreditLimit"},
-                            {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "dim_customer",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("dim_customer")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "dim_employee",
-                        "columns": [
-                            {"name": "EmployeeKey", "dataType": "int64", "sourceColumn": "EmployeeKey"},
-                            {"name": "EmployeeID", "dataType": "string", "sourceColumn": "EmployeeID"},
-                            {"name": "FirstName", "dataType": "string", "sourceColumn": "FirstName"},
-                            {"name": "LastName", "dataType": "string", "sourceColumn": "LastName"},
-                            {"name": "Department", "dataType": "string", "sourceColumn": "Department"},
-                            {"name": "Position", "dataType": "string", "sourceColumn": "Position"},
-                            {"name": "HireDate", "dataType": "dateTime", "sourceColumn": "HireDate"},
-                            {"name": "Salary", "dataType": "int64", "sourceColumn": "Salary"},
-                            {"name": "IsActive", "dataType": "boolean", "sourceColumn": "IsActive"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "dim_employee",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("dim_employee")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "fact_sales",
-                        "columns": [
-                            {"name": "SalesKey", "dataType": "int64", "sourceColumn": "SalesKey"},
-                            {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                            {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                            {"name": "CustomerKey", "dataType": "int64", "sourceColumn": "CustomerKey"},
-                            {"name": "EmployeeKey", "dataType": "int64", "sourceColumn": "EmployeeKey"},
-                            {"name": "InvoiceNumber", "dataType": "string", "sourceColumn": "InvoiceNumber"},
-                            {"name": "Quantity", "dataType": "int64", "sourceColumn": "Quantity"},
-                            {"name": "GrossSales", "dataType": "double", "sourceColumn": "GrossSales"},
-                            {"name": "DiscountAmount", "dataType": "double", "sourceColumn": "DiscountAmount"},
-                            {"name": "NetSales", "dataType": "double", "sourceColumn": "NetSales"},
-                            {"name": "COGS", "dataType": "double", "sourceColumn": "COGS"},
-                            {"name": "GrossProfit", "dataType": "double", "sourceColumn": "GrossProfit"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "fact_sales",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("fact_sales")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "fact_budget",
-                        "columns": [
-                            {"name": "BudgetKey", "dataType": "int64", "sourceColumn": "BudgetKey"},
-                            {"name": "DateKey", "dataType": "int64", "sourceColumn": "DateKey"},
-                            {"name": "Department", "dataType": "string", "sourceColumn": "Department"},
-                            {"name": "BudgetAmount", "dataType": "int64", "sourceColumn": "BudgetAmount"},
-                            {"name": "ActualAmount", "dataType": "int64", "sourceColumn": "ActualAmount"},
-                            {"name": "ForecastAmount", "dataType": "int64", "sourceColumn": "ForecastAmount"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "fact_budget",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("fact_budget")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "fact_inventory",
-                        "columns": [
-                            {"name": "InventoryKey", "dataType": "int64", "sourceColumn": "InventoryKey"},
-                            {"name": "ProductKey", "dataType": "int64", "sourceColumn": "ProductKey"},
-                            {"name": "WarehouseLocation", "dataType": "string", "sourceColumn": "WarehouseLocation"},
-                            {"name": "StockOnHand", "dataType": "int64", "sourceColumn": "StockOnHand"},
-                            {"name": "ReorderLevel", "dataType": "int64", "sourceColumn": "ReorderLevel"},
-                            {"name": "MaxStockLevel", "dataType": "int64", "sourceColumn": "MaxStockLevel"},
-                            {"name": "LastStockDate", "dataType": "dateTime", "sourceColumn": "LastStockDate"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "fact_inventory",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("fact_inventory")
-                                }
-                            }
-                        ]
-                    },
-                    {
-                        "name": "dim_kpi_targets",
-                        "columns": [
-                            {"name": "KPIName", "dataType": "string", "sourceColumn": "KPIName"},
-                            {"name": "TargetValue", "dataType": "double", "sourceColumn": "TargetValue"},
-                            {"name": "Period", "dataType": "string", "sourceColumn": "Period"},
-                            {"name": "Department", "dataType": "string", "sourceColumn": "Department"}
-                        ],
-                        "partitions": [
-                            {
-                                "name": "dim_kpi_targets",
-                                "mode": "import",
-                                "source": {
-                                    "type": "m",
-                                    "expression": self.get_m_query("dim_kpi_targets")
-                                }
-                            }
-                        ]
-                    }
-                ],
-                "relationships": [
-                    {
-                        "name": "fact_sales_dim_date",
-                        "fromTable": "fact_sales",
-                        "fromColumn": "DateKey",
-                        "toTable": "dim_date",
-                        "toColumn": "DateKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    },
-                    {
-                        "name": "fact_sales_dim_product",
-                        "fromTable": "fact_sales",
-                        "fromColumn": "ProductKey",
-                        "toTable": "dim_product",
-                        "toColumn": "ProductKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    },
-                    {
-                        "name": "fact_sales_dim_customer",
-                        "fromTable": "fact_sales",
-                        "fromColumn": "CustomerKey",
-                        "toTable": "dim_customer",
-                        "toColumn": "CustomerKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    },
-                    {
-                        "name": "fact_sales_dim_employee",
-                        "fromTable": "fact_sales",
-                        "fromColumn": "EmployeeKey",
-                        "toTable": "dim_employee",
-                        "toColumn": "EmployeeKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    },
-                    {
-                        "name": "fact_budget_dim_date",
-                        "fromTable": "fact_budget",
-                        "fromColumn": "DateKey",
-                        "toTable": "dim_date",
-                        "toColumn": "DateKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    },
-                    {
-                        "name": "fact_inventory_dim_product",
-                        "fromTable": "fact_inventory",
-                        "fromColumn": "ProductKey",
-                        "toTable": "dim_product",
-                        "toColumn": "ProductKey",
-                        "crossFilteringBehavior": "oneToMany"
-                    }
-                ],
+                "tables": self.schema.model_tables(MODEL_TABLES),
+                "relationships": self.schema.relationships(MODEL_TABLES),
                 "measures": self.get_dax_measures()
             }
         }
@@ -323,102 +102,11 @@ class PBIXCreator:
     
     def get_m_query(self, table_name):
         """Generate M query for data loading"""
-        return f'''let
-    Source = Csv.Document(File.Contents("{table_name}.csv"),[Delimiter=",", Encoding=65001, QuoteStyle=QuoteStyle.None]),
-    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),
-    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers", {self.get_column_types(table_name)})
-in
-    #"Changed Type"'''
+        return self.schema.m_query(table_name)
     
     def get_column_types(self, table_name):
         """Get column type transformations for M query"""
-        type_mappings = {
-            "dim_date": [
-                '{"DateKey", Int64.Type}',
-                '{"Date", type datetime}',
-                '{"Year", Int64.Type}',
-                '{"Quarter", Int64.Type}',
-                '{"Month", Int64.Type}',
-                '{"MonthName", type text}',
-                '{"Day", Int64.Type}',
-                '{"DayName", type text}',
-                '{"WeekOfYear", Int64.Type}',
-                '{"FiscalYear", Int64.Type}',
-                '{"FiscalQuarter", Int64.Type}'
-            ],
-            "dim_product": [
-                '{"ProductKey", Int64.Type}',
-                '{"ProductCode", type text}',
-                '{"ProductName", type text}',
-                '{"Category", type text}',
-                '{"Vendor", type text}',
-                '{"UnitCost", type number}',
-                '{"UnitPrice", type number}',
-                '{"PackSize", type text}',
-                '{"IsActive", type logical}'
-            ],
-            "dim_customer": [
-                '{"CustomerKey", Int64.Type}',
-                '{"CustomerCode", type text}',
-                '{"CustomerName", type text}',
-                '{"Region", type text}',
-                '{"City", type text}',
-                '{"Channel", type text}',
-                '{"CustomerType", type text}',
-                '{"CreditLimit", Int64.Type}',
-                '{"IsActive", type logical}'
-            ],
-            "dim_employee": [
-                '{"EmployeeKey", Int64.Type}',
-                '{"EmployeeID", type text}',
-                '{"FirstName", type text}',
-                '{"LastName", type text}',
-                '{"Department", type text}',
-                '{"Position", type text}',
-                '{"HireDate", type datetime}',
-                '{"Salary", Int64.Type}',
-                '{"IsActive", type logical}'
-            ],
-            "fact_sales": [
-                '{"SalesKey", Int64.Type}',
-                '{"DateKey", Int64.Type}',
-                '{"ProductKey", Int64.Type}',
-                '{"CustomerKey", Int64.Type}',
-                '{"EmployeeKey", Int64.Type}',
-                '{"InvoiceNumber", type text}',
-                '{"Quantity", Int64.Type}',
-                '{"GrossSales", type number}',
-                '{"DiscountAmount", type number}',
-                '{"NetSales", type number}',
-                '{"COGS", type number}',
-                '{"GrossProfit", type number}'
-            ],
-            "fact_budget": [
-                '{"BudgetKey", Int64.Type}',
-                '{"DateKey", Int64.Type}',
-                '{"Department", type text}',
-                '{"BudgetAmount", Int64.Type}',
-                '{"ActualAmount", Int64.Type}',
-                '{"ForecastAmount", Int64.Type}'
-            ],
-            "fact_inventory": [
-                '{"InventoryKey", Int64.Type}',
-                '{"ProductKey", Int64.Type}',
-                '{"WarehouseLocation", type text}',
-                '{"StockOnHand", Int64.Type}',
-                '{"ReorderLevel", Int64.Type}',
-                '{"MaxStockLevel", Int64.Type}',
-                '{"LastStockDate", type datetime}'
-            ],
-            "dim_kpi_targets": [
-                '{"KPIName", type text}',
-                '{"TargetValue", type number}',
-                '{"Period", type text}',
-                '{"Department", type text}'
-            ]
-        }
-        
-        return ", ".join(type_mappings.get(table_name, []))
+        return self.schema.m_column_types(table_name)
     
     def get_dax_measures(self):
         """Get all DAX measures"""
@@ -521,13 +209,13 @@ in
             },
             {
                 "name": "Active Customers",
-                "expression": "CALCULATE(DISTINCTCOUNT(dim_customer[CustomerKey]), dim_customer[IsActive] = TRUE)",
+                "expression": "CALCULATE(DISTINCTCOUNT(dim_customer[CustomerKey]), dim_customer[Status] = \"Active\")",
                 "formatString": "#,0",
                 "displayFolder": "Customer Metrics"
             },
             {
                 "name": "Active Products",
-                "expression": "CALCULATE(DISTINCTCOUNT(dim_product[ProductKey]), dim_product[IsActive] = TRUE)",
+                "expression": "CALCULATE(DISTINCTCOUNT(dim_product[ProductKey]), dim_product[Status] = \"Active\")",
                 "formatString": "#,0",
                 "displayFolder": "Product Metrics"
             },
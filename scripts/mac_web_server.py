@@ -4,13 +4,14 @@ Mac Web Server for Bevco Dashboard Import
 Serves the web-based import tool optimized for Mac users
 """
 
-import http.server
-import socketserver
 import os
 import webbrowser
 import sys
 from pathlib import Path
 
+from static_server import PROJECT_ROOT, StaticRequestHandler, StaticServer
+from xlsx_stream import EXPORT_PATH, export_workbook
+
 def main():
     # Change to the web-import directory
     web_dir = Path(__file__).parent.parent / "web-import"
@@ -24,27 +25,33 @@ def main():
     
     PORT = 8080
     
-    class MacHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-        def end_headers(self):
+    class MacHTTPRequestHandler(StaticRequestHandler):
+        # The generated CSV/XLSX data files are served under /data/
+        mounts = {'/data/': PROJECT_ROOT / "data"}
+        # The same files as one workbook, converted on the server
+        routes = {EXPORT_PATH: export_workbook}
+        extra_headers = {
             # Add CORS headers for better compatibility
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type',
             # Add Mac-specific headers
-            self.send_header('X-Content-Type-Options', 'nosniff')
-            self.send_header('X-Frame-Options', 'SAMEORIGIN')
-            super().end_headers()
+            'X-Content-Type-Options': 'nosniff',
+            'X-Frame-Options': 'SAMEORIGIN'
+        }
         
         def log_message(self, format, *args):
             # Custom logging for Mac
             print(f"🍎 {self.address_string()} - {format % args}")
     
     try:
-        with socketserver.TCPServer(("", PORT), MacHTTPRequestHandler) as httpd:
+        with StaticServer(("", PORT), MacHTTPRequestHandler) as httpd:
             print("🍎 Bevco Dashboard - Mac Web Import Server")
             print("=" * 50)
             print(f"🌐 Server running at: http://localhost:{PORT}")
             print(f"📁 Serving from: {web_dir}")
+            print(f"📊 Data files: http://localhost:{PORT}/data/master/")
+            print(f"📗 Excel workbook: http://localhost:{PORT}{EXPORT_PATH}")
             print()
             print("🚀 Features Available:")
             print("   • Generate sample data (36,400+ transactions)")
@@ -83,7 +90,7 @@ def main():
             # Try alternative ports
             for alt_port in [8081, 8082, 8083, 3000, 5000]:
                 try:
-                    with socketserver.TCPServer(("", alt_port), MacHTTPRequestHandler) as httpd:
+                    with StaticServer(("", alt_port), MacHTTPRequestHandler) as httpd:
                         print(f"✅ Using alternative port: {alt_port}")
                         print(f"🌐 Server running at: http://localhost:{alt_port}")
                         webbrowser.open(f'http://localhost:{alt_port}')
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Schema Inference
+Derives Power BI table schemas, M type conversions and relationships
+from the actual files in data/master instead of hard-coded column lists
+"""
+
+import csv
+import io
+import json
+import re
+from pathlib import Path
+
+# Power BI model data types and the matching M type used by TransformColumnTypes
+M_TYPES = {
+    "int64": "Int64.Type",
+    "double": "type number",
+    "dateTime": "type datetime",
+    "boolean": "type logical",
+    "string": "type text"
+}
+
+INT_PATTERN = re.compile(r"^[+-]?\d+$")
+FLOAT_PATTERN = re.compile(r"^[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?$")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+BOOLEAN_VALUES = {"true", "false"}
+
+# Largest integer Power BI can hold in an Int64 column
+INT64_MAX = 2 ** 63 - 1
+
+class SchemaInferencer:
+    def __init__(self, data_dir, cache_path=None, sample_rows=1000, tail_bytes=65536):
+        self.data_dir = Path(data_dir)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.sample_rows = sample_rows
+        self.tail_bytes = tail_bytes
+        self._cache = None
+
+    def load_cache(self):
+        """Load the fingerprint cache from disk once"""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path and self.cache_path.exists():
+                try:
+                    with open(self.cache_path, "r", encoding="utf-8") as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError):
+                    self._cache = {}
+        return self._cache
+
+    def save_cache(self):
+        """Persist the fingerprint cache"""
+        if not self.cache_path or self._cache is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, indent=2)
+
+    def fingerprint(self, path):
+        """Fingerprint a data file by size and modification time"""
+        stat = path.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}:{self.sample_rows}"
+
+    def find_table_file(self, table_name):
+        """Locate the data file for a table, preferring Parquet over CSV"""
+        for suffix in (".parquet", ".csv"):
+            path = self.data_dir / f"{table_name}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def table_names(self):
+        """List the tables available in the data directory"""
+        names = {path.stem for path in self.data_dir.glob("*.csv")}
+        names.update(path.stem for path in self.data_dir.glob("*.parquet"))
+        return sorted(names)
+
+    def infer_table(self, table_name):
+        """Infer the column schema of a single table, using the cache when the file is unchanged"""
+        path = self.find_table_file(table_name)
+        if path is None:
+            return None
+
+        cache = self.load_cache()
+        fingerprint = self.fingerprint(path)
+        cached = cache.get(table_name)
+        if cached and cached.get("fingerprint") == fingerprint and cached.get("file") == path.name:
+            return cached
+
+        if path.suffix == ".parquet":
+            columns = self.infer_parquet_columns(path)
+        else:
+            columns = self.infer_csv_columns(path)
+
+        entry = {
+            "file": path.name,
+            "fingerprint": fingerprint,
+            "columns": columns
+        }
+        cache[table_name] = entry
+        self.save_cache()
+        return entry
+
+    def infer_csv_columns(self, path):
+        """Infer column types from the CSV header and a bounded head and tail row sample"""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            rows = []
+            for row in reader:
+                rows.append(row)
+                if len(rows) >= self.sample_rows:
+                    break
+            head_exhausted = len(rows) < self.sample_rows
+
+        # Sample the end of large files too, so late-appearing blanks or
+        # decimals are not missed by a head-only scan
+        if not head_exhausted:
+            rows.extend(self.read_tail_rows(path))
+
+        columns = []
+        for index, name in enumerate(header):
+            values = [row[index] for row in rows if index < len(row)]
+            columns.append({"name": name, "dataType": self.infer_type(values)})
+        return columns
+
+    def read_tail_rows(self, path):
+        """Read the complete rows contained in the last tail_bytes of a file"""
+        with open(path, "rb") as f:
+            f.seek(0, io.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - self.tail_bytes))
+            block = f.read().decode("utf-8", errors="ignore")
+
+        # Drop the first, possibly partial, line
+        lines = block.splitlines()[1:]
+        return list(csv.reader(lines))[-self.sample_rows:]
+
+    def infer_parquet_columns(self, path):
+        """Read column types from Parquet metadata without scanning rows"""
+        try:
+            import pyarrow.parquet as pq
+            import pyarrow.types as pat
+        except ImportError:
+            raise RuntimeError(f"pyarrow is required to read {path.name}")
+
+        columns = []
+        for field in pq.read_schema(path):
+            if pat.is_boolean(field.type):
+                data_type = "boolean"
+            elif pat.is_integer(field.type):
+                data_type = "int64"
+            elif pat.is_floating(field.type) or pat.is_decimal(field.type):
+                data_type = "double"
+            elif pat.is_timestamp(field.type) or pat.is_date(field.type):
+                data_type = "dateTime"
+            else:
+                data_type = "string"
+            columns.append({"name": field.name, "dataType": data_type})
+        return columns
+
+    def infer_type(self, values):
+        """Pick the narrowest Power BI type that every non-empty sample value converts to"""
+        values = [value.strip() for value in values if value and value.strip()]
+        if not values:
+            return "string"
+
+        if all(value.lower() in BOOLEAN_VALUES for value in values):
+            return "boolean"
+        if all(INT_PATTERN.match(value) and abs(int(value)) <= INT64_MAX for value in values):
+            return "int64"
+        if all(FLOAT_PATTERN.match(value) for value in values):
+            return "double"
+        if all(DATE_PATTERN.match(value) for value in values):
+            return "dateTime"
+        return "string"
+
+    def model_columns(self, table_name):
+        """Get the data-model column definitions for a table"""
+        entry = self.infer_table(table_name)
+        if entry is None:
+            return []
+        return [
+            {"name": column["name"], "dataType": column["dataType"], "sourceColumn": column["name"]}
+            for column in entry["columns"]
+        ]
+
+    def m_column_types(self, table_name):
+        """Get the TransformColumnTypes list for a table's M query"""
+        entry = self.infer_table(table_name)
+        if entry is None:
+            return ""
+        return ", ".join(
+            f'{{"{column["name"]}", {M_TYPES[column["dataType"]]}}}'
+            for column in entry["columns"]
+        )
+
+    def m_query(self, table_name):
+        """Generate the M query that loads a table with its inferred column types"""
+        entry = self.infer_table(table_name)
+        if entry is None:
+            return ""
+
+        if entry["file"].endswith(".parquet"):
+            source = f'Parquet.Document(File.Contents("{entry["file"]}"))'
+            promoted = "Source"
+        else:
+            source = (
+                f'Csv.Document(File.Contents("{entry["file"]}"),[Delimiter=",", '
+                f'Columns={len(entry["columns"])}, Encoding=65001, QuoteStyle=QuoteStyle.Csv])'
+            )
+            promoted = 'Table.PromoteHeaders(Source, [PromoteAllScalars=true])'
+
+        return f'''let
+    Source = {source},
+    #"Promoted Headers" = {promoted},
+    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers", {{{self.m_column_types(table_name)}}})
+in
+    #"Changed Type"'''
+
+    def model_table(self, table_name):
+        """Build a complete data-model table definition with its import partition"""
+        return {
+            "name": table_name,
+            "columns": self.model_columns(table_name),
+            "partitions": [
+                {
+                    "name": table_name,
+                    "mode": "import",
+                    "source": {
+                        "type": "m",
+                        "expression": self.m_query(table_name)
+                    }
+                }
+            ]
+        }
+
+    def model_tables(self, table_names=None):
+        """Build data-model tables for the given tables, or every table on disk"""
+        names = table_names if table_names is not None else self.table_names()
+        return [self.model_table(name) for name in names if self.find_table_file(name)]
+
+    def primary_key(self, table_name):
+        """Get a dimension's surrogate key: its first column when named *Key"""
+        entry = self.infer_table(table_name)
+        if not entry or not entry["columns"]:
+            return None
+        first = entry["columns"][0]
+        if first["name"].endswith("Key") and first["dataType"] == "int64":
+            return first["name"]
+        return None
+
+    def relationships(self, table_names=None):
+        """Infer fact-to-dimension relationships from matching surrogate key columns"""
+        names = table_names if table_names is not None else self.table_names()
+        names = [name for name in names if self.find_table_file(name)]
+
+        dimension_keys = {}
+        for name in names:
+            if name.startswith("dim_"):
+                key = self.primary_key(name)
+                if key:
+                    dimension_keys[key] = name
+
+        relationships = []
+        for name in names:
+            if not name.startswith("fact_"):
+                continue
+            own_key = self.primary_key(name)
+            for column in self.infer_table(name)["columns"]:
+                dimension = dimension_keys.get(column["name"])
+                if dimension and column["name"] != own_key:
+                    relationships.append({
+                        "name": f"{name}_{dimension}",
+                        "fromTable": name,
+                        "fromColumn": column["name"],
+                        "toTable": dimension,
+                        "toColumn": column["name"],
+                        "crossFilteringBehavior": "oneToMany"
+                    })
+        return relationships
+
+def main():
+    """Print the inferred schema for every table in data/master"""
+    project_root = Path(__file__).parent.parent
+    inferencer = SchemaInferencer(
+        project_root / "data" / "master",
+        cache_path=project_root / "data" / "processed" / "schema_cache.json"
+    )
+
+    for table_name in inferencer.table_names():
+        print(f"\n{table_name}")
+        for column in inferencer.infer_table(table_name)["columns"]:
+            print(f"   {column['name']:<20} {column['dataType']}")
+
+    print("\nRelationships")
+    for relationship in inferencer.relationships():
+        print(f"   {relationship['fromTable']}[{relationship['fromColumn']}] -> "
+              f"{relationship['toTable']}[{relationship['toColumn']}]")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
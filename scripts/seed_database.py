@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Database Seeder
+Creates a portal database filled with any number of generated sales rows,
+e.g. 10M-row databases for performance environments
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard_portal"))
+
+from database import prepare_database
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a portal database with generated sample data")
+    parser.add_argument("--database", default=str(Path(__file__).parent.parent / "dashboard_portal" / "data" / "bevco_dashboard.db"),
+                        help="Database file to create")
+    parser.add_argument("--rows", type=int, default=5000, help="Sales rows to generate")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+    parser.add_argument("--force", action="store_true", help="Replace an existing database")
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        if not args.force:
+            print(f"❌ {args.database} already exists; pass --force to replace it")
+            return 1
+        os.remove(args.database)
+
+    print(f"🌱 Seeding {args.rows:,} sales rows into {args.database}...")
+    start = time.perf_counter()
+    prepare_database(args.database, snapshot_path=None, rows=args.rows, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    conn = sqlite3.connect(args.database)
+    count = conn.execute('SELECT COUNT(*) FROM sales_data').fetchone()[0]
+    conn.close()
+
+    print(f"✅ {count:,} rows in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,12 +4,13 @@ Simple web server to serve the Power BI web tools locally
 Run this script and open http://localhost:8080 in your browser
 """
 
-import http.server
-import socketserver
 import os
 import webbrowser
 from pathlib import Path
 
+from static_server import PROJECT_ROOT, StaticRequestHandler, StaticServer
+from xlsx_stream import EXPORT_PATH, export_workbook
+
 def main():
     # Change to the web-import directory
     web_dir = Path(__file__).parent.parent / "powerbi" / "web-import"
@@ -17,20 +18,26 @@ def main():
     
     PORT = 8080
     
-    class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-        def end_headers(self):
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            super().end_headers()
+    class MyHTTPRequestHandler(StaticRequestHandler):
+        # The generated CSV/XLSX data files are served under /data/
+        mounts = {'/data/': PROJECT_ROOT / "data"}
+        # The same files as one workbook, converted on the server
+        routes = {EXPORT_PATH: export_workbook}
+        extra_headers = {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type'
+        }
     
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    with StaticServer(("", PORT), MyHTTPRequestHandler) as httpd:
         print(f"🚀 Bevco Dashboard Web Tools Server")
         print(f"📍 Serving at: http://localhost:{PORT}")
         print(f"📁 Directory: {web_dir}")
         print(f"\n🌐 Available Tools:")
         print(f"   • Implementation Guide: http://localhost:{PORT}/index.html")
         print(f"   • Online Converter: http://localhost:{PORT}/online-converter.html")
+        print(f"   • Data Files: http://localhost:{PORT}/data/master/")
+        print(f"   • Excel Workbook: http://localhost:{PORT}{EXPORT_PATH}")
         print(f"\n💡 Press Ctrl+C to stop the server")
         
         # Try to open browser automatically
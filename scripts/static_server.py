@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Static File Server
+Threaded static server shared by the web-import tool scripts: every request
+gets its own thread, text files go out as precompressed gzip (or brotli,
+when the brotli package is installed) copies, responses carry strong ETags
+and Cache-Control, byte ranges are honoured and file bodies are written
+with sendfile so large CSV/XLSX data files never pass through Python
+"""
+
+import email.utils
+import gzip
+import hashlib
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import urllib.parse
+from http import HTTPStatus
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Files smaller than this are not worth a compressed copy
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+def parse_range(header, size):
+    """Parse a single-range Range header into (start, end) inclusive
+
+    Returns None when the header is missing, malformed or asks for several
+    ranges (the full file is sent then) and False when it cannot be satisfied.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first == '':
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return False
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+class CompressedVariants:
+    """gzip and brotli copies of files kept in a cache directory, rebuilt when the source changes"""
+
+    SUFFIXES = {'br': 'br', 'gzip': 'gz'}
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or Path(tempfile.gettempdir()) / "bevco_static_cache")
+        self.lock = threading.Lock()
+        self.building = {}
+
+    def encodings(self):
+        """Encodings that can be produced here, most compact first"""
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def get(self, path, stat, encoding):
+        """Path of the compressed copy of a file, building it on first use"""
+        key = hashlib.sha1(os.path.realpath(path).encode('utf-8')).hexdigest()[:16]
+        suffix = self.SUFFIXES[encoding]
+        target = self.cache_dir / f"{key}-{stat.st_size:x}-{stat.st_mtime_ns:x}.{suffix}"
+        if target.exists():
+            return target
+
+        # One thread builds a given copy; the others wait for it
+        with self.lock:
+            lock = self.building.setdefault(target, threading.Lock())
+        with lock:
+            if not target.exists():
+                self.build(path, target, encoding)
+                for stale in self.cache_dir.glob(f"{key}-*.{suffix}"):
+                    if stale != target:
+                        stale.unlink(missing_ok=True)
+        with self.lock:
+            self.building.pop(target, None)
+        return target
+
+    def build(self, path, target, encoding):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f"{target.name}.{threading.get_ident()}.partial")
+        with open(path, 'rb') as source, open(partial, 'wb') as out:
+            if encoding == 'br':
+                compressor = brotli.Compressor(quality=11)
+                for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                    out.write(compressor.process(chunk))
+                out.write(compressor.finish())
+            else:
+                with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=9, mtime=0) as compressed:
+                    shutil.copyfileobj(source, compressed, 1024 * 1024)
+        os.replace(partial, target)
+
+class ChunkedWriter:
+    """Write-only file object sending what is written as HTTP/1.1 chunked transfer encoding"""
+
+    def __init__(self, wfile, chunk_size=64 * 1024):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self.wfile.write(b'%x\r\n' % len(self.buffer) + bytes(self.buffer) + b'\r\n')
+            self.buffer.clear()
+
+    def close(self):
+        """Send what is left and the terminating chunk"""
+        self.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+class StaticRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the current directory, plus any mounted directories, with compression, ETags and ranges"""
+
+    # Every response has a Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    # URL prefix -> directory served under it, e.g. {'/data/': PROJECT_ROOT / 'data'}
+    mounts = {}
+    # Headers added to every response
+    extra_headers = {}
+    # URL path -> function(handler) sending the whole response, for generated downloads
+    routes = {}
+    # Freshness for assets; HTML and mounted data files are always revalidated
+    max_age = 3600
+
+    def end_headers(self):
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        super().end_headers()
+
+    def do_GET(self):
+        route = self.routes.get(urllib.parse.urlsplit(self.path).path)
+        if route is not None:
+            route(self)
+        else:
+            super().do_GET()
+
+    def send_stream(self, content_type, filename=None):
+        """Start a 200 response whose body is streamed as it is produced; write to the returned writer, then close it"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        if filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        return ChunkedWriter(self.wfile)
+
+    def translate_path(self, path):
+        for prefix, root in self.mounts.items():
+            if path.startswith(prefix):
+                directory = self.directory
+                self.directory = str(root)
+                try:
+                    return super().translate_path('/' + path[len(prefix):])
+                finally:
+                    self.directory = directory
+        return super().translate_path(path)
+
+    def is_mounted(self):
+        return any(self.path.startswith(prefix) for prefix in self.mounts)
+
+    def cache_control(self, content_type):
+        if content_type == 'text/html' or self.is_mounted():
+            return 'no-cache'
+        return f'public, max-age={self.max_age}'
+
+    def accepted_encodings(self):
+        accepted = set()
+        for item in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = item.strip().partition(';')
+            if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(name.strip().lower())
+        return accepted
+
+    def choose_encoding(self, content_type, size):
+        if not is_compressible(content_type) or size < MIN_COMPRESS_SIZE:
+            return None
+        accepted = self.accepted_encodings()
+        for encoding in self.server.variants.encodings():
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def not_modified(self, etag, stat):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since.timestamp() >= int(stat.st_mtime)
+        return False
+
+    def send_head(self):
+        self.body_range = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            parts = urllib.parse.urlsplit(self.path)
+            if not parts.path.endswith('/'):
+                self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+                new_parts = (parts[0], parts[1], parts[2] + '/', parts[3], parts[4])
+                self.send_header('Location', urllib.parse.urlunsplit(new_parts))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+            for index in ('index.html', 'index.htm'):
+                index = os.path.join(path, index)
+                if os.path.isfile(index):
+                    path = index
+                    break
+            else:
+                return self.list_directory(path)
+        if path.endswith('/'):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            content_type = self.guess_type(path)
+            stat = os.fstat(f.fileno())
+            etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+            compressible = is_compressible(content_type)
+
+            # Ranges are served from the file itself, never from a compressed copy
+            range_header = self.headers.get('Range')
+            encoding = None if range_header else self.choose_encoding(content_type, stat.st_size)
+            if encoding is not None:
+                variant = self.server.variants.get(path, stat, encoding)
+                f.close()
+                f = open(variant, 'rb')
+                etag = f'{etag[:-1]}-{CompressedVariants.SUFFIXES[encoding]}"'
+
+            if self.not_modified(etag, stat):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', self.cache_control(content_type))
+                if compressible:
+                    self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                f.close()
+                return None
+
+            size = os.fstat(f.fileno()).st_size
+            status = HTTPStatus.OK
+            byte_range = None
+            if range_header and self.headers.get('If-Range', etag) == etag:
+                byte_range = parse_range(range_header, size)
+            if byte_range is False:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                f.close()
+                return None
+            start, end = byte_range or (0, size - 1)
+            if byte_range:
+                status = HTTPStatus.PARTIAL_CONTENT
+
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Last-Modified', self.date_time_string(stat.st_mtime))
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', self.cache_control(content_type))
+            self.send_header('Accept-Ranges', 'bytes')
+            if compressible:
+                self.send_header('Vary', 'Accept-Encoding')
+            if encoding is not None:
+                self.send_header('Content-Encoding', encoding)
+            if byte_range:
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            self.end_headers()
+            self.body_range = (start, end - start + 1)
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        if self.body_range is None:
+            # Directory listings and other in-memory bodies
+            return super().copyfile(source, outputfile)
+        offset, count = self.body_range
+        if count > 0:
+            # Headers are already flushed; the kernel copies the body
+            self.connection.sendfile(source, offset, count)
+
+class StaticServer(http.server.ThreadingHTTPServer):
+    """Thread-per-request HTTP server, so a slow download never holds up other users"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, RequestHandlerClass, cache_dir=None):
+        super().__init__(server_address, RequestHandlerClass)
+        self.variants = CompressedVariants(cache_dir)
+        threading.Thread(target=self.precompress, daemon=True).start()
+
+    def precompress(self):
+        """Build the compressed copies of every compressible file up front"""
+        handler = self.RequestHandlerClass
+        roots = [os.getcwd(), *[str(root) for root in handler.mounts.values()]]
+        for root in roots:
+            for directory, _, files in os.walk(root):
+                for name in files:
+                    path = os.path.join(directory, name)
+                    content_type = handler.guess_type(handler, path)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if not is_compressible(content_type) or stat.st_size < MIN_COMPRESS_SIZE:
+                        continue
+                    for encoding in self.variants.encodings():
+                        try:
+                            self.variants.get(path, stat, encoding)
+                        except OSError as e:
+                            print(f"⚠️  Could not precompress {path}: {e}")
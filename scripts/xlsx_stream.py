@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Bevco Executive Dashboard - Streaming XLSX Export
+Converts the master data CSV files into one Excel workbook on the server.
+The workbook's XML parts are written straight into a zip archive over the
+chunked response, one sheet entry at a time, as rows are read from their
+CSV file, so the download flows while the sheets are converted and memory
+stays flat however large a table is
+"""
+
+import csv
+import re
+import urllib.parse
+import zipfile
+from http import HTTPStatus
+from xml.sax.saxutils import escape, quoteattr
+
+from static_server import PROJECT_ROOT
+
+DATA_DIR = PROJECT_ROOT / "data" / "master"
+EXPORT_PATH = "/export/BevcoData.xlsx"
+
+TABLES = [
+    "dim_date", "dim_product", "dim_customer", "dim_employee",
+    "fact_sales", "fact_budget", "fact_inventory", "dim_kpi_targets"
+]
+
+XLSX_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Read buffer for the source files
+READ_BUFFER = 1024 * 1024
+# Rows of sheet XML joined per write to the zip entry
+ROWS_PER_WRITE = 500
+# A sheet whose XML may pass the 2 GiB zip limit needs a zip64 entry, which
+# has to be declared up front when the output cannot seek back
+ZIP64_SOURCE_SIZE = 256 * 1024 * 1024
+
+# Control characters XML 1.0 does not allow, dropped from text cells
+ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+ROOT_RELS = (
+    f'{XML_DECLARATION}<Relationships xmlns="{PACKAGE_NS}">'
+    f'<Relationship Id="rId1" Type="{RELATIONSHIP_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+# One font, fill, border and cell format: the defaults Excel expects to find
+STYLES = (
+    f'{XML_DECLARATION}<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+def cell_value(text):
+    """A CSV field as the number it holds, so Excel gets numeric cells; codes with leading zeros stay text"""
+    if not text:
+        return None
+    if text[0] not in "-0123456789." or (len(text) > 1 and text[0] == "0" and text[1] != "."):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+def available_tables(data_dir=DATA_DIR):
+    return [name for name in TABLES if (data_dir / f"{name}.csv").exists()]
+
+def column_letters(count):
+    """A, B, ... Z, AA, ... for the first count columns"""
+    letters = []
+    for index in range(1, count + 1):
+        name = ""
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            name = chr(65 + remainder) + name
+        letters.append(name)
+    return letters
+
+def text_cell(reference, text):
+    text = escape(ILLEGAL_CHARACTERS.sub("", text))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def row_xml(number, row, letters, convert=True):
+    cells = []
+    for letter, text in zip(letters, row):
+        value = cell_value(text) if convert else text or None
+        if value is None:
+            continue
+        reference = f"{letter}{number}"
+        if isinstance(value, str):
+            cells.append(text_cell(reference, value))
+        else:
+            cells.append(f'<c r="{reference}"><v>{value!r}</v></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+def package_parts(sheet_names):
+    """The workbook's fixed parts, given the sheets that follow: (zip name, XML)"""
+    sheets = range(1, len(sheet_names) + 1)
+    content_types = (
+        f'{XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        + "".join(f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                  'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                  for number in sheets)
+        + '</Types>'
+    )
+    workbook = (
+        f'{XML_DECLARATION}<workbook xmlns="{MAIN_NS}" xmlns:r="{RELATIONSHIP_NS}"><sheets>'
+        + "".join(f'<sheet name={quoteattr(name)} sheetId="{number}" r:id="rId{number}"/>'
+                  for number, name in zip(sheets, sheet_names))
+        + '</sheets></workbook>'
+    )
+    workbook_rels = (
+        f'{XML_DECLARATION}<Relationships xmlns="{PACKAGE_NS}">'
+        + "".join(f'<Relationship Id="rId{number}" Type="{RELATIONSHIP_NS}/worksheet" '
+                  f'Target="worksheets/sheet{number}.xml"/>' for number in sheets)
+        + f'<Relationship Id="rId{len(sheet_names) + 1}" Type="{RELATIONSHIP_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    return [
+        ("[Content_Types].xml", content_types),
+        ("_rels/.rels", ROOT_RELS),
+        ("xl/workbook.xml", workbook),
+        ("xl/_rels/workbook.xml.rels", workbook_rels),
+        ("xl/styles.xml", STYLES)
+    ]
+
+def write_sheet(entry, path):
+    """Write one CSV file as worksheet XML to an open zip entry, a few hundred rows per write"""
+    entry.write(f'{XML_DECLARATION}<worksheet xmlns="{MAIN_NS}"><sheetData>'.encode())
+    with open(path, newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is not None:
+            letters = column_letters(len(header))
+            # The header stays text even where a column name looks like a number
+            rows = [row_xml(1, header, letters, convert=False)]
+            for number, row in enumerate(reader, start=2):
+                if len(row) > len(letters):
+                    letters = column_letters(len(row))
+                rows.append(row_xml(number, row, letters))
+                if len(rows) >= ROWS_PER_WRITE:
+                    entry.write("".join(rows).encode())
+                    rows.clear()
+            entry.write("".join(rows).encode())
+    entry.write(b"</sheetData></worksheet>")
+
+def write_workbook(tables, stream, data_dir=DATA_DIR):
+    """Write the named tables as sheets of one workbook to stream, which need not be seekable
+
+    Compressed bytes reach stream while each sheet is converted; the zip's
+    central directory follows the last sheet.
+    """
+    # Sheet names are limited to 31 characters
+    sheet_names = [name[:31] for name in tables]
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for part, xml in package_parts(sheet_names):
+            archive.writestr(part, xml)
+        for number, name in enumerate(tables, start=1):
+            path = data_dir / f"{name}.csv"
+            force_zip64 = path.stat().st_size > ZIP64_SOURCE_SIZE
+            with archive.open(f"xl/worksheets/sheet{number}.xml", "w", force_zip64=force_zip64) as entry:
+                write_sheet(entry, path)
+
+def export_workbook(handler):
+    """Route for the static server: stream data/master as BevcoData.xlsx, optionally only ?tables=a,b"""
+    tables = available_tables()
+    if not tables:
+        handler.send_error(HTTPStatus.NOT_FOUND, f"No data files in {DATA_DIR}; run the ETL first")
+        return
+
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(handler.path).query)
+    if "tables" in query:
+        requested = [name for value in query["tables"] for name in value.split(",") if name]
+        unknown = [name for name in requested if name not in tables]
+        if unknown:
+            handler.send_error(HTTPStatus.NOT_FOUND, f"Unknown tables: {', '.join(unknown)}")
+            return
+        tables = requested
+
+    # The headers go out now and the zip follows as each sheet is converted
+    writer = handler.send_stream(XLSX_TYPE, filename="BevcoData.xlsx")
+    try:
+        write_workbook(tables, writer)
+        writer.close()
+    except Exception as e:
+        # The status line is already sent; dropping the connection marks the download as failed
+        handler.log_error("Excel export failed: %s", e)
+        handler.close_connection = True
@@ -7,8 +7,8 @@ The simplest way to start your dashboard - just run this file!
 import os
 import sys
 import subprocess
+import tempfile
 import webbrowser
-import time
 from pathlib import Path
 
 # Colors for terminal output
@@ -88,22 +88,33 @@ def start_dashboard():
     try:
         print_colored("\n⏳ Starting server (this may take a moment)...", Colors.BLUE)
         
-        # Start the Flask application
+        sys.path.insert(0, str(dashboard_dir))
+        from health import READY_FILE_ENV, wait_until_ready
+        ready_file = Path(tempfile.gettempdir()) / f"bevco_portal_ready_{os.getpid()}.json"
+        if ready_file.exists():
+            ready_file.unlink()
+        
+        # Start the Flask application; its output goes to a log file, since
+        # a pipe nobody reads fills up and stalls the server
+        log_path = Path(tempfile.gettempdir()) / f"bevco_portal_{os.getpid()}.log"
+        log_file = open(log_path, "w")
         process = subprocess.Popen([
             sys.executable, "app.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        ], stdout=log_file, stderr=subprocess.STDOUT,
+           env=dict(os.environ, **{READY_FILE_ENV: str(ready_file)}))
+        log_file.close()
         
-        # Wait a moment for server to start
-        time.sleep(4)
+        # Wait until the portal reports ready
+        ready, detail = wait_until_ready("http://localhost:5000", process, ready_file=str(ready_file))
         
-        # Check if process is still running
-        if process.poll() is None:
+        if ready:
             print_colored("\n" + "="*60, Colors.GREEN)
             print_colored("🎉 DASHBOARD IS RUNNING!", Colors.GREEN)
             print_colored("="*60, Colors.GREEN)
             print_colored("🌐 URL: http://localhost:5000", Colors.BOLD)
             print_colored("👤 Username: admin", Colors.BLUE)
             print_colored("🔑 Password: admin123", Colors.BLUE)
+            print_colored(f"📄 Server log: {log_path}", Colors.BLUE)
             print_colored("🤖 AI Chat: Click chat button (bottom-right)", Colors.BLUE)
             print_colored("="*60, Colors.GREEN)
             
@@ -131,11 +142,14 @@ def start_dashboard():
             
             return True
         else:
-            # Process failed to start
-            stdout, stderr = process.communicate()
-            print_colored("❌ Dashboard failed to start", Colors.RED)
-            if stderr:
-                print_colored(f"Error: {stderr}", Colors.RED)
+            # Process failed to start or never became ready
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+            output = log_path.read_text(errors="replace")
+            print_colored(f"❌ Dashboard failed to start: {detail}", Colors.RED)
+            if output:
+                print_colored(f"Error: {output[-500:]}", Colors.RED)
             return False
             
     except Exception as e:
@@ -7,8 +7,8 @@ Mac-optimized launcher that avoids pandas dependency issues
 import os
 import sys
 import subprocess
+import tempfile
 import webbrowser
-import time
 from pathlib import Path
 
 # Colors for Mac terminal
@@ -71,7 +71,8 @@ def install_basic_packages():
         "flask-socketio==5.3.6",
         "werkzeug==2.3.7",
         "python-socketio==5.8.0",
-        "eventlet==0.33.3"
+        "eventlet==0.33.3",
+        "numpy==1.24.3"
     ]
     
     for package in packages:
@@ -142,31 +143,45 @@ def start_dashboard():
             except Exception as e:
                 print_colored(f"⚠️  Could not create templates: {e}", Colors.YELLOW)
         
-        # Start the Flask application
+        sys.path.insert(0, str(dashboard_dir))
+        from health import READY_FILE_ENV, wait_until_ready
+        ready_file = Path(tempfile.gettempdir()) / f"bevco_portal_ready_{os.getpid()}.json"
+        if ready_file.exists():
+            ready_file.unlink()
+        
+        # Start the Flask application; its output goes to a log file, since
+        # a pipe nobody reads fills up and stalls the server
+        log_path = Path(tempfile.gettempdir()) / f"bevco_portal_{os.getpid()}.log"
+        log_file = open(log_path, "w")
         process = subprocess.Popen([
             sys.executable, app_file
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        ], stdout=log_file, stderr=subprocess.STDOUT,
+           env=dict(os.environ, **{READY_FILE_ENV: str(ready_file)}))
+        log_file.close()
         
-        # Wait for server to start
-        time.sleep(6)
+        # Wait until the portal reports ready; the auto-port app picks its own
+        # port, so it is only known from the ready file
+        base_url = None if app_file == "app_simple_auto_port.py" else "http://localhost:5000"
+        ready, detail = wait_until_ready(base_url, process, ready_file=str(ready_file))
         
-        # Check if process is still running
-        if process.poll() is None:
+        if ready:
+            url = detail.get('url') or base_url or "http://localhost:5000"
             print_colored("\n" + "="*60, Colors.GREEN)
             print_colored("🎉 DASHBOARD IS RUNNING!", Colors.GREEN)
             print_colored("="*60, Colors.GREEN)
-            print_colored("🌐 URL: http://localhost:5000", Colors.BOLD)
+            print_colored(f"🌐 URL: {url}", Colors.BOLD)
             print_colored("👤 Username: admin", Colors.BLUE)
             print_colored("🔑 Password: admin123", Colors.BLUE)
+            print_colored(f"📄 Server log: {log_path}", Colors.BLUE)
             print_colored("🤖 AI Chat: Click chat button (bottom-right)", Colors.BLUE)
             print_colored("="*60, Colors.GREEN)
             
             # Try to open browser
             try:
-                webbrowser.open("http://localhost:5000")
+                webbrowser.open(url)
                 print_colored("🌐 Opening in Safari...", Colors.GREEN)
             except:
-                print_colored("📱 Please manually open: http://localhost:5000", Colors.YELLOW)
+                print_colored(f"📱 Please manually open: {url}", Colors.YELLOW)
             
             print_colored("\n📊 DASHBOARD FEATURES:", Colors.BOLD)
             print_colored("   • Executive Summary with real-time KPIs", Colors.BLUE)
@@ -198,11 +213,14 @@ def start_dashboard():
             
             return True
         else:
-            # Process failed to start
-            stdout, stderr = process.communicate()
-            print_colored("❌ Dashboard failed to start", Colors.RED)
-            if stderr:
-                print_colored(f"Error: {stderr[:300]}", Colors.RED)
+            # Process failed to start or never became ready
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+            output = log_path.read_text(errors="replace")
+            print_colored(f"❌ Dashboard failed to start: {detail}", Colors.RED)
+            if output:
+                print_colored(f"Error: {output[-500:]}", Colors.RED)
             return False
             
     except Exception as e:
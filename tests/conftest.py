@@ -0,0 +1,8 @@
+"""Shared setup for the tests: the portal and script modules import each other by name"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "dashboard_portal"))
+sys.path.insert(0, str(ROOT / "scripts"))
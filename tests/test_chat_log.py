@@ -0,0 +1,58 @@
+"""Write-behind batching of the chat log"""
+
+import queue
+import sqlite3
+from types import SimpleNamespace
+
+from chat_log import ChatLogWriter
+
+class SocketIO:
+    """Just the queue factory the writer takes from Flask-SocketIO's engine"""
+
+    def __init__(self):
+        self.server = SimpleNamespace(eio=SimpleNamespace(
+            create_queue=queue.Queue, get_queue_empty_exception=lambda: queue.Empty))
+
+def create_log(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute('''
+            CREATE TABLE chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                message TEXT, response TEXT, timestamp TEXT)
+        ''')
+
+def logged(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute('SELECT user_id, message, response FROM chat_messages ORDER BY id').fetchall()
+
+def test_close_writes_every_queued_record_in_one_batch(tmp_path):
+    path = tmp_path / 'chat.db'
+    create_log(path)
+    writer = ChatLogWriter(SocketIO(), path)
+    for index in range(250):
+        writer.write(index % 3, f'question {index}', f'answer {index}')
+    assert writer.depth() == 250
+
+    writer.close()
+    assert logged(path) == [(index % 3, f'question {index}', f'answer {index}') for index in range(250)]
+    assert writer.stats()['written'] == 250
+    assert writer.stats()['batches'] == 1
+    assert writer.depth() == 0
+
+def test_failed_flush_keeps_the_batch_for_a_retry(tmp_path):
+    path = tmp_path / 'chat.db'
+    writer = ChatLogWriter(SocketIO(), path)
+    writer.write(1, 'hello', 'hi')
+    writer.close()
+    assert writer.stats()['failures'] == 1
+    assert writer.depth() == 1
+
+    create_log(path)
+    assert writer.flush()
+    assert logged(path) == [(1, 'hello', 'hi')]
+    assert writer.depth() == 0
+
+def test_flush_with_nothing_pending_succeeds(tmp_path):
+    writer = ChatLogWriter(SocketIO(), tmp_path / 'missing.db')
+    assert writer.flush()
+    assert writer.stats()['batches'] == 0
@@ -0,0 +1,102 @@
+"""Queued chat answers: shared between identical questions and collectable over HTTP"""
+
+import queue
+import threading
+from types import SimpleNamespace
+
+from chat_service import ChatService, normalize_question
+
+class SocketIO:
+    def __init__(self):
+        self.server = SimpleNamespace(eio=SimpleNamespace(create_queue=queue.Queue))
+
+class Broadcaster:
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, room, event, message, key=None):
+        self.sent.append((room, message))
+
+class ChatLog:
+    def __init__(self):
+        self.records = []
+
+    def write(self, user_id, message, response):
+        self.records.append((user_id, message, response))
+
+class Engine:
+    def __init__(self):
+        self.asked = []
+
+    def version(self, data_key):
+        return data_key
+
+    def respond(self, message, data_key=None):
+        self.asked.append(message)
+        return {'intent': 'total_sales', 'response': f'Answer to {message}. Done.'}
+
+def service(**options):
+    return ChatService(SocketIO(), Broadcaster(), Engine(), ChatLog(), **options)
+
+def run_jobs(chat):
+    while not chat.jobs.empty():
+        chat.answer(*chat.jobs.get())
+
+def test_queued_answer_is_collected_by_request_id():
+    chat = service()
+    first = chat.ask(1, 'What are total sales?', 'v1')
+    second = chat.ask(2, 'total sales', 'v1')
+    assert first['status'] == second['status'] == 'pending'
+    assert chat.result(1, first['request_id']) == {'request_id': first['request_id'], 'status': 'pending'}
+    assert chat.jobs.qsize() == 1
+
+    run_jobs(chat)
+    assert chat.engine.asked == ['What are total sales?']
+    for user_id, asked in ((1, first), (2, second)):
+        result = chat.result(user_id, asked['request_id'])
+        assert result['status'] == 'done' and result['response'] == 'Answer to What are total sales?. Done.'
+    # Only the asking user sees an answer
+    assert chat.result(2, first['request_id']) is None
+    assert chat.result(1, 'unknown') is None
+    assert [record[0] for record in chat.chat_log.records] == [1, 2]
+    done = [message for _, message in chat.broadcaster.sent if message['done']]
+    assert {message['request_id'] for message in done} == {first['request_id'], second['request_id']}
+
+    cached = chat.ask(3, 'sales total?', 'v1')
+    assert cached['status'] == 'done' and cached['cached']
+
+def test_results_are_bounded():
+    chat = service(max_results=3)
+    asked = [chat.ask(1, f'sales in region {index}', 'v1') for index in range(5)]
+    run_jobs(chat)
+    assert [chat.result(1, result['request_id']) is not None for result in asked] == [False, False, True, True, True]
+
+def test_no_waiter_is_lost_while_answers_finish():
+    chat = service(max_results=10000)
+    asked = []
+
+    def ask():
+        for index in range(200):
+            asked.append(chat.ask(index % 5, f'profit for product {index % 3}', index // 50))
+
+    def work():
+        while any(chat.pending.values()) or not chat.jobs.empty() or len(asked) < 800:
+            try:
+                chat.answer(*chat.jobs.get(timeout=0.01))
+            except queue.Empty:
+                pass
+
+    askers = [threading.Thread(target=ask) for _ in range(4)]
+    workers = [threading.Thread(target=work) for _ in range(2)]
+    for thread in askers + workers:
+        thread.start()
+    for thread in askers + workers:
+        thread.join(timeout=30)
+    assert len(asked) == 800
+    for index, result in enumerate(asked):
+        if result['status'] == 'pending':
+            user_ids = [user_id for user_id in range(5) if chat.result(user_id, result['request_id'])]
+            assert [chat.result(user_id, result['request_id'])['status'] for user_id in user_ids] == ['done']
+
+def test_normalized_questions_ignore_fillers_and_order():
+    assert normalize_question('What are the total sales?') == normalize_question('sales total')
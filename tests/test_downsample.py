@@ -0,0 +1,81 @@
+"""LTTB downsampling against a plain Python LTTB"""
+
+import numpy as np
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from downsample import keep_points, lttb
+from filters import FilterError, point_limit
+
+def python_lttb(x, y, max_points):
+    """Straightforward LTTB over Python lists, as in scripts/benchmarks/downsample_benchmark.py"""
+    count = len(x)
+    buckets = max_points - 2
+    kept = [0]
+    a = 0
+    for bucket in range(buckets):
+        start, end = bucket * (count - 2) // buckets + 1, (bucket + 1) * (count - 2) // buckets + 1
+        next_start, next_end = end, min((bucket + 2) * (count - 2) // buckets + 1, count)
+        if bucket == max_points - 3:
+            average_x, average_y = x[-1], y[-1]
+        else:
+            average_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            average_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        best, area = start, -1.0
+        for index in range(start, end):
+            candidate = abs((x[a] - average_x) * (y[index] - y[a]) - (x[a] - x[index]) * (average_y - y[a]))
+            if candidate > area:
+                best, area = index, candidate
+        kept.append(best)
+        a = best
+    kept.append(count - 1)
+    return kept
+
+# Narrow buckets go through the choice table, wide ones (over 32 points) are picked one by one
+@pytest.mark.parametrize('count, max_points', [
+    (10, 3), (10, 9), (100, 7), (1000, 300), (1000, 999), (5000, 50), (20000, 100), (20000, 600)
+])
+def test_lttb_matches_python_lttb(count, max_points):
+    rng = np.random.default_rng(count + max_points)
+    x = np.arange(count, dtype=float)
+    y = np.cumsum(rng.normal(0, 1, count)) + 50 * (rng.random(count) > 0.99)
+    kept = lttb(x, y, max_points)
+    assert kept.tolist() == python_lttb(x.tolist(), y.tolist(), max_points)
+    assert len(kept) == max_points
+    assert kept[0] == 0 and kept[-1] == count - 1
+    assert (np.diff(kept) > 0).all()
+
+@pytest.mark.parametrize('count, max_points', [(0, 10), (1, 10), (5, 5), (5, 10), (2, 1), (100, None)])
+def test_short_series_are_kept_whole(count, max_points):
+    assert lttb(np.arange(count), np.arange(count), max_points).tolist() == list(range(count))
+
+@pytest.mark.parametrize('max_points', [10, 50, 200])
+@pytest.mark.parametrize('series_count', [1, 3, 5])
+def test_keep_points_fits_every_series(max_points, series_count):
+    rng = np.random.default_rng(max_points * series_count)
+    x = np.arange(2000, dtype=float)
+    series = [np.cumsum(rng.normal(0, 1, len(x))) for _ in range(series_count)]
+    kept = keep_points(x, series, max_points)
+    assert len(kept) <= max_points
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert (np.diff(kept) > 0).all()
+    assert keep_points(x[:max_points], series, max_points).tolist() == list(range(max_points))
+
+@pytest.mark.parametrize('max_points', [3, 4, 6, 7, 11])
+def test_keep_points_fits_more_series_than_points(max_points):
+    rng = np.random.default_rng(max_points)
+    x = np.arange(400, dtype=float)
+    series = [np.cumsum(rng.normal(0, 1, len(x))) for _ in range(8)]
+    kept = keep_points(x, series, max_points)
+    assert len(kept) <= max_points
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert (np.diff(kept) > 0).all()
+
+@pytest.mark.parametrize('value', ['0', '2', '-5', 'lots', '2.5'])
+def test_point_limit_rejects_fewer_than_three_points(value):
+    with pytest.raises(FilterError):
+        point_limit(MultiDict({'max_points': value}))
+
+def test_point_limit_reads_the_argument():
+    assert point_limit(MultiDict({'max_points': '3'})) == 3
+    assert point_limit(MultiDict()) is None
@@ -0,0 +1,88 @@
+"""Incremental inventory totals against a fresh rebuild"""
+
+import random
+import sqlite3
+
+import pytest
+
+from inventory import LIST_LIMIT, InventoryTracker
+
+WAREHOUSES = ['Johannesburg DC', 'Cape Town DC', 'Durban DC']
+CATEGORIES = ['Beer', 'Wine', 'Spirits']
+
+def stock_line(generator, key):
+    reorder = generator.randint(10, 100)
+    return (key, generator.randint(1, 20), generator.choice(WAREHOUSES), generator.randint(0, 400),
+            reorder, generator.choice([0, reorder * 3]), round(generator.uniform(0, 5000), 2), generator.randint(1, 90))
+
+@pytest.fixture
+def conn():
+    generator = random.Random(4)
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE dim_product (ProductKey INTEGER PRIMARY KEY, ProductName TEXT, Category TEXT);
+        CREATE TABLE fact_inventory (
+            InventoryKey INTEGER PRIMARY KEY, ProductKey INTEGER, Warehouse TEXT, StockOnHand INTEGER,
+            ReorderPoint INTEGER, MaxStock INTEGER, StockValue REAL, DaysOnHand INTEGER);
+    ''')
+    # Product 20 has no dim_product row and shows as Unknown
+    conn.executemany('INSERT INTO dim_product VALUES (?, ?, ?)',
+                     [(key, f'Product {key}', generator.choice(CATEGORIES)) for key in range(1, 20)])
+    conn.executemany('INSERT INTO fact_inventory VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                     [stock_line(generator, key) for key in range(1, 301)])
+    yield conn
+    conn.close()
+
+def rebuilt(conn):
+    tracker = InventoryTracker()
+    tracker.refresh(conn, 'rebuilt')
+    return tracker
+
+FILTERS = [None, {'warehouse': ['Durban DC']}, {'category': ['Beer', 'Unknown']},
+           {'warehouse': ['Cape Town DC', 'Durban DC'], 'category': ['Wine']}, {'warehouse': ['Nowhere']}]
+
+def test_incremental_refresh_matches_a_rebuild(conn):
+    generator = random.Random(5)
+    tracker = InventoryTracker()
+    assert tracker.refresh(conn, 1) == 300
+    assert tracker.refresh(conn, 1) == 0
+
+    conn.executemany('UPDATE fact_inventory SET StockOnHand = ?, StockValue = ? WHERE InventoryKey = ?',
+                     [(generator.randint(0, 400), 1.5, key) for key in generator.sample(range(1, 301), 40)])
+    conn.execute('DELETE FROM fact_inventory WHERE InventoryKey % 7 = 0')
+    conn.executemany('INSERT INTO fact_inventory VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                     [stock_line(generator, key) for key in range(301, 311)])
+    conn.execute("UPDATE dim_product SET Category = 'Cider' WHERE ProductKey = 3")
+
+    assert tracker.refresh(conn, 2) > 0
+    fresh = rebuilt(conn)
+    for filters in FILTERS:
+        assert tracker.view(filters) == fresh.view(filters)
+    assert tracker.stats()['lines'] == fresh.stats()['lines']
+
+    conn.execute('DELETE FROM fact_inventory')
+    tracker.refresh(conn, 3)
+    assert tracker.cells == {} and tracker.view()['lines'] == 0
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_view_counts_match_the_lines(conn, filters):
+    view = rebuilt(conn).view(filters)
+    warehouses = (filters or {}).get('warehouse', WAREHOUSES)
+    categories = (filters or {}).get('category', CATEGORIES + ['Unknown'])
+    lines = [line for line in conn.execute('''
+        SELECT i.Warehouse, COALESCE(p.Category, 'Unknown'), i.StockOnHand, i.ReorderPoint, i.MaxStock, i.StockValue
+        FROM fact_inventory i LEFT JOIN dim_product p ON p.ProductKey = i.ProductKey
+    ''') if line[0] in warehouses and line[1] in categories]
+
+    assert view['lines'] == len(lines)
+    assert view['total_stock'] == sum(line[2] for line in lines)
+    assert view['total_value'] == pytest.approx(sum(line[5] for line in lines), abs=0.01)
+    below = [line for line in lines if line[2] < line[3]]
+    over = [line for line in lines if line[4] and line[2] > line[4]]
+    assert view['below_reorder_count'] == len(below)
+    assert view['overstock_count'] == len(over)
+    assert len(view['below_reorder']) == min(len(below), LIST_LIMIT)
+    shortfalls = [line['shortfall'] for line in view['below_reorder']]
+    assert shortfalls == sorted(shortfalls, reverse=True)
+    assert all(line['excess'] > 0 for line in view['overstock'])
+    assert sum(total['lines'] for total in view['stock_by_category']) == len(lines)
@@ -0,0 +1,14 @@
+"""SQL metrics cover statements run through the connection's shortcuts"""
+
+from metrics import InstrumentedCursor, connect_database, metrics
+
+def test_connection_shortcuts_use_the_instrumented_cursor():
+    conn = connect_database(':memory:')
+    try:
+        assert isinstance(conn.execute('CREATE TABLE t (n INTEGER)'), InstrumentedCursor)
+        assert isinstance(conn.executemany('INSERT INTO t VALUES (?)', [(1,), (2,)]), InstrumentedCursor)
+        assert conn.execute('SELECT SUM(n) FROM t').fetchall() == [(3,)]
+        assert ('SELECT SUM(n) FROM t',) in metrics.sql_duration.series
+        assert metrics.sql_rows.series[('SELECT SUM(n) FROM t',)] >= 1
+    finally:
+        conn.close()
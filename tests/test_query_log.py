@@ -0,0 +1,57 @@
+"""The slow query log counts the time spent fetching a statement's rows"""
+
+import time
+
+import pytest
+
+from metrics import connect_database
+from query_log import query_log
+
+@pytest.fixture
+def conn():
+    conn = connect_database(':memory:')
+    # Each row costs a millisecond while it is stepped through, as a scan would
+    conn.create_function('slow', 1, lambda value: time.sleep(0.001) or value)
+    conn.execute('CREATE TABLE numbers (n INTEGER)')
+    conn.executemany('INSERT INTO numbers VALUES (?)', [(n,) for n in range(60)])
+    query_log.reset()
+    query_log.configure(threshold_ms=40)
+    yield conn
+    conn.close()
+    query_log.reset()
+    query_log.configure(threshold_ms=100)
+
+def logged():
+    return [entry['query'] for entry in query_log.recent()]
+
+def test_fetchall_time_counts_towards_slow_queries(conn):
+    cursor = conn.execute('SELECT slow(n) FROM numbers WHERE n >= ?', (0,))
+    assert logged() == []
+    assert len(cursor.fetchall()) == 60
+    assert logged() == ['SELECT slow(n) FROM numbers WHERE n >= ?']
+    entry = query_log.recent()[0]
+    assert entry['duration_ms'] >= 60 and entry['parameters'] == ['0']
+
+def test_iterated_and_paged_statements_are_logged_when_done(conn):
+    assert sum(1 for _ in conn.execute('SELECT slow(n) FROM numbers')) == 60
+    cursor = conn.execute('SELECT slow(n) + 1 FROM numbers')
+    while cursor.fetchmany(25):
+        pass
+    assert logged() == ['SELECT slow(n) + 1 FROM numbers', 'SELECT slow(n) FROM numbers']
+
+def test_statement_is_logged_when_the_next_one_runs_or_the_cursor_goes(conn):
+    cursor = conn.cursor()
+    cursor.execute('SELECT slow(n) FROM numbers')
+    cursor.fetchmany(50)
+    assert logged() == []
+    cursor.execute('SELECT 1')
+    assert logged() == ['SELECT slow(n) FROM numbers']
+
+    query_log.reset()
+    conn.execute('SELECT slow(n) FROM numbers ORDER BY n DESC').fetchmany(45)
+    assert logged() == ['SELECT slow(n) FROM numbers ORDER BY n DESC']
+
+def test_fast_statements_are_not_logged(conn):
+    assert conn.execute('SELECT COUNT(*) FROM numbers').fetchone() == (60,)
+    conn.execute('INSERT INTO numbers VALUES (60)')
+    assert logged() == []
@@ -0,0 +1,113 @@
+"""Range totals of the sales cube against the same sums in SQL"""
+
+import random
+import sqlite3
+from contextlib import closing
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from database import create_schema, seed_sample_data
+from sales_cube import DIMENSIONS, SalesCube
+
+TOTALS_SQL = 'SELECT COALESCE(SUM(sales_amount), 0), COALESCE(SUM(profit_amount), 0), COALESCE(SUM(quantity), 0), COUNT(*) FROM sales_data'
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = tmp_path / 'bevco_dashboard.db'
+    with closing(sqlite3.connect(path)) as conn, conn:
+        create_schema(conn)
+        seed_sample_data(conn, rows=3000, seed=5)
+    return path
+
+def sql_totals(path, start=None, end=None, where=None):
+    clauses, parameters = [], []
+    if start:
+        clauses.append('date >= ?')
+        parameters.append(start)
+    if end:
+        clauses.append('date <= ?')
+        parameters.append(end)
+    for name, values in (where or {}).items():
+        clauses.append(f"{name} IN ({', '.join('?' * len(values))})")
+        parameters.extend(values)
+    sql = TOTALS_SQL + (' WHERE ' + ' AND '.join(clauses) if clauses else '')
+    with closing(sqlite3.connect(path)) as conn:
+        return np.array(conn.execute(sql, parameters).fetchone(), dtype=float)
+
+def random_range(generator, cube):
+    first = date.fromisoformat(cube.day(0))
+    start, end = sorted(first + timedelta(days=generator.randint(-10, cube.days + 10)) for _ in range(2))
+    return start.isoformat(), end.isoformat()
+
+def test_range_totals_match_sql(database_path):
+    cube = SalesCube(database_path).refresh()
+    generator = random.Random(1)
+    for _ in range(50):
+        start, end = random_range(generator, cube)
+        assert np.allclose(cube.totals(start, end), sql_totals(database_path, start, end))
+    assert np.allclose(cube.totals(), sql_totals(database_path))
+
+def test_ranges_outside_the_data(database_path):
+    cube = SalesCube(database_path).refresh()
+    first, last = date.fromisoformat(cube.day(0)), date.fromisoformat(cube.day(cube.days - 1))
+    before = (first - timedelta(days=30)).isoformat(), (first - timedelta(days=1)).isoformat()
+    after = (last + timedelta(days=1)).isoformat(), (last + timedelta(days=30)).isoformat()
+    for start, end in (before, after):
+        assert not cube.totals(start, end).any()
+    covering = (first - timedelta(days=5)).isoformat(), (last + timedelta(days=5)).isoformat()
+    assert np.allclose(cube.totals(*covering), sql_totals(database_path))
+
+def test_totals_by_dimension_and_select_match_sql(database_path):
+    cube = SalesCube(database_path).refresh()
+    generator = random.Random(2)
+    for _ in range(20):
+        start, end = random_range(generator, cube)
+        name = generator.choice(DIMENSIONS)
+        by_member = cube.totals(start, end, by=name)
+        for position, member in enumerate(cube.members[name]):
+            assert np.allclose(by_member[position], sql_totals(database_path, start, end, {name: [member]}))
+
+        where = {dimension: generator.sample(cube.members[dimension], 2) for dimension in generator.sample(DIMENSIONS, 2)}
+        assert np.allclose(cube.select(start, end, where), sql_totals(database_path, start, end, where))
+
+def test_refresh_folds_in_new_rows(database_path):
+    sales_cube = SalesCube(database_path)
+    cube = sales_cube.refresh()
+    first, last = date.fromisoformat(cube.day(0)), date.fromisoformat(cube.day(cube.days - 1))
+    with closing(sqlite3.connect(database_path)) as conn, conn:
+        conn.executemany('''
+            INSERT INTO sales_data (date, region, product_category, vendor, customer_type, sales_amount, profit_amount, quantity)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            ((first - timedelta(days=3)).isoformat(), 'Gauteng', 'Beer', 'Distell', 'Retail', 100.0, 20.0, 5),
+            ((last + timedelta(days=4)).isoformat(), 'Limpopo', 'Cider', 'Distell', 'Retail', 50.0, 10.0, 2),
+            (last.isoformat(), 'Gauteng', 'Wine', 'Distell', 'Export', 75.5, 15.5, 3)
+        ])
+
+    refreshed = sales_cube.refresh()
+    assert cube.days < refreshed.days
+    assert 'Limpopo' in refreshed.members['region'] and 'Limpopo' not in cube.members['region']
+    rebuilt = SalesCube(database_path).refresh()
+    # New members are appended rather than sorted in, so compare member by member
+    for name in DIMENSIONS:
+        assert sorted(refreshed.members[name]) == rebuilt.members[name]
+        order = [refreshed.members[name].index(member) for member in rebuilt.members[name]]
+        assert np.allclose(refreshed.totals(by=name)[order], rebuilt.totals(by=name))
+    assert np.allclose(refreshed.daily()[1], rebuilt.daily()[1])
+    generator = random.Random(3)
+    for _ in range(20):
+        start, end = random_range(generator, refreshed)
+        assert np.allclose(refreshed.totals(start, end), sql_totals(database_path, start, end))
+    # The state handed out before the refresh is unchanged
+    assert np.allclose(cube.totals(), sql_totals(database_path) - [225.5, 45.5, 10, 3])
+
+def test_empty_table_gives_zero_totals(tmp_path):
+    path = tmp_path / 'empty.db'
+    with closing(sqlite3.connect(path)) as conn, conn:
+        create_schema(conn)
+    cube = SalesCube(path).refresh()
+    assert cube.days == 0
+    assert not cube.totals().any()
+    assert not cube.totals('2024-01-01', '2024-12-31').any()
@@ -0,0 +1,112 @@
+"""JSON-patch diffs and version catch-up of the view snapshots"""
+
+import copy
+import random
+
+import pytest
+
+from snapshots import SnapshotStore, diff
+
+def unescape(key):
+    return key.replace('~1', '/').replace('~0', '~')
+
+def apply(ops, doc):
+    """Replay add/remove/replace operations the way applyJsonPatch in base.html does"""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        keys = [unescape(key) for key in op['path'].split('/')[1:]]
+        if not keys:
+            doc = copy.deepcopy(op['value'])
+            continue
+        *parents, last = keys
+        target = doc
+        for key in parents:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+        if isinstance(target, list):
+            index = int(last)
+            if op['op'] == 'add':
+                target.insert(index, op['value'])
+            elif op['op'] == 'remove':
+                del target[index]
+            else:
+                target[index] = op['value']
+        elif op['op'] == 'remove':
+            del target[last]
+        else:
+            target[last] = op['value']
+    return doc
+
+def random_view(generator):
+    return {
+        'total_sales': round(generator.uniform(0, 1e6), 2),
+        'sales_trend': [{'date': f'2024-01-{day:02d}', 'sales': generator.randint(0, 100)}
+                        for day in range(1, generator.randint(0, 12))],
+        'by/region': {name: generator.randint(0, 5) for name in generator.sample(['a', 'b~c', 'd/e', 'f'], generator.randint(0, 4))}
+    }
+
+@pytest.mark.parametrize('old, new', [
+    ({'a': [1, 2, 3, 4]}, {'a': [1]}),
+    ({'a': [1]}, {'a': [1, 2, 3]}),
+    ({'a': [1, 2]}, {'a': []}),
+    ({'a': [{'x': 1}, {'x': 2}]}, {'a': [{'x': 2}]}),
+    ({'a': 1, 'b': 2}, {'b': 3, 'c': 4}),
+    ({'a/b': 1, 'c~d': 2}, {'a/b': 2}),
+    ({'a': [1, 2]}, {'a': {'0': 1}}),
+    ({'a': None}, {'a': [1]}),
+])
+def test_diff_replays_to_new(old, new):
+    assert apply(diff(old, new), old) == new
+
+def test_diff_of_equal_documents_is_empty():
+    view = {'a': [1, {'b': 2}], 'c': 'd'}
+    assert diff(view, copy.deepcopy(view)) == []
+
+def test_diff_replays_random_views():
+    generator = random.Random(7)
+    for _ in range(200):
+        old, new = random_view(generator), random_view(generator)
+        assert apply(diff(old, new), old) == new
+
+class Broadcaster:
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, room, event, message, key=None):
+        self.sent.append(message)
+
+def test_since_composes_patches_from_an_old_version():
+    store, broadcaster = SnapshotStore(), Broadcaster()
+    generator = random.Random(3)
+    views = [random_view(generator) for _ in range(5)]
+    versions = []
+    for index, view in enumerate(views):
+        versions.append(store.publish(broadcaster, 'dashboard', lambda view=view: view, data_key=index)['version'])
+
+    for held, view in zip(versions, views):
+        message = store.since('dashboard', held)
+        assert message['version'] == versions[-1]
+        if 'snapshot' in message:
+            assert message['snapshot'] == views[-1]
+        else:
+            assert message['base_version'] == held
+            assert apply(message['ops'], view) == views[-1]
+
+def test_since_unknown_version_sends_a_snapshot():
+    store = SnapshotStore()
+    store.update('kpi', {'kpis': [1, 2, 3]})
+    version, _ = store.update('kpi', {'kpis': [1, 2]})
+    message = store.since('kpi', version - 100)
+    assert message == {'view': 'kpi', 'version': version, 'snapshot': {'kpis': [1, 2]}}
+    assert store.since('missing', version) is None
+
+def test_since_current_version_is_an_empty_patch():
+    store = SnapshotStore()
+    version, _ = store.update('sales', {'vendor_sales': [{'vendor': 'A', 'sales': 1}]})
+    assert store.since('sales', version)['ops'] == []
+
+def test_unchanged_data_keeps_the_version():
+    store = SnapshotStore()
+    first, _ = store.update('sales', {'a': 1}, data_key='k1')
+    second, message = store.update('sales', {'a': 1}, data_key='k2')
+    assert (second, message) == (first, None)
+    assert store.cached('sales', 'k2') == (first, {'a': 1})
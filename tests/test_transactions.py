@@ -0,0 +1,86 @@
+"""Keyset paging of the transactions API"""
+
+import random
+import sqlite3
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from filters import FilterError
+from transactions import parse_cursor, transaction_query, transactions_page
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE dim_date (DateKey INTEGER PRIMARY KEY, Date TEXT);
+        CREATE TABLE dim_product (ProductKey INTEGER PRIMARY KEY, ProductName TEXT, Category TEXT, Vendor TEXT);
+        CREATE TABLE dim_customer (CustomerKey INTEGER PRIMARY KEY, CustomerName TEXT, Region TEXT, Channel TEXT);
+        CREATE TABLE dim_employee (EmployeeKey INTEGER PRIMARY KEY, Name TEXT);
+        CREATE TABLE fact_sales (
+            SalesKey INTEGER PRIMARY KEY, DateKey INTEGER, ProductKey INTEGER, CustomerKey INTEGER,
+            EmployeeKey INTEGER, InvoiceNumber TEXT, Quantity INTEGER, UnitPrice REAL,
+            DiscountAmount REAL, NetSales REAL, GrossProfit REAL);
+        CREATE INDEX idx_fact_sales_date ON fact_sales (DateKey, SalesKey);
+    ''')
+    conn.executemany('INSERT INTO dim_date VALUES (?, ?)',
+                     [(20240100 + day, f'2024-01-{day:02d}') for day in range(1, 6)])
+    conn.executemany('INSERT INTO dim_product VALUES (?, ?, ?, ?)',
+                     [(1, 'Lager', 'Beer', 'A'), (2, 'Cider', 'Cider', 'B')])
+    conn.executemany('INSERT INTO dim_customer VALUES (?, ?, ?, ?)',
+                     [(1, 'Shop', 'Gauteng', 'Retail'), (2, 'Bar', 'Free State', 'On-trade')])
+    conn.execute("INSERT INTO dim_employee VALUES (1, 'Rep')")
+    generator = random.Random(11)
+    # Many lines share each DateKey, and SalesKey is not in date order
+    sales_keys = generator.sample(range(1, 1000), 57)
+    conn.executemany('INSERT INTO fact_sales VALUES (?, ?, ?, ?, 1, ?, 1, 10, 0, 10, 2)', [
+        (sales_key, 20240100 + generator.randint(1, 5), generator.randint(1, 2), generator.randint(1, 2),
+         f'INV{sales_key}') for sales_key in sales_keys
+    ])
+    yield conn
+    conn.close()
+
+def all_pages(conn, filters, limit, descending):
+    keys, after = [], None
+    while True:
+        page = transactions_page(conn, filters, after, limit, descending)
+        assert len(page['data']) <= limit
+        keys.extend((row[0], row[1]) for row in page['data'])
+        if page['next'] is None:
+            return keys
+        after = parse_cursor(page['next'])
+
+@pytest.mark.parametrize('descending', [True, False])
+@pytest.mark.parametrize('limit', [1, 5, 56, 57, 100])
+def test_pages_return_every_line_once_in_order(conn, limit, descending):
+    direction = 'DESC' if descending else 'ASC'
+    expected = conn.execute(
+        f'SELECT DateKey, SalesKey FROM fact_sales ORDER BY DateKey {direction}, SalesKey {direction}').fetchall()
+    assert all_pages(conn, {}, limit, descending) == expected
+
+def test_pages_apply_the_filters(conn):
+    filters, _, _, descending = transaction_query(MultiDict({'region': 'Gauteng', 'from': '2024-01-02', 'order': 'asc'}))
+    expected = conn.execute('''
+        SELECT DateKey, SalesKey FROM fact_sales
+        WHERE CustomerKey = 1 AND DateKey >= 20240102 ORDER BY DateKey, SalesKey
+    ''').fetchall()
+    assert all_pages(conn, filters, 4, descending) == expected
+
+def test_cursor_round_trip():
+    assert parse_cursor('20240131.42') == (20240131, 42)
+    assert parse_cursor('') is None
+    assert parse_cursor(None) is None
+
+@pytest.mark.parametrize('args', [
+    {'after': 'abc'},
+    {'after': '20241340.1'},
+    {'after': '20240101'},
+    {'limit': '0'},
+    {'limit': '1001'},
+    {'limit': 'many'},
+    {'order': 'up'},
+    {'product': 'lager'}
+])
+def test_bad_arguments_raise_filter_error(args):
+    with pytest.raises(FilterError):
+        transaction_query(MultiDict(args))
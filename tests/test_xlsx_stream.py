@@ -0,0 +1,73 @@
+"""The streamed XLSX export: a valid workbook, sent while it is converted"""
+
+import io
+
+import pytest
+
+import xlsx_stream
+
+openpyxl = pytest.importorskip("openpyxl")
+
+# Rows converted so far, counted through row_xml
+converted_rows = [0]
+
+class Sink:
+    """A write-only, unseekable stream like the chunked response, noting the rows converted at each write"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.rows_at_write = []
+
+    def write(self, data):
+        self.rows_at_write.append(converted_rows[0])
+        self.data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / "dim_product.csv").write_text(
+        "ProductKey,ProductCode,ProductName,Price,2024\n"
+        "1,007,Lager <500ml> & Co,12.5,\n"
+        "2,-3,\"Cider, dry\",0.75,x\x01y\n", encoding="utf-8")
+    (tmp_path / "fact_sales.csv").write_text(
+        "SalesKey,Quantity,NetSales\n" + "".join(f"{key},{key % 7},{key * 1.25}\n" for key in range(1, 20001)),
+        encoding="utf-8")
+    (tmp_path / "fact_budget.csv").write_text("", encoding="utf-8")
+
+    row_xml = xlsx_stream.row_xml
+
+    def counted(*args, **kwargs):
+        converted_rows[0] += 1
+        return row_xml(*args, **kwargs)
+
+    converted_rows[0] = 0
+    monkeypatch.setattr(xlsx_stream, "row_xml", counted)
+    return tmp_path
+
+def test_workbook_reads_back(data_dir):
+    sink = Sink()
+    xlsx_stream.write_workbook(["dim_product", "fact_sales", "fact_budget"], sink, data_dir)
+    workbook = openpyxl.load_workbook(io.BytesIO(bytes(sink.data)))
+    assert workbook.sheetnames == ["dim_product", "fact_sales", "fact_budget"]
+
+    products = list(workbook["dim_product"].iter_rows(values_only=True))
+    assert products == [
+        ("ProductKey", "ProductCode", "ProductName", "Price", "2024"),
+        (1, "007", "Lager <500ml> & Co", 12.5, None),
+        (2, -3, "Cider, dry", 0.75, "xy")
+    ]
+    sales = list(workbook["fact_sales"].iter_rows(values_only=True))
+    assert len(sales) == 20001
+    assert sales[-1] == (20000, 20000 % 7, 25000.0)
+    assert workbook["fact_budget"].max_row == 1 and workbook["fact_budget"]["A1"].value is None
+
+def test_bytes_are_sent_while_the_sheets_are_converted(data_dir):
+    sink = Sink()
+    xlsx_stream.write_workbook(["fact_sales"], sink, data_dir)
+    total = converted_rows[0]
+    assert total == 20001
+    during = [rows for rows in sink.rows_at_write if 0 < rows < total]
+    assert len(during) > 1